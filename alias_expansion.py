@@ -0,0 +1,278 @@
+import sys
+import time
+
+
+def split_first_word(text):
+    """Memisahkan kata pertama dari sisa teks; spasi di depan sisa teks dipertahankan."""
+    text = text.lstrip()
+    for index, char in enumerate(text):
+        if char.isspace():
+            return text[:index], text[index:]
+    return text, ""
+
+
+def split_words(text):
+    """
+    Memecah teks menjadi [(spasi_di_depan, kata), ...] dan spasi di akhir,
+    sehingga teks bisa disusun ulang persis seperti aslinya.
+    """
+    words = []
+    leading_start = 0
+    index = 0
+    length = len(text)
+    while index < length:
+        if text[index].isspace():
+            index += 1
+            continue
+        word_start = index
+        while index < length and not text[index].isspace():
+            index += 1
+        words.append((text[leading_start:word_start], text[word_start:index]))
+        leading_start = index
+    return words, text[leading_start:]
+
+
+def find_cyclic_aliases(words_by_alias):
+    """
+    Alias yang berada di dalam siklus (komponen terhubung kuat dengan lebih dari
+    satu anggota atau yang merujuk dirinya sendiri). Tarjan iteratif, agar rantai
+    ribuan alias tidak menabrak batas rekursi.
+    """
+    edges = {name: [word for _, word in words if word in words_by_alias]
+             for name, words in words_by_alias.items()}
+    index_of = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    cyclic = set()
+    counter = 0
+    for root in edges:
+        if root in index_of:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, edge_index = work.pop()
+            if edge_index == 0:
+                index_of[node] = lowlink[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack.add(node)
+            successors = edges[node]
+            while edge_index < len(successors):
+                successor = successors[edge_index]
+                edge_index += 1
+                if successor not in index_of:
+                    work.append((node, edge_index))
+                    work.append((successor, 0))
+                    break
+                if successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[successor])
+            else:
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in successors:
+                        cyclic.update(component)
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+    return cyclic
+
+
+def build_alias_closure(aliases):
+    """
+    Mengompilasi tabel alias menjadi peta ekspansi yang sudah di-resolve penuh,
+    mengikuti cara parser bash membaca alias:
+
+    - kata hasil ekspansi dicek lagi selama masih di posisi command atau alias
+      sebelumnya diakhiri spasi, kecuali alias itu sedang diekspansi (siklus
+      berhenti di kata tersebut, seperti `alias ls='ls --color'`);
+    - jika nilai alias diakhiri spasi, kata sesudah alias itu juga dicek, termasuk
+      kata sisa alias pembungkusnya (`a='b x'`, `b='c '` -> `c` lalu `x` diekspansi);
+    - setelah alias selesai, status "cek kata berikutnya" ditentukan oleh alias itu
+      sendiri, jadi `a='b'`, `b='c '` tidak mengekspansi kata sesudah `a`;
+    - bash menandai akhir teks alias dengan satu spasi semu, hanya sekali sampai teks
+      alias berikutnya selesai. Alias yang menjadi kata terakhir alias lain tidak
+      mendapat spasi itu: kata terakhirnya baru dicek setelah alias tersebut selesai
+      (`a='c d'`, `c='z '`, `d='b'` -> `z b`, `b` tidak diekspansi).
+
+    Mengembalikan dict nama -> (teks, expand_next, teks_setelah_kata). `teks` dipakai
+    di posisi command, `teks_setelah_kata` saat alias dicek karena alias sebelumnya
+    diakhiri spasi (bedanya hanya jika nilainya diawali alias yang hasilnya kosong).
+
+    Ekspansi alias di luar siklus tidak bergantung pada alias mana yang sedang
+    diekspansi, sehingga hasilnya di-memo dan dipakai ulang; hanya anggota siklus
+    yang disimulasikan ulang setiap kali.
+    """
+    words_by_alias = {}
+    trailing = {}
+    for name, value in aliases.items():
+        words_by_alias[name], trailing[name] = split_words(value)
+    blank_end = {name: value[-1:].isspace() for name, value in aliases.items()}
+    cyclic = find_cyclic_aliases(words_by_alias)
+    # (nama, sudah_ada_kata, spasi_semu_terpakai) ->
+    #     (teks, sudah_ada_kata_setelahnya, kata_tertunda, bergantung_posisi_command)
+    memo = {}
+
+    def close_frame(frame, output, emitted, pending):
+        """Menyatukan output alias yang selesai dan menyimpannya di memo."""
+        text = "".join(output[frame[2]:])
+        # Frame induk tidak perlu menggabung ulang potongan yang sama
+        output[frame[2]:] = [text]
+        if frame[0] not in cyclic:
+            memo[(frame[0], frame[3], frame[4])] = (text, emitted, pending, frame[5])
+
+    def expand(start, emitted):
+        """(teks, apakah ada kata yang dicek hanya karena masih di posisi command)"""
+        cached = memo.get((start, emitted, False))
+        if cached is not None:
+            return cached[0], cached[3]
+        output = []
+        in_use = {start}
+        # Frame: [nama, posisi kata, panjang output saat masuk, emitted saat masuk,
+        #         spasi semu terpakai saat masuk, ada kata yang dicek hanya karena posisi command]
+        frames = [[start, 0, 0, emitted, False, False]]
+        check = True
+        # Spasi semu akhir alias sudah dipakai dan belum ada alias yang selesai sejak itu
+        end_space_used = False
+        while True:
+            frame = frames[-1]
+            name = frame[0]
+            words = words_by_alias[name]
+            pending = None
+            finished = True
+            if frame[1] < len(words):
+                leading, pending = words[frame[1]]
+                frame[1] += 1
+                output.append(leading)
+                if frame[1] < len(words) or trailing[name]:
+                    finished = False
+                elif not end_space_used:
+                    # Kata terakhir dibatasi spasi semu; alias masih dianggap sedang diekspansi
+                    end_space_used = True
+                    finished = False
+                # Selain itu alias selesai dulu, baru kata terakhirnya dicek
+            else:
+                output.append(trailing[name])
+
+            if finished:
+                frames.pop()
+                in_use.discard(name)
+                close_frame(frame, output, emitted, pending)
+                check = blank_end[name]
+                end_space_used = False
+                if not frames:
+                    if pending is not None:
+                        output.append(pending)
+                    return "".join(output), frame[5]
+                frames[-1][5] = frames[-1][5] or frame[5]
+                frame = frames[-1]
+
+            while pending is not None:
+                word, pending = pending, None
+                if not check and not emitted:
+                    frame[5] = True
+                if (check or not emitted) and word in aliases and word not in in_use:
+                    cached = memo.get((word, emitted, end_space_used)) if word not in cyclic else None
+                    if cached is None:
+                        in_use.add(word)
+                        frames.append([word, 0, len(output), emitted, end_space_used, False])
+                        break
+                    output.append(cached[0])
+                    emitted = cached[1]
+                    check = blank_end[word]
+                    end_space_used = False
+                    frame[5] = frame[5] or cached[3]
+                    pending = cached[2]
+                    continue
+                output.append(word)
+                emitted = True
+                check = False
+
+    closure = {}
+    for name in aliases:
+        text, command_position_used = expand(name, False)
+        # Tanpa kata yang bergantung pada posisi command, kedua varian sama persis
+        text_after_word = expand(name, True)[0] if command_position_used else text
+        closure[name] = (text, blank_end[name], text_after_word)
+    return closure
+
+
+def expand_command(closure, command):
+    """
+    Mengekspansi alias di awal command dengan peta dari build_alias_closure():
+    satu lookup dan satu sambungan prefix per alias. Argumen tidak diubah (spasi
+    dan quote tetap). Mengembalikan (command_baru, daftar alias yang diekspansi).
+    """
+    expanded_names = []
+    prefix = ""
+    rest = command
+    while True:
+        leading = rest[:len(rest) - len(rest.lstrip())]
+        name, tail = split_first_word(rest)
+        entry = closure.get(name) if name else None
+        if entry is None:
+            break
+        text, expand_next, text_after_word = entry
+        # Masih di posisi command selama alias sebelumnya belum menghasilkan kata
+        at_command_position = not prefix.strip()
+        expanded_names.append(name)
+        prefix += leading + (text if at_command_position else text_after_word)
+        rest = tail
+        if not expand_next and prefix.strip():
+            break
+    if not expanded_names:
+        return command, expanded_names
+    return prefix + rest, expanded_names
+
+
+def measure(chain_length=2000, repeat=20000):
+    """Mengukur build dan ekspansi untuk rantai panjang dan siklus besar (ms)."""
+    chain = {f"a{i}": f"a{i + 1} -x{i}" for i in range(chain_length)}
+    cycle = {f"c{i}": f"c{(i + 1) % 200} -y" for i in range(200)}
+    self_ref = {"ls": "ls --color=auto", "ll": "ls -l", "sudo": "sudo ", "g": "git", "gs": "g status"}
+
+    results = {}
+    for label, aliases in (("chain", chain), ("cycle", cycle), ("common", self_ref)):
+        started = time.perf_counter()
+        closure = build_alias_closure(aliases)
+        results[f"build_{label}_ms"] = (time.perf_counter() - started) * 1000
+        command = next(iter(aliases)) + " arg1 'arg two'"
+        started = time.perf_counter()
+        for _ in range(repeat):
+            expand_command(closure, command)
+        results[f"expand_{label}_us"] = (time.perf_counter() - started) / repeat * 1e6
+    return results
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ekspansi alias ala bash dengan peta closure.")
+    parser.add_argument("command", nargs="?", help="Command yang akan diekspansi")
+    parser.add_argument("--alias", action="append", default=[], metavar="NAMA=NILAI", help="Definisi alias")
+    parser.add_argument("--measure", action="store_true", help="Ukur biaya build dan ekspansi")
+    args = parser.parse_args()
+
+    aliases = {}
+    for definition in args.alias:
+        name, _, value = definition.partition("=")
+        aliases[name.strip()] = value
+    if args.command is not None:
+        expanded, names = expand_command(build_alias_closure(aliases), args.command)
+        print(expanded)
+        if names:
+            print(f"(alias: {' -> '.join(names)})", file=sys.stderr)
+    if args.measure:
+        for label, value in measure().items():
+            print(f"{label:18} {value:10.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
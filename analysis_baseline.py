@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import re
+
+PREVIOUS_FILE_NAME = "flutter_analyze_previous.json"
+PINNED_FILE_NAME = "flutter_analyze_baseline.json"
+DIFF_FILE_NAME = "flutter_analyze_diff.txt"
+BASELINE_VERSION = 1
+
+# Spasi berlebih di pesan tidak boleh membuat fingerprint berbeda
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def fingerprint(issue):
+    """
+    Fingerprint stabil untuk sebuah issue: file + rule + pesan.
+    Nomor baris dan kolom sengaja tidak ikut agar tahan terhadap pergeseran baris.
+    """
+    message = WHITESPACE_PATTERN.sub(' ', issue['message']).strip()
+    key = f"{issue['file']}\0{issue['rule']}\0{message}"
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=12).hexdigest()
+
+
+def group_by_fingerprint(issues):
+    """Mengelompokkan issue per fingerprint, urut berdasarkan posisi di file."""
+    groups = {}
+    for issue in issues:
+        groups.setdefault(fingerprint(issue), []).append(issue)
+    for group in groups.values():
+        if len(group) > 1:
+            group.sort(key=lambda issue: (issue['line'], issue['column']))
+    return groups
+
+
+def diff_issues(current, baseline):
+    """
+    Membandingkan issue saat ini dengan baseline dalam waktu linear.
+    Issue dengan fingerprint sama dihitung sebagai multiset: jika jumlahnya
+    bertambah, kelebihannya (yang paling bawah di file) dianggap baru.
+    Mengembalikan (new_issues, resolved_issues).
+    """
+    current_groups = group_by_fingerprint(current)
+    baseline_groups = group_by_fingerprint(baseline)
+
+    new_issues = []
+    for key, group in current_groups.items():
+        known = len(baseline_groups.get(key, ()))
+        if len(group) > known:
+            new_issues.extend(group[known:])
+
+    resolved_issues = []
+    for key, group in baseline_groups.items():
+        remaining = len(current_groups.get(key, ()))
+        if len(group) > remaining:
+            resolved_issues.extend(group[remaining:])
+
+    sort_key = lambda issue: (issue['file'], issue['line'], issue['column'])
+    new_issues.sort(key=sort_key)
+    resolved_issues.sort(key=sort_key)
+    return new_issues, resolved_issues
+
+
+def load_baseline(path):
+    """Memuat daftar issue dari file baseline. Mengembalikan None jika tidak ada."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != BASELINE_VERSION:
+        return None
+    return data.get('issues', [])
+
+
+def save_baseline(path, issues, timestamp):
+    """Menyimpan daftar issue sebagai baseline (atomik)."""
+    data = {
+        'version': BASELINE_VERSION,
+        'generated': timestamp,
+        'issues': issues,
+    }
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
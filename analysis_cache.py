@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import re
+
+CACHE_FILE_NAME = ".flutter_analyze_cache.json"
+CACHE_VERSION = 1
+
+# File di root project yang mempengaruhi hasil analisis seluruh project
+CONFIG_FILES = ['analysis_options.yaml', 'pubspec.yaml', 'pubspec.lock']
+
+# Format baris issue dari `flutter analyze`:
+#    info • Message • lib/main.dart:10:5 • rule_name
+# Di terminal non-unicode bullet diganti dengan '-'.
+ISSUE_PATTERN = re.compile(
+    r"^\s*(info|warning|error)\s+[•\-]\s+(.+?)\s+[•\-]\s+(.+?):(\d+):(\d+)\s+[•\-]\s+(\S+)\s*$"
+)
+
+SEVERITY_ORDER = {'error': 0, 'warning': 1, 'info': 2}
+
+# Jika scope yang harus dianalisis ulang melebihi porsi ini, lebih murah analisis penuh
+FULL_RUN_RATIO = 0.5
+# Batas panjang command line (Windows membatasi sekitar 32k karakter)
+MAX_COMMAND_CHARS = 24000
+
+
+def hash_bytes(data):
+    """Menghitung hash pendek dari bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def hash_files(project_root, rel_paths):
+    """Membaca dan menghitung hash setiap file. Mengembalikan (hashes, contents)."""
+    hashes = {}
+    contents = {}
+    for rel_path in rel_paths:
+        try:
+            with open(os.path.join(project_root, rel_path), 'rb') as f:
+                data = f.read()
+        except OSError:
+            continue
+        hashes[rel_path] = hash_bytes(data)
+        contents[rel_path] = data.decode('utf-8', errors='ignore')
+    return hashes, contents
+
+
+def compute_config_hash(project_root, sdk_version):
+    """Hash gabungan konfigurasi analisis dan versi SDK."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{CACHE_VERSION}|{sdk_version}".encode('utf-8'))
+    for name in CONFIG_FILES:
+        digest.update(f"|{name}|".encode('utf-8'))
+        try:
+            with open(os.path.join(project_root, name), 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b'<missing>')
+    return digest.hexdigest()
+
+
+def parse_analyze_output(output, project_root):
+    """Mengubah output teks `flutter analyze` menjadi list issue (dict)."""
+    issues = []
+    for line in output.splitlines():
+        match = ISSUE_PATTERN.match(line)
+        if not match:
+            continue
+        severity, message, file_path, line_no, column, rule = match.groups()
+        if os.path.isabs(file_path):
+            file_path = os.path.relpath(file_path, project_root)
+        issues.append({
+            'severity': severity,
+            'message': message,
+            'file': file_path.replace(os.sep, '/'),
+            'line': int(line_no),
+            'column': int(column),
+            'rule': rule,
+        })
+    return issues
+
+
+def format_issue(issue):
+    """Memformat issue kembali ke format baris `flutter analyze`."""
+    return (f"{issue['severity']:>7} • {issue['message']} • "
+            f"{issue['file']}:{issue['line']}:{issue['column']} • {issue['rule']}")
+
+
+def format_issues(issues):
+    """Menyusun ulang output analisis lengkap dari daftar issue."""
+    if not issues:
+        return "No issues found!"
+    lines = [format_issue(issue) for issue in issues]
+    count = len(issues)
+    lines.append("")
+    lines.append(f"{count} issue{'s' if count != 1 else ''} found.")
+    return "\n".join(lines)
+
+
+class AnalysisCache:
+    """Cache issue per file, disimpan di disk sebagai JSON."""
+
+    def __init__(self, path):
+        self.path = path
+        self.config_hash = None
+        self.files = {}
+        self.last_full_duration = 0.0
+
+    def load(self):
+        """Memuat cache dari disk. Cache rusak atau versi lama diabaikan."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != CACHE_VERSION:
+            return False
+        self.config_hash = data.get('config_hash')
+        self.files = data.get('files', {})
+        self.last_full_duration = data.get('last_full_duration', 0.0)
+        return True
+
+    def save(self):
+        """Menyimpan cache secara atomik (tulis ke file sementara lalu rename)."""
+        data = {
+            'version': CACHE_VERSION,
+            'config_hash': self.config_hash,
+            'last_full_duration': self.last_full_duration,
+            'files': self.files,
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def plan(self, config_hash, current_hashes):
+        """
+        Menentukan file mana yang berubah dibanding cache.
+        Mengembalikan (changed, deleted), atau None jika harus analisis penuh.
+        """
+        if self.config_hash != config_hash or not self.files:
+            return None
+        changed = {path for path, file_hash in current_hashes.items()
+                   if self.files.get(path, {}).get('hash') != file_hash}
+        deleted = {path for path, entry in self.files.items()
+                   if entry['hash'] is not None and path not in current_hashes}
+        return changed, deleted
+
+    def replace_all(self, config_hash, current_hashes, issues):
+        """Mengisi ulang cache dari hasil analisis penuh."""
+        self.config_hash = config_hash
+        self.files = {path: {'hash': file_hash, 'issues': []}
+                      for path, file_hash in current_hashes.items()}
+        self._assign_issues(issues)
+
+    def merge(self, scope, deleted, current_hashes, issues):
+        """Mengganti issue untuk file di dalam scope dengan hasil analisis terbaru."""
+        for path in deleted:
+            self.files.pop(path, None)
+        for path in scope:
+            if path in current_hashes:
+                self.files[path] = {'hash': current_hashes[path], 'issues': []}
+        self._assign_issues(issue for issue in issues if issue['file'] in scope)
+
+    def _assign_issues(self, issues):
+        for issue in issues:
+            entry = self.files.get(issue['file'])
+            if entry is None:
+                # Issue di file non-Dart (mis. pubspec.yaml) tetap disimpan
+                entry = self.files.setdefault(issue['file'], {'hash': None, 'issues': []})
+            entry['issues'].append(issue)
+
+    def all_issues(self):
+        """Semua issue dari cache, diurutkan seperti output flutter analyze."""
+        issues = []
+        for entry in self.files.values():
+            issues.extend(entry['issues'])
+        issues.sort(key=lambda issue: (SEVERITY_ORDER.get(issue['severity'], 3),
+                                       issue['file'], issue['line'], issue['column']))
+        return issues
+
+
+def should_run_full(scope, total_files):
+    """Menentukan apakah scope terlalu besar sehingga analisis penuh lebih murah."""
+    if total_files == 0 or len(scope) > total_files * FULL_RUN_RATIO:
+        return True
+    return sum(len(path) + 1 for path in scope) > MAX_COMMAND_CHARS
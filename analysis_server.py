@@ -0,0 +1,247 @@
+import json
+import os
+import subprocess
+import threading
+import time
+
+from analysis_cache import SEVERITY_ORDER
+from dart_import_graph import SKIPPED_DIRS
+
+# Tipe error yang juga disembunyikan oleh `flutter analyze`
+IGNORED_ERROR_TYPES = {'TODO'}
+
+
+def analysis_server_command(flutter_executable):
+    """Command untuk menjalankan analysis server dari SDK yang sama dengan flutter."""
+    bin_dir = os.path.dirname(os.path.realpath(flutter_executable))
+    dart_name = 'dart.bat' if os.name == 'nt' else 'dart'
+    dart_executable = os.path.join(bin_dir, dart_name)
+    if not os.path.isfile(dart_executable):
+        dart_executable = 'dart'
+    return [dart_executable, 'language-server', '--protocol=analyzer']
+
+
+class AnalysisServerError(Exception):
+    """Error dari analysis server atau proses server yang berhenti."""
+
+
+class AnalysisServerClient:
+    """
+    Client untuk protokol JSON analysis server Dart (satu pesan JSON per baris).
+    Server tetap hidup di antara permintaan analisis sehingga analisis berikutnya
+    hanya memproses file yang berubah.
+    """
+
+    def __init__(self, command, project_root):
+        self.command = command
+        self.project_root = os.path.abspath(project_root)
+        self.process = None
+        self.errors = {}
+        self.mtimes = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._status = threading.Condition()
+        self._analyzing = False
+        self._analysis_done_count = 0
+        self._connected = threading.Event()
+        self._roots_set = False
+        self._reader = None
+
+    def start(self, timeout=60):
+        """Menjalankan proses server dan menunggu notifikasi server.connected."""
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            bufsize=1,
+            cwd=self.project_root,
+        )
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        if not self._connected.wait(timeout):
+            self.stop()
+            raise AnalysisServerError("Analysis server tidak merespons (server.connected)")
+
+    def _read_loop(self):
+        for line in self.process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if 'id' in message:
+                pending = self._pending.pop(message['id'], None)
+                if pending is not None:
+                    pending['response'] = message
+                    pending['event'].set()
+            else:
+                self._handle_notification(message.get('event'), message.get('params', {}))
+
+        # Proses server berhenti: bangunkan semua yang sedang menunggu
+        for pending in list(self._pending.values()):
+            pending['event'].set()
+        with self._status:
+            self._analyzing = False
+            self._status.notify_all()
+
+    def _handle_notification(self, event, params):
+        if event == 'server.connected':
+            self._connected.set()
+        elif event == 'analysis.errors':
+            self.errors[params.get('file')] = params.get('errors', [])
+        elif event == 'server.status' and 'analysis' in params:
+            with self._status:
+                self._analyzing = params['analysis'].get('isAnalyzing', False)
+                if not self._analyzing:
+                    self._analysis_done_count += 1
+                self._status.notify_all()
+
+    def request(self, method, params=None, timeout=60):
+        """Mengirim request dan menunggu response. Mengembalikan field 'result'."""
+        if self.process is None or self.process.poll() is not None:
+            raise AnalysisServerError("Analysis server tidak berjalan")
+        with self._lock:
+            self._next_id += 1
+            request_id = str(self._next_id)
+            pending = {'event': threading.Event(), 'response': None}
+            self._pending[request_id] = pending
+            payload = {'id': request_id, 'method': method}
+            if params is not None:
+                payload['params'] = params
+            self.process.stdin.write(json.dumps(payload) + "\n")
+            self.process.stdin.flush()
+
+        if not pending['event'].wait(timeout):
+            self._pending.pop(request_id, None)
+            raise AnalysisServerError(f"Timeout menunggu response {method}")
+        response = pending['response']
+        if response is None:
+            raise AnalysisServerError("Analysis server berhenti sebelum merespons")
+        if response.get('error'):
+            raise AnalysisServerError(f"{method}: {response['error'].get('message')}")
+        return response.get('result', {})
+
+    def wait_for_analysis(self, since_count, timeout=600, settle=0.3):
+        """
+        Menunggu sampai analisis yang dipicu setelah `since_count` selesai.
+        Jika dalam `settle` detik server tidak mulai menganalisis, dianggap tidak ada perubahan.
+        """
+        deadline = time.monotonic() + timeout
+        settle_deadline = time.monotonic() + settle
+        with self._status:
+            while True:
+                if self._analysis_done_count > since_count and not self._analyzing:
+                    return True
+                now = time.monotonic()
+                if not self._analyzing and now >= settle_deadline:
+                    return True
+                if now >= deadline:
+                    return False
+                if self.process.poll() is not None:
+                    raise AnalysisServerError("Analysis server berhenti saat analisis")
+                wake_at = deadline if self._analyzing else settle_deadline
+                self._status.wait(min(wake_at - now, 1.0))
+
+    def _scan_mtimes(self):
+        mtimes = {}
+        for current_dir, dirs, files in os.walk(self.project_root):
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in SKIPPED_DIRS]
+            for name in files:
+                if name.endswith('.dart') or name in ('analysis_options.yaml', 'pubspec.yaml'):
+                    path = os.path.join(current_dir, name)
+                    try:
+                        mtimes[path] = os.stat(path).st_mtime_ns
+                    except OSError:
+                        pass
+        return mtimes
+
+    def analyze(self, timeout=600):
+        """
+        Analisis pertama mendaftarkan root project; analisis berikutnya hanya
+        memberi tahu server file yang berubah sejak panggilan sebelumnya.
+        Mengembalikan (issues, changed_count).
+        """
+        with self._status:
+            since_count = self._analysis_done_count
+
+        current = self._scan_mtimes()
+        if not self._roots_set:
+            self.request('analysis.setAnalysisRoots', {
+                'included': [self.project_root],
+                'excluded': [],
+            })
+            self._roots_set = True
+            changed_count = len(current)
+            settle = timeout
+        else:
+            changed = [path for path, mtime in current.items() if self.mtimes.get(path) != mtime]
+            deleted = [path for path in self.mtimes if path not in current]
+            changed_count = len(changed) + len(deleted)
+            if changed:
+                # Overlay lalu langsung dilepas: server dipaksa membaca ulang isi file dari disk
+                # tanpa bergantung pada timing file watcher.
+                files = {path: {'type': 'add', 'content': self._read_text(path)} for path in changed}
+                self.request('analysis.updateContent', {'files': files})
+                self.request('analysis.updateContent', {
+                    'files': {path: {'type': 'remove'} for path in changed}
+                })
+            for path in deleted:
+                self.errors.pop(path, None)
+            settle = 0.3 if changed_count else 0.0
+        self.mtimes = current
+
+        if not self.wait_for_analysis(since_count, timeout=timeout, settle=settle):
+            raise AnalysisServerError("Timeout menunggu analysis server selesai")
+        return self.collect_issues(), changed_count
+
+    @staticmethod
+    def _read_text(path):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+
+    def collect_issues(self):
+        """Mengubah error dari server menjadi format issue yang sama dengan flutter analyze."""
+        issues = []
+        # Dengan separator: /work/app2 bukan bagian dari /work/app
+        root_prefix = os.path.join(self.project_root, '')
+        for file_path, errors in self.errors.items():
+            if not file_path or not file_path.startswith(root_prefix):
+                continue
+            rel_path = os.path.relpath(file_path, self.project_root).replace(os.sep, '/')
+            for error in errors:
+                if error.get('type') in IGNORED_ERROR_TYPES:
+                    continue
+                location = error.get('location', {})
+                issues.append({
+                    'severity': error.get('severity', 'INFO').lower(),
+                    'message': error.get('message', ''),
+                    'file': rel_path,
+                    'line': location.get('startLine', 0),
+                    'column': location.get('startColumn', 0),
+                    'rule': error.get('code', ''),
+                })
+        issues.sort(key=lambda issue: (SEVERITY_ORDER.get(issue['severity'], 3),
+                                       issue['file'], issue['line'], issue['column']))
+        return issues
+
+    def stop(self, timeout=10):
+        """Meminta server berhenti dengan rapi, atau mematikannya jika tidak merespons."""
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            try:
+                self.request('server.shutdown', timeout=timeout)
+            except (AnalysisServerError, OSError):
+                pass
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
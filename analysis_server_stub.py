@@ -0,0 +1,102 @@
+"""
+Stub analysis server yang berbicara dengan protokol JSON yang sama seperti
+`dart language-server --protocol=analyzer`, untuk mencoba mode --server
+tanpa Dart SDK:
+
+    python flutter_analyzer_output.py --server --server-command "python analysis_server_stub.py"
+
+Setiap baris yang memanggil print( dilaporkan sebagai issue avoid_print.
+"""
+import json
+import os
+import sys
+import time
+
+ANALYSIS_DELAY = float(os.environ.get('STUB_ANALYSIS_DELAY', '0.05'))
+
+
+def send(message):
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def analyze_file(path, content=None):
+    """Menghasilkan AnalysisError untuk satu file."""
+    if content is None:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read()
+        except OSError:
+            content = ""
+    errors = []
+    offset = 0
+    for line_no, line in enumerate(content.splitlines(True), 1):
+        column = line.find('print(')
+        if column >= 0:
+            errors.append({
+                'severity': 'INFO',
+                'type': 'LINT',
+                'location': {
+                    'file': path,
+                    'offset': offset + column,
+                    'length': 5,
+                    'startLine': line_no,
+                    'startColumn': column + 1,
+                },
+                'message': "Don't invoke 'print' in production code.",
+                'code': 'avoid_print',
+            })
+        offset += len(line)
+    return errors
+
+
+def analyze(paths, overlays):
+    send({'event': 'server.status', 'params': {'analysis': {'isAnalyzing': True}}})
+    time.sleep(ANALYSIS_DELAY)
+    for path in paths:
+        send({'event': 'analysis.errors', 'params': {
+            'file': path,
+            'errors': analyze_file(path, overlays.get(path)),
+        }})
+    send({'event': 'server.status', 'params': {'analysis': {'isAnalyzing': False}}})
+
+
+def dart_files(roots):
+    for root in roots:
+        for current_dir, dirs, files in os.walk(root):
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'build']
+            for name in files:
+                if name.endswith('.dart'):
+                    yield os.path.join(current_dir, name)
+
+
+def main():
+    overlays = {}
+    send({'event': 'server.connected', 'params': {'version': 'stub', 'pid': os.getpid()}})
+
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        method = request.get('method')
+        params = request.get('params', {})
+        send({'id': request.get('id'), 'result': {}} if method != 'server.getVersion'
+             else {'id': request.get('id'), 'result': {'version': 'stub'}})
+
+        if method == 'analysis.setAnalysisRoots':
+            analyze(list(dart_files(params.get('included', []))), overlays)
+        elif method == 'analysis.updateContent':
+            files = params.get('files', {})
+            for path, change in files.items():
+                if change.get('type') == 'add':
+                    overlays[path] = change.get('content', '')
+                else:
+                    overlays.pop(path, None)
+            analyze(list(files), overlays)
+        elif method == 'server.shutdown':
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,42 @@
+import argparse
+import json
+import signal
 import subprocess
 import os
+import sys
 import time
 import threading
-import shutil
+
+from concurrency_governor import get_governor
+from fix_scheduler import DEFAULT_JITTER, DEFAULT_MAX_BACKOFF, DEFAULT_MAX_DUTY, FixScheduler
+from project_lock import ProjectLock
+from script_core.sdk import require_executable
+import tracing
 
 # Event ini berfungsi sebagai "saklar" untuk menghentikan thread dengan aman
 stop_event = threading.Event()
 
-def find_dart_executable():
-    """Mencari lokasi executable dart."""
-    # Coba cari dart di PATH
-    dart_path = shutil.which('dart')
-    if dart_path:
-        return dart_path
-    
-    # Jika tidak ditemukan di PATH, coba lokasi umum Flutter
-    common_paths = [
-        os.path.expanduser('~/flutter/bin/dart'),
-        os.path.expanduser('~/AppData/Local/Pub/Cache/bin/dart'),
-        'C:/flutter/bin/dart',
-        'C:/flutter/bin/dart.exe',
-        os.path.expanduser('~/flutter/bin/dart.exe'),
-    ]
-    
-    for path in common_paths:
-        if os.path.isfile(path):
-            return path
-    
-    return None
-
-def run_dart_fix():
+@tracing.traced()
+def run_dart_fix(project_root=None):
     """Menjalankan perintah 'dart fix --apply' dan menangani output."""
     try:
-        # Cari executable dart
-        dart_executable = find_dart_executable()
+        # Cari executable dart (pesan hanya muncul jika tidak ditemukan)
+        dart_executable = require_executable('dart', quiet=True)
         
         if not dart_executable:
-            print("\n❌ ERROR: Perintah 'dart' tidak ditemukan di PATH atau lokasi umum.")
-            print("💡 SOLUSI: Pastikan Flutter SDK sudah diinstall dan ditambahkan ke PATH sistem.")
-            print("   Atau jalankan script ini dari terminal yang sudah memiliki akses ke Flutter.")
             stop_event.set()
             return False
         
         # Menjalankan perintah dengan path absolut
-        result = subprocess.run(
-            [dart_executable, 'fix', '--apply'], 
-            check=True, 
-            text=True, 
-            capture_output=True,
-            cwd=os.getcwd()  # Pastikan working directory benar
-        )
+        with tracing.span('dart fix --apply', category='process'):
+            result = get_governor().run(
+                'dart fix',
+                [dart_executable, 'fix', '--apply'], 
+                check=True, 
+                text=True, 
+                capture_output=True,
+                cwd=project_root or os.getcwd()  # Pastikan working directory benar
+            )
         
         print(f"[{time.strftime('%H:%M:%S')}] ✅ Perbaikan otomatis berhasil diterapkan.")
         
@@ -76,64 +63,210 @@ def run_dart_fix():
         print(f"\n[{time.strftime('%H:%M:%S')}] ❌ Terjadi error yang tidak terduga: {e}")
         return False
 
-def run_periodically(interval_seconds):
+def run_periodically(scheduler):
     """
     Fungsi utama yang akan dijalankan di thread terpisah.
-    Ini akan memanggil run_dart_fix() berulang kali.
+    Scheduler memanggil run_dart_fix() berulang kali: trigger yang menumpuk digabung,
+    kegagalan beruntun memperpanjang jeda, dan fix tidak berjalan saat analyze/test
+    memegang lock project.
     """
     print(f"\n--- 🚀 Memulai mode otomatis ---")
-    print(f"Perintah akan dijalankan setiap {interval_seconds} detik.")
+    print(f"Perintah akan dijalankan setiap ±{scheduler.interval} detik "
+          f"(maks. {scheduler.max_duty * 100:.0f}% waktu, backoff hingga {scheduler.max_backoff:.0f} detik saat gagal).")
     
-    while not stop_event.is_set():
-        run_dart_fix()
-        # Tunggu selama interval yang ditentukan atau sampai sinyal stop diterima
-        stop_event.wait(interval_seconds)
+    scheduler.run()
         
     print("\n--- 🛑 Mode otomatis dihentikan ---")
 
-def main():
-    """Fungsi utama untuk setup dan menunggu perintah stop."""
-    print("🔍 Memeriksa ketersediaan Dart SDK...")
-    
-    # Test dart executable terlebih dahulu
-    dart_executable = find_dart_executable()
-    if dart_executable:
-        print(f"✅ Dart ditemukan di: {dart_executable}")
-    else:
-        print("❌ Dart tidak ditemukan!")
-        print("\n💡 SOLUSI:")
-        print("1. Pastikan Flutter SDK sudah diinstall")
-        print("2. Tambahkan Flutter ke PATH sistem Anda")
-        print("3. Restart terminal/command prompt setelah menambahkan PATH")
-        print("4. Atau jalankan script ini dari terminal yang sudah memiliki akses Flutter")
-        return
-    
-    try:
-        interval = int(input("\nAtur interval waktu dalam detik (contoh: 10): "))
-        if interval <= 0:
-            print("⚠️ Interval harus lebih dari 0.")
-            return
-    except ValueError:
-        print("⚠️ Input tidak valid. Harap masukkan angka.")
-        return
+# Nilai default pengaturan; bisa ditimpa file config (JSON) lalu argumen CLI
+DEFAULT_SETTINGS = {
+    'interval': None,
+    'project': None,
+    'max_backoff': DEFAULT_MAX_BACKOFF,
+    'jitter': DEFAULT_JITTER,
+    'max_duty': DEFAULT_MAX_DUTY,
+    'control_port': 0,
+    'metrics_file': None,
+}
+
+def load_settings(args):
+    """Menggabungkan default, file config JSON (--config) dan argumen CLI."""
+    settings = dict(DEFAULT_SETTINGS)
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        unknown = set(config) - set(settings)
+        if unknown:
+            raise ValueError(f"kunci config tidak dikenal: {', '.join(sorted(unknown))}")
+        settings.update(config)
+    for key in settings:
+        value = getattr(args, key, None)
+        if value is not None:
+            settings[key] = value
+    settings['project'] = os.path.abspath(settings['project'] or os.getcwd())
+    return settings
+
+def create_scheduler(settings, on_run=None):
+    project_root = settings['project']
+    return FixScheduler(
+        lambda: run_dart_fix(project_root), settings['interval'], stop_event,
+        lock_factory=lambda: ProjectLock(exclusive=True),
+        max_backoff=settings['max_backoff'], jitter=settings['jitter'], max_duty=settings['max_duty'],
+        on_run=on_run,
+    )
+
+def write_metrics_file(path, metrics):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(tmp_path, path)
+
+def run_daemon(settings):
+    """
+    Mode daemon: tanpa input(), dikendalikan lewat socket kontrol lokal
+    (status/metrics/trigger/pause/resume/stop) dan berhenti rapi saat SIGTERM/SIGINT.
+    """
+    from fixer_control import ControlServer
+
+    def on_run(scheduler):
+        if settings['metrics_file']:
+            try:
+                write_metrics_file(settings['metrics_file'], scheduler.metrics())
+            except OSError as e:
+                print(f"⚠️ Metrik tidak dapat ditulis: {e}")
+
+    scheduler = create_scheduler(settings, on_run)
+
+    def handle_command(command):
+        if command == 'status':
+            return {'ok': True, 'status': scheduler.status_line()}
+        if command == 'metrics':
+            return {'ok': True, 'metrics': scheduler.metrics()}
+        if command == 'trigger':
+            scheduler.trigger()
+        elif command == 'pause':
+            scheduler.pause()
+        elif command == 'resume':
+            scheduler.resume()
+        elif command == 'stop':
+            shutdown()
+        else:
+            return {'ok': False, 'error': f"perintah tidak dikenal: {command}"}
+        return {'ok': True}
+
+    server = ControlServer(handle_command, settings['control_port'])
+
+    def shutdown(*_):
+        scheduler.stop()
+        server.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    # Di bawah supervisor stdout biasanya pipe/file; log langsung ditulis per baris
+    sys.stdout.reconfigure(line_buffering=True)
+
+    print(f"🛰️ Daemon berjalan (pid {os.getpid()}), project: {settings['project']}")
+    print(f"   Kontrol: 127.0.0.1:{server.port} (detail di {server.control_path})")
+    background_thread = threading.Thread(target=run_periodically, args=(scheduler,))
+    background_thread.start()
+    server.serve()
+    scheduler.stop()
+    background_thread.join()
+    print(f"📊 Statistik fix: {scheduler.format_stats()}")
+    return 0
+
+def run_interactive(settings):
+    """Mode interaktif seperti semula: interval ditanya jika tidak diberikan, [ENTER] untuk berhenti."""
+    if settings['interval'] is None:
+        try:
+            settings['interval'] = int(input("\nAtur interval waktu dalam detik (contoh: 10): "))
+        except ValueError:
+            print("⚠️ Input tidak valid. Harap masukkan angka.")
+            return 1
+    if settings['interval'] <= 0:
+        print("⚠️ Interval harus lebih dari 0.")
+        return 1
 
     # Buat dan mulai thread yang akan menjalankan tugas di latar belakang
-    background_thread = threading.Thread(target=run_periodically, args=(interval,))
+    scheduler = create_scheduler(settings)
+    background_thread = threading.Thread(target=run_periodically, args=(scheduler,))
     background_thread.start()
 
     # Main thread akan menunggu di sini sampai pengguna menekan Enter
     print("\n=======================================================")
     print("   Program berjalan di latar belakang...")
+    print("   Ketik 's' + [ENTER] untuk status, 'r' + [ENTER] untuk fix sekarang.")
     print("   Tekan [ENTER] kapan saja untuk menghentikan program.")
     print("=======================================================")
-    input() # Baris ini akan menjeda program sampai Enter ditekan
+    while True:
+        try:
+            command = input().strip().lower() # Baris ini akan menjeda program sampai Enter ditekan
+        except EOFError:
+            break
+        if command == 's':
+            print(scheduler.status_line())
+        elif command == 'r':
+            scheduler.trigger()
+        else:
+            break
 
     # Setelah Enter ditekan, kirim sinyal stop ke thread
-    stop_event.set()
+    scheduler.stop()
 
     # Tunggu thread selesai dengan rapi sebelum keluar dari program utama
     background_thread.join()
+    print(f"📊 Statistik fix: {scheduler.format_stats()}")
+    return 0
+
+def main():
+    """Fungsi utama untuk setup dan menunggu perintah stop."""
+    parser = argparse.ArgumentParser(description="Menjalankan 'dart fix --apply' secara berkala.")
+    parser.add_argument('--daemon', action='store_true',
+                        help="Jalankan tanpa input interaktif, dikendalikan lewat socket kontrol")
+    parser.add_argument('--once', action='store_true',
+                        help="Jalankan dart fix sekali lalu keluar (return code 1 jika gagal)")
+    parser.add_argument('--control', choices=['status', 'metrics', 'trigger', 'pause', 'resume', 'stop'],
+                        help="Kirim perintah ke daemon yang sedang berjalan")
+    parser.add_argument('--config', help="File config JSON (kunci sama dengan nama argumen, pakai '_')")
+    parser.add_argument('--interval', type=int, help="Interval antar run dalam detik")
+    parser.add_argument('--project', help="Root project Flutter (default: folder saat ini)")
+    parser.add_argument('--max-backoff', type=float, help="Jeda maksimum setelah kegagalan beruntun (detik)")
+    parser.add_argument('--jitter', type=float, help="Variasi acak jeda, misalnya 0.1 = ±10%%")
+    parser.add_argument('--max-duty', type=float, help="Porsi waktu maksimum untuk dart fix (0-1)")
+    parser.add_argument('--control-port', type=int, help="Port TCP lokal socket kontrol (default: acak)")
+    parser.add_argument('--metrics-file', help="Tulis metrik JSON ke file ini setiap selesai run")
+    args = parser.parse_args()
+
+    if args.control:
+        from fixer_control import send_command
+
+        response = send_command(args.control)
+        print(json.dumps(response, indent=2, ensure_ascii=False))
+        return 0 if response.get('ok') else 1
+
+    try:
+        settings = load_settings(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ Config tidak dapat dibaca: {e}")
+        return 1
+
+    # Test dart executable terlebih dahulu
+    if not require_executable('dart'):
+        return 1
+    
+    if args.once:
+        with ProjectLock(exclusive=True):
+            return 0 if run_dart_fix(settings['project']) else 1
+
+    if args.daemon:
+        if not settings['interval'] or settings['interval'] <= 0:
+            print("⚠️ Mode daemon membutuhkan --interval (atau 'interval' di config) lebih dari 0.")
+            return 1
+        return run_daemon(settings)
+
+    result = run_interactive(settings)
     print("👋 Program ditutup.")
+    return result
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,326 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_RESULTS_NAME = "bench_results.json"
+# Kenaikan waktu median di atas ambang ini dianggap regresi saat --compare
+DEFAULT_THRESHOLD = 0.2
+
+# Executable palsu: output dan latensi dikendalikan env BENCH_* yang diisi harness
+FAKE_FLUTTER = r'''#!/usr/bin/env python3
+import json, os, sys, time
+
+args = sys.argv[1:]
+issues = int(os.environ.get('BENCH_ISSUES', '50000'))
+test_events = int(os.environ.get('BENCH_TEST_EVENTS', '10000'))
+latency = float(os.environ.get('BENCH_LATENCY', '0.2'))
+out = sys.stdout
+
+def dart_files(root):
+    found = []
+    for current, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'scripts']
+        found += [os.path.relpath(os.path.join(current, f), '.').replace(os.sep, '/')
+                  for f in files if f.endswith('.dart')]
+    return sorted(found)
+
+if args[:1] == ['analyze']:
+    targets = [a for a in args[1:] if a.endswith('.dart')]
+    all_files = dart_files('lib')
+    per_file = max(1, issues // max(1, len(all_files)))
+    files = targets or all_files
+    time.sleep(latency * (len(files) / max(1, len(all_files)) if targets else 1))
+    out.write("Analyzing project...\n\n")
+    count = 0
+    for path in files:
+        for n in range(per_file):
+            severity = 'error' if n % 1000 == 999 else 'warning' if n % 10 == 9 else 'info'
+            out.write(f"   {severity} • Sample lint message number {n} for benchmark • "
+                      f"{path}:{n + 1}:{(n % 40) + 1} • rule_{n % 25}\n")
+            count += 1
+    out.write(f"\n{count} issues found. (ran in {latency:.1f}s)\n" if count else "No issues found!\n")
+    sys.exit(1 if count else 0)
+
+if args[:1] == ['test']:
+    rest = args[1:]
+    files = [a for a in rest if a.endswith('.dart')] or dart_files('test')
+    coverage_path = rest[rest.index('--coverage-path') + 1] if '--coverage-path' in rest else 'coverage/lcov.info'
+    names = [rest[i + 1] for i, a in enumerate(rest) if a == '--plain-name']
+    # Setiap test menghasilkan 2 event (testStart + testDone)
+    tests_total = max(1, test_events // 2)
+    all_tests = dart_files('test')
+    per_file = max(1, tests_total // max(1, len(all_tests)))
+    time.sleep(latency)
+    start = time.time()
+    ms = lambda: int((time.time() - start) * 1000)
+    emit = lambda event: out.write(json.dumps(event) + "\n")
+    emit({'type': 'start', 'protocolVersion': '0.1.1', 'time': 0})
+    test_id = 0
+    failed = False
+    for suite_id, path in enumerate(files):
+        emit({'type': 'suite', 'suite': {'id': suite_id, 'platform': 'vm', 'path': os.path.abspath(path)}, 'time': ms()})
+        test_id += 1
+        emit({'type': 'testStart', 'test': {'id': test_id, 'name': 'loading ' + path, 'suiteID': suite_id}, 'time': ms()})
+        emit({'type': 'testDone', 'testID': test_id, 'result': 'success', 'hidden': True, 'skipped': False, 'time': ms()})
+        for n in range(per_file):
+            name = f"group {n // 10} test {n}"
+            if names and not any(pattern in name for pattern in names):
+                continue
+            test_id += 1
+            emit({'type': 'testStart', 'test': {'id': test_id, 'name': name, 'suiteID': suite_id}, 'time': ms()})
+            bad = n % 997 == 1
+            if bad:
+                failed = True
+                emit({'type': 'error', 'testID': test_id, 'error': 'Expected: <1>\n  Actual: <2>',
+                      'stackTrace': f'package:bench/{path} {n}:7', 'isFailure': True, 'time': ms()})
+            emit({'type': 'testDone', 'testID': test_id, 'result': 'failure' if bad else 'success',
+                  'hidden': False, 'skipped': False, 'time': ms()})
+    if '--coverage' in rest:
+        os.makedirs(os.path.dirname(coverage_path) or '.', exist_ok=True)
+        with open(coverage_path, 'w') as lcov:
+            for path in dart_files('lib'):
+                lcov.write(f"SF:{path}\n")
+                for line in range(1, 81):
+                    lcov.write(f"DA:{line},{(line + len(files)) % 3}\n")
+                lcov.write("LF:80\nLH:53\nend_of_record\n")
+    emit({'type': 'done', 'success': not failed, 'time': ms()})
+    sys.exit(1 if failed else 0)
+
+sys.exit(0)
+'''
+
+FAKE_DART = r'''#!/usr/bin/env python3
+import os, sys, time
+
+args = sys.argv[1:]
+if args[:1] == ['fix']:
+    time.sleep(float(os.environ.get('BENCH_LATENCY', '0.2')))
+    print("Computing fixes in project...")
+    files = int(os.environ.get('BENCH_FIX_FILES', '200'))
+    for index in range(files):
+        print(f"lib/src/f{index}.dart\n  prefer_const_constructors • 2 fixes")
+    print(f"\n{files * 2} fixes made in {files} files.")
+sys.exit(0)
+'''
+
+# Skenario: (nama, script, argumen, return code yang diharapkan, laporan yang harus
+# ditulis di folder scripts atau None). Run yang tidak sesuai membuat skenario gagal,
+# sehingga script yang crash tidak tercatat sebagai run cepat.
+SCENARIOS = [
+    ('fix_once', 'auto_fixer_dart.py', ['--once'], 0, None),
+    ('analyze_full', 'flutter_analyzer_output.py', ['--no-cache'], 0, 'flutter_analyze.txt'),
+    ('analyze_cached', 'flutter_analyzer_output.py', [], 0, 'flutter_analyze.txt'),
+    ('test', 'flutter_tester.py', [], 0, 'flutter_test_results.txt'),
+    ('test_sharded', 'flutter_tester.py', ['--shards', '4'], 0, 'flutter_test_results.txt'),
+]
+
+
+def write_executable(path, content):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.chmod(path, 0o755)
+
+
+def create_workspace(root, source_dir, lib_files, test_files):
+    """Project Flutter sintetis dengan script repo disalin ke project/scripts."""
+    project = os.path.join(root, 'project')
+    scripts = os.path.join(project, 'scripts')
+    bin_dir = os.path.join(root, 'bin')
+    for path in (os.path.join(project, 'lib'), os.path.join(project, 'test'), scripts, bin_dir):
+        os.makedirs(path, exist_ok=True)
+
+    with open(os.path.join(project, 'pubspec.yaml'), 'w', encoding='utf-8') as f:
+        f.write("name: bench\nenvironment:\n  sdk: '>=3.0.0 <4.0.0'\n")
+    for index in range(lib_files):
+        with open(os.path.join(project, 'lib', f'f{index}.dart'), 'w', encoding='utf-8') as f:
+            if index:
+                f.write(f"import 'package:bench/f{index // 2}.dart';\n")
+            f.write(f"int value{index}() => {index};\n")
+    for index in range(test_files):
+        with open(os.path.join(project, 'test', f't{index}_test.dart'), 'w', encoding='utf-8') as f:
+            f.write(f"import 'package:bench/f{index % max(1, lib_files)}.dart';\n"
+                    f"void main() {{ test('works', () {{}}); }}\n")
+
+    for name in os.listdir(source_dir):
+        if name.endswith('.py') and name != os.path.basename(__file__):
+            shutil.copy2(os.path.join(source_dir, name), os.path.join(scripts, name))
+    shutil.copytree(os.path.join(source_dir, 'script_core'), os.path.join(scripts, 'script_core'),
+                    ignore=shutil.ignore_patterns('__pycache__'))
+
+    write_executable(os.path.join(bin_dir, 'flutter'), FAKE_FLUTTER)
+    write_executable(os.path.join(bin_dir, 'dart'), FAKE_DART)
+    return project, scripts, bin_dir
+
+
+def run_measured(command, cwd, env):
+    """
+    Menjalankan satu proses dan mengembalikan (detik, peak RSS KB, return code).
+    Peak RSS diambil dari wait4; angka ini mencakup proses anak yang sudah di-wait
+    (termasuk executable palsu) sehingga paling berguna untuk dibandingkan antar run.
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return elapsed, usage.ru_maxrss, process.returncode
+
+
+def check_run(return_code, report_path, expected_return_code):
+    """Pesan kegagalan satu run, atau None jika return code dan laporannya sesuai."""
+    if return_code != expected_return_code:
+        return f"return code {return_code}, diharapkan {expected_return_code}"
+    if report_path is not None:
+        try:
+            if os.path.getsize(report_path) == 0:
+                return f"laporan {os.path.basename(report_path)} kosong"
+        except OSError:
+            return f"laporan {os.path.basename(report_path)} tidak ditulis"
+    return None
+
+
+def measure_scenario(command, cwd, env, report_path, expected_return_code):
+    """Satu run terukur; laporan lama dihapus dulu agar yang diperiksa hasil run ini."""
+    if report_path is not None and os.path.exists(report_path):
+        os.remove(report_path)
+    elapsed, rss, return_code = run_measured(command, cwd, env)
+    return elapsed, rss, return_code, check_run(return_code, report_path, expected_return_code)
+
+
+def run_benchmarks(args):
+    source_dir = os.path.dirname(os.path.abspath(__file__))
+    root = tempfile.mkdtemp(prefix='flutter_scripts_bench_')
+    try:
+        project, scripts, bin_dir = create_workspace(root, source_dir, args.lib_files, args.test_files)
+        env = dict(os.environ)
+        env.update({
+            'PATH': bin_dir + os.pathsep + env.get('PATH', ''),
+            'BENCH_ISSUES': str(args.issues),
+            'BENCH_TEST_EVENTS': str(args.test_events),
+            'BENCH_LATENCY': str(args.latency),
+            'PYTHONDONTWRITEBYTECODE': '1',
+        })
+
+        results = {}
+        for name, script, script_args, expected_return_code, report_name in SCENARIOS:
+            if args.only and name not in args.only:
+                continue
+            command = [sys.executable, os.path.join(scripts, script)] + script_args
+            report_path = os.path.join(scripts, report_name) if report_name else None
+            # Satu run pemanasan (cache analisis, index graph import, riwayat test)
+            *_, error = measure_scenario(command, project, env, report_path, expected_return_code)
+            times = []
+            peak_rss = 0
+            return_codes = set()
+            for _ in range(args.repeat if error is None else 0):
+                elapsed, rss, return_code, error = measure_scenario(
+                    command, project, env, report_path, expected_return_code
+                )
+                times.append(elapsed)
+                peak_rss = max(peak_rss, rss)
+                return_codes.add(return_code)
+                if error is not None:
+                    break
+            results[name] = {
+                'command': " ".join([script] + script_args),
+                'ok': error is None,
+                'error': error,
+                'runs': times,
+                'median': statistics.median(times) if times else None,
+                'min': min(times) if times else None,
+                'peak_rss_kb': peak_rss,
+                'return_codes': sorted(return_codes),
+            }
+            if error is not None:
+                print(f"{name:16} ❌ GAGAL: {error}")
+                continue
+            print(f"{name:16} median {results[name]['median']:7.3f}s  min {results[name]['min']:7.3f}s  "
+                  f"peak RSS {peak_rss / 1024:7.1f} MB")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        'generated': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'parameters': {
+            'issues': args.issues, 'test_events': args.test_events, 'latency': args.latency,
+            'lib_files': args.lib_files, 'test_files': args.test_files, 'repeat': args.repeat,
+        },
+        'scenarios': results,
+    }
+
+
+def compare_results(current, baseline, threshold):
+    """Membandingkan median waktu dan peak RSS; mengembalikan daftar regresi."""
+    regressions = []
+    for name, result in current['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(name)
+        if old is None or not result['ok'] or not old.get('ok', True):
+            # Skenario gagal sudah dilaporkan; waktunya tidak sebanding
+            continue
+        time_ratio = result['median'] / old['median'] if old['median'] else 1.0
+        rss_ratio = result['peak_rss_kb'] / old['peak_rss_kb'] if old['peak_rss_kb'] else 1.0
+        flag = ""
+        if time_ratio > 1 + threshold or rss_ratio > 1 + threshold:
+            flag = "  ⚠️ REGRESI"
+            regressions.append(name)
+        print(f"{name:16} waktu {time_ratio - 1:+7.1%}  RSS {rss_ratio - 1:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark end-to-end script Flutter dengan executable dart/flutter palsu."
+    )
+    parser.add_argument('--issues', type=int, default=50000, help="Jumlah issue flutter analyze")
+    parser.add_argument('--test-events', type=int, default=10000, help="Jumlah event flutter test")
+    parser.add_argument('--latency', type=float, default=0.2, help="Latensi setiap perintah palsu (detik)")
+    parser.add_argument('--lib-files', type=int, default=500, help="Jumlah file di lib/")
+    parser.add_argument('--test-files', type=int, default=100, help="Jumlah file di test/")
+    parser.add_argument('--repeat', type=int, default=3, help="Jumlah run terukur per skenario")
+    parser.add_argument('--only', nargs='+', choices=[scenario[0] for scenario in SCENARIOS],
+                        help="Hanya jalankan skenario ini")
+    parser.add_argument('--output', default=BENCH_RESULTS_NAME, help="File hasil JSON")
+    parser.add_argument('--compare', help="File hasil sebelumnya untuk deteksi regresi")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Ambang regresi relatif (default 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if not hasattr(os, 'wait4'):
+        print("❌ Benchmark membutuhkan os.wait4 (Linux/macOS).")
+        return 1
+
+    results = run_benchmarks(args)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Hasil disimpan ke: {args.output}")
+
+    failed = [name for name, result in results['scenarios'].items() if not result['ok']]
+    if failed:
+        print(f"❌ Skenario gagal: {', '.join(failed)}")
+        return 1
+
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Baseline tidak dapat dibaca: {e}")
+            return 1
+        if compare_results(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+LOGGER_FILES = ["Log_writer.py", "Log_writer2.py", "Log_writer3.py"]
+# Pembanding: loop text-mode lama (readline per baris, decode + encode ulang per baris)
+TEXT_BASELINE = "text-baseline"
+RESULTS_FILE_NAME = "bench_terminal_logger.json"
+
+# Setiap baris dari generator membawa waktu kirim (ns) agar latensi bisa dihitung
+# saat baris itu sampai di write_log
+MARKER_PATTERN = re.compile(r"@@T(\d+)@@")
+MARKER_PATTERN_BYTES = re.compile(rb"@@T(\d+)@@")
+
+# Proses anak yang mensimulasikan command dengan output deras
+GENERATOR_SCRIPT = r'''
+import os, random, sys, time
+
+lines, rate, size, stderr_ratio, binary_ratio, seed = (
+    int(sys.argv[1]), float(sys.argv[2]), int(sys.argv[3]),
+    float(sys.argv[4]), float(sys.argv[5]), int(sys.argv[6]),
+)
+rng = random.Random(seed)
+out = sys.stdout.buffer
+err = sys.stderr.buffer
+interval = 1.0 / rate if rate > 0 else 0.0
+next_at = time.perf_counter()
+for index in range(lines):
+    if interval:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        next_at += interval
+    roll = rng.random()
+    if roll < binary_ratio:
+        # Byte acak termasuk UTF-8 tidak valid, tanpa penanda waktu
+        out.write(bytes(rng.randrange(0x80, 0x100) for _ in range(size)) + b"\n")
+        out.flush()
+        continue
+    head = f"@@T{time.time_ns()}@@ line {index} ".encode()
+    line = head + b"x" * max(0, size - len(head)) + b"\n"
+    if roll < binary_ratio + stderr_ratio:
+        err.write(line)
+        err.flush()
+    else:
+        out.write(line)
+        out.flush()
+'''
+
+
+class TextModeLogger:
+    """Salinan jalur baca lama TerminalLogger (text=True, bufsize=1) sebagai pembanding."""
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.log_file = None
+
+    def write_log(self, message):
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        if self.log_file:
+            self.log_file.write(f"[{timestamp}] {message}\n")
+            self.log_file.flush()
+        print(message, end="")
+
+    def start_logging(self):
+        self.log_file = open(self.output_file, "w", encoding="utf-8")
+
+    def stop_logging(self):
+        self.log_file.close()
+
+    def run_command(self, command):
+        try:
+            process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                       text=True, bufsize=1)
+            while True:
+                output = process.stdout.readline()
+                if output == "" and process.poll() is not None:
+                    break
+                if output:
+                    self.write_log(output)
+            stderr_output = process.stderr.read()
+            if stderr_output:
+                self.write_log(f"ERROR: {stderr_output}")
+        except Exception as e:
+            self.write_log(f"Error executing command: {e}\n")
+
+
+def load_logger_module(path):
+    """Memuat Log_writer*.py sebagai modul tanpa menjalankan main()."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def process_usage():
+    """
+    (cpu_user, cpu_system, peak_rss_kb) proses ini. Modul resource tidak ada di
+    Windows: CPU diambil dari os.times() dan RSS puncak dari psutil jika terpasang,
+    selain itu None.
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        # ru_maxrss dalam byte di macOS, kB di Linux
+        peak = usage.ru_maxrss / 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        return usage.ru_utime, usage.ru_stime, peak
+
+    times = os.times()
+    try:
+        import psutil
+    except ImportError:
+        return times.user, times.system, None
+    memory = psutil.Process().memory_info()
+    return times.user, times.system, getattr(memory, "peak_wset", memory.rss) / 1024
+
+
+def run_worker(args):
+    """
+    Dijalankan di proses terpisah per logger agar CPU dan peak RSS tidak tercampur.
+    Mencetak satu baris JSON hasil ke stdout asli.
+    """
+    real_stdout = sys.stdout
+    work_dir = tempfile.mkdtemp(prefix="bench_logger_")
+    generator_path = os.path.join(work_dir, "generator.py")
+    with open(generator_path, "w", encoding="utf-8") as f:
+        f.write(GENERATOR_SCRIPT)
+    log_path = os.path.join(work_dir, "terminal_log.txt")
+
+    # Logger juga mencetak setiap baris ke layar; biaya print tetap dibayar, tapi ke devnull
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    if args.worker == TEXT_BASELINE:
+        logger = TextModeLogger(log_path)
+    else:
+        logger = load_logger_module(args.worker).TerminalLogger(log_path)
+
+    latencies = []
+    received = [0]
+    original_write_log = logger.write_log
+
+    def traced_write_log(message):
+        now = time.time_ns()
+        for match in MARKER_PATTERN.finditer(message):
+            latencies.append(now - int(match.group(1)))
+            received[0] += 1
+        original_write_log(message)
+
+    logger.write_log = traced_write_log
+
+    if hasattr(logger, "write_log_lines"):
+        # Jalur bytes: baris output tidak lewat write_log
+        original_write_log_lines = logger.write_log_lines
+
+        def traced_write_log_lines(region, lines):
+            now = time.time_ns()
+            for match in MARKER_PATTERN_BYTES.finditer(region):
+                latencies.append(now - int(match.group(1)))
+                received[0] += 1
+            original_write_log_lines(region, lines)
+
+        logger.write_log_lines = traced_write_log_lines
+    logger.start_logging()
+
+    command = (f"{sys.executable} {generator_path} {args.lines} {args.rate} {args.size} "
+               f"{args.stderr_ratio} {args.binary_ratio} {args.seed}")
+    usage_before = process_usage()
+    started = time.perf_counter()
+    logger.run_command(command)
+    elapsed = time.perf_counter() - started
+    usage_after = process_usage()
+    logger.stop_logging()
+    sys.stdout.close()
+    sys.stdout = real_stdout
+
+    latencies.sort()
+    to_ms = lambda value: None if value is None else value / 1e6
+    expected = round(args.lines * (1 - args.binary_ratio))
+    result = {
+        "logger": os.path.basename(args.worker),
+        "status": "ok",
+        "lines_expected": expected,
+        "lines_received": received[0],
+        "elapsed": elapsed,
+        "lines_per_sec": received[0] / elapsed if elapsed else None,
+        "latency_ms": {
+            "p50": to_ms(percentile(latencies, 0.50)),
+            "p95": to_ms(percentile(latencies, 0.95)),
+            "p99": to_ms(percentile(latencies, 0.99)),
+            "max": to_ms(latencies[-1] if latencies else None),
+        },
+        "cpu_user": usage_after[0] - usage_before[0],
+        "cpu_system": usage_after[1] - usage_before[1],
+        "rss_before_kb": usage_before[2],
+        "peak_rss_kb": usage_after[2],
+        "log_bytes": os.path.getsize(log_path) if os.path.exists(log_path) else 0,
+    }
+    print(json.dumps(result), flush=True)
+    return 0
+
+
+def run_logger(path, args):
+    """Menjalankan worker untuk satu logger; timeout dicatat (misalnya deadlock pipe stderr)."""
+    command = [sys.executable, os.path.abspath(__file__), "--worker", path]
+    for name in ("lines", "rate", "size", "stderr_ratio", "binary_ratio", "seed"):
+        command += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout,
+                                   stdin=subprocess.DEVNULL)
+    except subprocess.TimeoutExpired:
+        return {"logger": os.path.basename(path), "status": f"timeout setelah {args.timeout}s"}
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return {"logger": os.path.basename(path), "status": f"gagal (return code {completed.returncode})",
+            "stderr": completed.stderr[-2000:]}
+
+
+def format_row(result):
+    if result.get("status") != "ok":
+        return f"{result['logger']:15} {result['status']}"
+    latency = result["latency_ms"]
+    fmt = lambda value: f"{value:8.1f}" if value is not None else f"{'-':>8}"
+    return (f"{result['logger']:15} {result['lines_received']:>7}/{result['lines_expected']:<7} "
+            f"{result['lines_per_sec']:>10.0f} {fmt(latency['p50'])} {fmt(latency['p95'])} "
+            f"{fmt(latency['p99'])} {result['cpu_user'] + result['cpu_system']:7.2f} "
+            f"{fmt(None if result['peak_rss_kb'] is None else result['peak_rss_kb'] / 1024)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load generator untuk TerminalLogger.run_command di Log_writer*.py."
+    )
+    parser.add_argument("--loggers", nargs="+", default=[TEXT_BASELINE] + LOGGER_FILES,
+                        help=f"File logger yang diuji ('{TEXT_BASELINE}' = loop text-mode lama)")
+    parser.add_argument("--lines", type=int, default=20000, help="Jumlah baris yang dikirim proses anak")
+    parser.add_argument("--rate", type=float, default=0, help="Baris per detik (0 = secepatnya)")
+    parser.add_argument("--size", type=int, default=120, help="Ukuran setiap baris (byte)")
+    parser.add_argument("--stderr-ratio", type=float, default=0.01, help="Porsi baris yang ditulis ke stderr")
+    parser.add_argument("--binary-ratio", type=float, default=0.0, help="Porsi baris berisi byte acak non-UTF-8")
+    parser.add_argument("--seed", type=int, default=1, help="Seed acak generator")
+    parser.add_argument("--timeout", type=float, default=60, help="Batas waktu per logger (detik)")
+    parser.add_argument("--output", default=RESULTS_FILE_NAME, help="File hasil JSON")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args)
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    print(f"{'logger':15} {'baris':>15} {'baris/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'CPU s':>7} {'RSS MB':>8}")
+    for name in args.loggers:
+        path = name if name == TEXT_BASELINE or os.path.isabs(name) else os.path.join(script_dir, name)
+        result = run_logger(path, args)
+        results.append(result)
+        print(format_row(result))
+
+    data = {
+        "generated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {name: getattr(args, name)
+                       for name in ("lines", "rate", "size", "stderr_ratio", "binary_ratio", "seed")},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    print(f"Hasil disimpan ke: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import argparse
+import os
+import subprocess
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Pengali budget dari environment, agar CI yang lambat tidak perlu mengubah command
+SCALE_ENV = 'IMPORT_BUDGET_SCALE'
+
+# Batas waktu import (ms, cumulative dari `python -X importtime`) per entry point.
+# Nilainya kira-kira dua kali hasil ukur di laptop biasa agar tidak flaky.
+IMPORT_BUDGETS_MS = {
+    'Log_writer': 15,
+    'Log_writer2': 25,
+    'Log_writer3': 25,
+    'alias_expansion': 5,
+    'command_history': 20,
+    'auto_fixer_dart': 60,
+    'dart_fix_preview': 80,
+    'flutter_analyzer_output': 80,
+    'flutter_tester': 80,
+    'flutter_pipeline': 90,
+    'flutter_sdk_matrix': 100,
+}
+
+# Modul berat yang hanya boleh dimuat saat jalurnya benar-benar dipakai
+TERMINAL_LAZY = ('subprocess', 'json', 're', 'hashlib', 'platform', 'pathlib', 'datetime', 'argparse',
+                 'command_cache', 'command_history')
+FLUTTER_LAZY = ('xml.sax.saxutils', 'concurrent.futures', 'socket', 'analysis_server', 'fixer_control')
+LAZY_MODULES = {
+    'Log_writer': TERMINAL_LAZY,
+    'Log_writer2': TERMINAL_LAZY,
+    'Log_writer3': TERMINAL_LAZY,
+    'alias_expansion': ('argparse',),
+    'command_history': ('argparse', 'tempfile', 'shutil'),
+    'auto_fixer_dart': FLUTTER_LAZY,
+    'dart_fix_preview': FLUTTER_LAZY,
+    'flutter_analyzer_output': FLUTTER_LAZY,
+    'flutter_tester': FLUTTER_LAZY,
+    'flutter_pipeline': FLUTTER_LAZY,
+    'flutter_sdk_matrix': FLUTTER_LAZY,
+}
+
+
+def measure_import(module):
+    """
+    Meng-import modul di interpreter baru dengan -X importtime.
+    Mengembalikan (cumulative ms modul itu, set semua modul yang ikut dimuat).
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, cwd=SCRIPT_DIR)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} gagal:\n{result.stderr.strip()}")
+    cumulative = None
+    loaded = set()
+    for line in result.stderr.splitlines():
+        # Format: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        loaded.add(name)
+        if parts[2].rstrip() == f" {module}":
+            cumulative = int(parts[1]) / 1000
+    return cumulative, loaded
+
+
+def default_scale():
+    """Pengali budget dari IMPORT_BUDGET_SCALE (default 1)."""
+    value = os.environ.get(SCALE_ENV, '').strip()
+    return float(value) if value else 1.0
+
+
+def check_module(module, repeat, scale):
+    """Waktu terbaik dari `repeat` kali ukur (cache OS sudah hangat) dan modul lazy yang bocor."""
+    best = None
+    loaded = set()
+    for _ in range(repeat):
+        cumulative, loaded = measure_import(module)
+        if cumulative is not None and (best is None or cumulative < best):
+            best = cumulative
+    budget = IMPORT_BUDGETS_MS[module] * scale
+    leaked = sorted(name for name in LAZY_MODULES.get(module, ()) if name in loaded)
+    return {'module': module, 'ms': best, 'budget': budget, 'leaked': leaked,
+            'ok': best is not None and best <= budget and not leaked}
+
+
+def main():
+    """Memeriksa waktu import setiap entry point terhadap budget-nya."""
+    parser = argparse.ArgumentParser(description="Cek budget waktu import (python -X importtime) entry point.")
+    parser.add_argument('modules', nargs='*', help="Entry point yang dicek (default: semua)")
+    parser.add_argument('--repeat', type=int, default=5, help="Jumlah pengukuran per modul, diambil yang tercepat")
+    parser.add_argument('--scale', type=float, default=default_scale(),
+                        help=f"Pengali budget untuk mesin lambat (default: ${SCALE_ENV} atau 1)")
+    args = parser.parse_args()
+
+    modules = args.modules or list(IMPORT_BUDGETS_MS)
+    unknown = [module for module in modules if module not in IMPORT_BUDGETS_MS]
+    if unknown:
+        parser.error(f"tidak ada budget untuk: {', '.join(unknown)}")
+
+    failed = 0
+    print(f"{'entry point':26} {'import':>9} {'budget':>9}")
+    for module in modules:
+        try:
+            result = check_module(module, args.repeat, args.scale)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            failed += 1
+            continue
+        measured = "?" if result['ms'] is None else f"{result['ms']:.1f}ms"
+        print(f"{'✅' if result['ok'] else '❌'} {module:24} {measured:>9} {result['budget']:>7.0f}ms")
+        if result['leaked']:
+            print(f"   modul berat ter-import saat startup: {', '.join(result['leaked'])}")
+        failed += not result['ok']
+
+    if failed:
+        print(f"\n💥 {failed} entry point melewati budget import.")
+        return 1
+    print("\n✨ Semua entry point dalam budget import.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
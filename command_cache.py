@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+CACHE_FILE_NAME = ".terminal_command_cache.json"
+RULES_FILE_NAME = ".terminal_cache_rules.json"
+CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 200
+# Output lebih besar dari ini tidak di-cache (file cache tetap kecil)
+MAX_OUTPUT_BYTES = 1024 * 1024
+# Env var yang selalu ikut kunci: executable yang dipakai bisa berubah karenanya
+BASE_ENV = ["PATH"]
+# Command dengan operator shell atau redirection tidak pernah di-cache: bagian setelah
+# prefix bisa menjalankan command lain atau menulis file (`git log; rm x`, `git log > f`)
+SHELL_OPERATORS = (";", "&", "|", "<", ">", "`", "$(", "\n")
+
+# Command read-only yang lambat; hanya dipakai jika cache diaktifkan (opt-in).
+# `inputs` relatif terhadap cwd; mtime-nya ikut kunci cache.
+DEFAULT_RULES = [
+    {"prefix": "flutter --version", "ttl": 3600, "env": ["FLUTTER_ROOT"], "inputs": []},
+    {"prefix": "flutter doctor", "ttl": 600, "env": ["FLUTTER_ROOT", "ANDROID_HOME", "JAVA_HOME"], "inputs": []},
+    {"prefix": "dart --version", "ttl": 3600, "env": [], "inputs": []},
+    {"prefix": "git log", "ttl": 300, "env": [], "inputs": [".git/HEAD", ".git/logs/HEAD", ".git/packed-refs"]},
+]
+
+
+def default_cache_path(file_name=CACHE_FILE_NAME):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+
+
+def load_rules(path=None):
+    """Aturan dari file JSON (list of dict) jika ada, selain itu DEFAULT_RULES."""
+    path = path or default_cache_path(RULES_FILE_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            rules = json.load(f)
+    except OSError:
+        return [dict(rule) for rule in DEFAULT_RULES]
+    for rule in rules:
+        if "prefix" not in rule:
+            raise ValueError(f"aturan cache tanpa 'prefix' di {path}: {rule}")
+    return rules
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class CommandCache:
+    """
+    Memo hasil command read-only untuk TerminalLogger.run_command. Kunci: command
+    hasil ekspansi, cwd, nilai env var yang relevan dan mtime file input yang
+    dideklarasikan aturan. Entri punya TTL, jumlah entri dibatasi dengan LRU, dan
+    cache disimpan ke file agar bisa dipakai sesi berikutnya.
+    """
+
+    def __init__(self, path=None, rules=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or default_cache_path()
+        self.rules = rules if rules is not None else load_rules()
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "stored": 0, "time_saved": 0.0}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != CACHE_VERSION:
+            return
+        now = time.time()
+        # Urutan file = urutan LRU (paling lama dipakai lebih dulu)
+        for key, entry in data.get("entries", []):
+            if entry["expires"] > now:
+                self.entries[key] = entry
+
+    def save(self):
+        data = {"version": CACHE_VERSION, "entries": list(self.entries.items())}
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Cache command tidak dapat disimpan: {e}")
+
+    def match_rule(self, command):
+        if any(operator in command for operator in SHELL_OPERATORS):
+            return None
+        command = " ".join(command.split())
+        for rule in self.rules:
+            prefix = rule["prefix"]
+            if command == prefix or command.startswith(prefix + " "):
+                return rule
+        return None
+
+    def make_key(self, command, rule, cwd=None):
+        cwd = cwd or os.getcwd()
+        env = {name: os.environ.get(name) for name in BASE_ENV + list(rule.get("env", []))}
+        inputs = {path: _mtime(os.path.join(cwd, path)) for path in rule.get("inputs", [])}
+        material = json.dumps([command, cwd, env, inputs], sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def lookup(self, command, cwd=None):
+        """
+        Mengembalikan (key, entry). entry None berarti miss; key None berarti
+        command tidak termasuk aturan cache sama sekali.
+        """
+        rule = self.match_rule(command)
+        if rule is None:
+            return None, None
+        key = self.make_key(command, rule, cwd)
+        entry = self.entries.get(key)
+        if entry is not None and entry["expires"] <= time.time():
+            del self.entries[key]
+            self.stats["expired"] += 1
+            entry = None
+        if entry is None:
+            self.stats["misses"] += 1
+            return key, None
+        self.entries.move_to_end(key)
+        self.stats["hits"] += 1
+        self.stats["time_saved"] += entry["duration"]
+        return key, entry
+
+    def store(self, key, command, messages, return_code, duration):
+        """Menyimpan output command yang berhasil (return code 0) ke cache."""
+        if key is None or return_code != 0:
+            return False
+        if sum(len(message) for message in messages) > MAX_OUTPUT_BYTES:
+            return False
+        rule = self.match_rule(command)
+        now = time.time()
+        self.entries[key] = {
+            "command": command,
+            "messages": messages,
+            "return_code": return_code,
+            "duration": duration,
+            "created": now,
+            "expires": now + rule.get("ttl", 300),
+        }
+        self.entries.move_to_end(key)
+        self.stats["stored"] += 1
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["evicted"] += 1
+        self.save()
+        return True
+
+    def clear(self):
+        self.entries.clear()
+        self.save()
+
+    def format_stats(self):
+        stats = self.stats
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+        return (f"Cache command: {stats['hits']} hit, {stats['misses']} miss ({hit_rate:.0f}% hit), "
+                f"{stats['expired']} kedaluwarsa, {stats['evicted']} dibuang (LRU), "
+                f"{len(self.entries)}/{self.max_entries} entri, hemat {stats['time_saved']:.1f}s")
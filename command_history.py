@@ -0,0 +1,392 @@
+import bisect
+import heapq
+import os
+import struct
+import sys
+import threading
+import time
+from collections import Counter
+
+from project_lock import ProjectLock
+
+HISTORY_FILE_NAME = ".terminal_history"
+# Offset byte setiap entri (uint64 little-endian); `!n` cukup dua seek tanpa membaca seluruh history
+INDEX_SUFFIX = ".idx"
+OFFSET = struct.Struct("<Q")
+# Karakter terbesar Unicode untuk batas atas pencarian prefix dengan bisect
+MAX_CHAR = "\U0010ffff"
+
+
+def default_history_path():
+    """History milik user (seperti ~/.bash_history), bukan file di dalam checkout script."""
+    return os.path.join(os.path.expanduser("~"), HISTORY_FILE_NAME)
+
+
+def _escape(command):
+    return command.replace("\\", "\\\\").replace("\n", "\\n").replace("\t", "\\t")
+
+
+def _unescape(text):
+    if "\\" not in text:
+        return text
+    result = []
+    chars = iter(text)
+    for char in chars:
+        if char == "\\":
+            char = {"n": "\n", "t": "\t"}.get(next(chars, ""), "\\")
+        result.append(char)
+    return "".join(result)
+
+
+def _parse_line(line):
+    """Baris file history: '<unix_time>\\t<command ter-escape>\\n'."""
+    _, _, command = line.rstrip(b"\n").decode("utf-8", errors="replace").partition("\t")
+    return _unescape(command)
+
+
+def trigrams(text):
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def is_subsequence(query, text):
+    position = 0
+    for char in query:
+        position = text.find(char, position) + 1
+        if not position:
+            return False
+    return True
+
+
+class HistorySearchIndex:
+    """
+    Indeks pencarian di memori: daftar command unik terurut (prefix via bisect)
+    dan indeks trigram (fuzzy). Setiap command menyimpan [jumlah, nomor terakhir]
+    untuk ranking frekuensi dan recency.
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self.sorted_commands = []
+        self.grams = {}
+        self.count = 0
+
+    def _count(self, command, number):
+        """Mencatat satu entri; True jika command belum pernah ada di indeks."""
+        self.count = number
+        entry = self.stats.get(command)
+        if entry is not None:
+            entry[0] += 1
+            entry[1] = number
+            return False
+        self.stats[command] = [1, number]
+        for gram in trigrams(command):
+            self.grams.setdefault(gram, set()).add(command)
+        return True
+
+    def add(self, command, number):
+        """Satu entri baru selama sesi: command baru disisipkan langsung ke posisinya."""
+        if self._count(command, number):
+            bisect.insort(self.sorted_commands, command)
+
+    def add_many(self, entries):
+        """
+        Entri (command, nomor) yang dibaca dari file. Command baru ditambahkan di
+        akhir lalu diurutkan sekali; insort per command membuat build O(n^2).
+        """
+        new_commands = [command for command, number in entries if self._count(command, number)]
+        if new_commands:
+            self.sorted_commands.extend(new_commands)
+            self.sorted_commands.sort()
+
+    def _frequency_key(self, command):
+        count, last = self.stats[command]
+        return count, last
+
+    def _recency_key(self, command):
+        return self.stats[command][1]
+
+    def prefix(self, prefix, limit=10, by="frequency"):
+        """Command yang diawali `prefix`, diurutkan frekuensi (atau recency)."""
+        low = bisect.bisect_left(self.sorted_commands, prefix)
+        high = bisect.bisect_left(self.sorted_commands, prefix + MAX_CHAR, low)
+        key = self._frequency_key if by == "frequency" else self._recency_key
+        return heapq.nlargest(limit, self.sorted_commands[low:high], key=key)
+
+    def fuzzy(self, query, limit=10):
+        """
+        Pencarian toleran salah ketik: kandidat berbagi minimal sepertiga trigram
+        query, lalu diurutkan kemiripan, urutan huruf (subsequence), frekuensi dan
+        recency.
+        """
+        query = query.lower()
+        query_grams = trigrams(query)
+        if not query_grams:
+            # Query < 3 huruf tidak punya trigram: cocokkan subsequence saja
+            candidates = {command: 1 for command in self.sorted_commands if is_subsequence(query, command.lower())}
+            needed = 1
+        else:
+            candidates = Counter()
+            for gram in query_grams:
+                candidates.update(self.grams.get(gram, ()))
+            needed = max(1, len(query_grams) // 3)
+
+        def rough_score(command):
+            count, last = self.stats[command]
+            return candidates[command], count, last
+
+        def score(command):
+            lowered = command.lower()
+            count, last = self.stats[command]
+            return candidates[command], query in lowered or is_subsequence(query, lowered), count, last
+
+        # Cek subsequence (loop Python) hanya untuk kandidat teratas, bukan semua kandidat
+        matches = [command for command, shared in candidates.items() if shared >= needed]
+        return heapq.nlargest(limit, heapq.nlargest(limit * 4, matches, key=rough_score), key=score)
+
+
+class CommandHistory:
+    """
+    History command persisten dan append-only. Startup hanya membuka file dan
+    memeriksa entri terakhir (tidak bergantung ukuran history); indeks pencarian
+    dibangun malas atau di background lewat warm_up().
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_history_path()
+        self.index_path = self.path + INDEX_SUFFIX
+        self.lock_path = self.path + ".lock"
+        self.search_lock = threading.Lock()
+        self.search_index = None
+        with ProjectLock(self.lock_path):
+            for path in (self.path, self.index_path):
+                open(path, "ab").close()
+            self._repair_index()
+        self.history_file = open(self.path, "rb")
+        self.offsets_file = open(self.index_path, "rb")
+
+    def _repair_index(self):
+        """
+        Menyelaraskan file offset dengan file history setelah crash di antara dua
+        write. Umumnya hanya memeriksa entri terakhir; pindai ulang penuh hanya jika
+        offset menunjuk ke luar file.
+        """
+        with open(self.path, "r+b") as history, open(self.index_path, "r+b") as index:
+            history_size = os.fstat(history.fileno()).st_size
+            index_size = os.fstat(index.fileno()).st_size
+            count = index_size // OFFSET.size
+            if index_size % OFFSET.size:
+                index.truncate(count * OFFSET.size)
+
+            scan_from = 0
+            if count:
+                index.seek((count - 1) * OFFSET.size)
+                (last_offset,) = OFFSET.unpack(index.read(OFFSET.size))
+                if last_offset < history_size:
+                    history.seek(last_offset)
+                    history.readline()
+                    scan_from = history.tell()
+                else:
+                    index.truncate(0)
+                    count = 0
+            if scan_from == history_size:
+                return
+
+            # Entri yang sudah ada di history tapi belum tercatat offset-nya
+            history.seek(scan_from)
+            index.seek(count * OFFSET.size)
+            position = scan_from
+            for line in history:
+                if not line.endswith(b"\n"):
+                    # Baris terakhir terpotong: dibuang agar append berikutnya tidak tersambung
+                    history.truncate(position)
+                    break
+                index.write(OFFSET.pack(position))
+                position += len(line)
+
+    def __len__(self):
+        # fstat murah dan ikut melihat entri dari sesi terminal lain
+        return os.fstat(self.offsets_file.fileno()).st_size // OFFSET.size
+
+    def _offset(self, number, offsets_file=None):
+        offsets_file = offsets_file or self.offsets_file
+        offsets_file.seek((number - 1) * OFFSET.size)
+        return OFFSET.unpack(offsets_file.read(OFFSET.size))[0]
+
+    def get(self, number):
+        """Entri ke-`number` (mulai 1); negatif dihitung dari akhir. None jika tidak ada."""
+        total = len(self)
+        if number < 0:
+            number = total + 1 + number
+        if not 1 <= number <= total:
+            return None
+        self.history_file.seek(self._offset(number))
+        return _parse_line(self.history_file.readline())
+
+    def tail(self, limit=20):
+        """(nomor, command) untuk `limit` entri terakhir."""
+        total = len(self)
+        first = max(1, total - limit + 1)
+        if first > total:
+            return []
+        self.history_file.seek(self._offset(first))
+        return [(first + i, _parse_line(self.history_file.readline())) for i in range(total - first + 1)]
+
+    def append(self, command):
+        if not command.strip():
+            return
+        line = f"{int(time.time())}\t{_escape(command)}\n".encode("utf-8")
+        with ProjectLock(self.lock_path):
+            with open(self.path, "ab") as history:
+                offset = history.seek(0, os.SEEK_END)
+                history.write(line)
+            with open(self.index_path, "ab") as index:
+                index.write(OFFSET.pack(offset))
+
+    def _load_search_index(self):
+        """Indeks dibangun sekali, lalu hanya entri baru (termasuk dari sesi lain) yang ditambahkan."""
+        with self.search_lock:
+            if self.search_index is None:
+                self.search_index = HistorySearchIndex()
+            index = self.search_index
+            total = len(self)
+            if index.count < total:
+                # Handle file sendiri: warm_up() berjalan bersamaan dengan get() di thread utama
+                with open(self.path, "rb") as history, open(self.index_path, "rb") as offsets:
+                    history.seek(self._offset(index.count + 1, offsets))
+                    index.add_many((_parse_line(history.readline()), number)
+                                   for number in range(index.count + 1, total + 1))
+            return index
+
+    def warm_up(self):
+        """Membangun indeks pencarian di thread background selagi user mengetik."""
+        thread = threading.Thread(target=self._load_search_index, daemon=True)
+        thread.start()
+        return thread
+
+    def search_prefix(self, prefix, limit=10, by="frequency"):
+        return self._load_search_index().prefix(prefix, limit, by)
+
+    def search_fuzzy(self, query, limit=10):
+        return self._load_search_index().fuzzy(query, limit)
+
+    def expand(self, command):
+        """
+        Ekspansi history ala bash di awal command: `!!`, `!n`, `!-n`, `!prefix`
+        (entri terbaru dengan prefix itu) dan `!?teks` (hasil fuzzy terbaik).
+        Sisa command ditambahkan di belakang. Mengembalikan (command, error).
+        """
+        if not command.startswith("!"):
+            return command, None
+        designator, separator, rest = command[1:].partition(" ")
+        if not designator or designator.startswith("="):
+            return command, None
+        if designator == "!":
+            found = self.get(-1)
+        elif designator.lstrip("-").isdigit():
+            found = self.get(int(designator))
+        elif designator.startswith("?"):
+            matches = self.search_fuzzy(designator[1:], limit=1) if designator[1:] else []
+            found = matches[0] if matches else None
+        else:
+            matches = self.search_prefix(designator, limit=1, by="recency")
+            found = matches[0] if matches else None
+        if found is None:
+            return None, f"!{designator}: event not found"
+        return found + separator + rest, None
+
+    def close(self):
+        self.history_file.close()
+        self.offsets_file.close()
+
+
+def history_builtin(history, argument):
+    """
+    Perintah `history` di terminal interaktif: `history [n]`, `history search <teks>`
+    (fuzzy) dan `history prefix <teks>`. Mengembalikan baris-baris output.
+    """
+    action, _, query = argument.strip().partition(" ")
+    if action in ("search", "prefix"):
+        if not query.strip():
+            return [f"Format: history {action} <teks>"]
+        search = history.search_fuzzy if action == "search" else history.search_prefix
+        # Perintah history sendiri (termasuk yang baru diketik) tidak ikut ditampilkan
+        matches = [command for command in search(query.strip(), 40) if not command.startswith("history ")]
+        return matches[:20] or ["Tidak ada command yang cocok."]
+    if action and not action.isdigit():
+        return ["Format: history [n] | history search <teks> | history prefix <teks>"]
+    return [f"{number:6}  {command}" for number, command in history.tail(int(action) if action else 20)]
+
+
+def measure(entries=200000, repeat=1000):
+    """Membuat history sintetis lalu mengukur startup, recall dan pencarian (ms)."""
+    import shutil
+    import tempfile
+
+    work_dir = tempfile.mkdtemp(prefix="history_bench_")
+    try:
+        path = os.path.join(work_dir, HISTORY_FILE_NAME)
+        words = ["git status", "git commit -m fix", "flutter test", "flutter analyze", "dart fix --apply",
+                 "ls -la", "cd lib", "python flutter_tester.py --shards 4", "docker compose up", "make build"]
+        with open(path, "wb") as history, open(path + INDEX_SUFFIX, "wb") as index:
+            for number in range(entries):
+                index.write(OFFSET.pack(history.tell()))
+                history.write(f"{1700000000 + number}\t{words[number % len(words)]} {number % 997}\n".encode())
+
+        def timed(func, count=repeat):
+            started = time.perf_counter()
+            for _ in range(count):
+                func()
+            return (time.perf_counter() - started) / count * 1000
+
+        results = {}
+        started = time.perf_counter()
+        history = CommandHistory(path)
+        results["startup_ms"] = (time.perf_counter() - started) * 1000
+        results["recall_last_ms"] = timed(lambda: history.expand("!!"))
+        results["recall_n_ms"] = timed(lambda: history.expand(f"!{entries // 2}"))
+        started = time.perf_counter()
+        history._load_search_index()
+        results["index_build_ms"] = (time.perf_counter() - started) * 1000
+        results["prefix_ms"] = timed(lambda: history.search_prefix("flutter te"))
+        results["recall_prefix_ms"] = timed(lambda: history.expand("!python"))
+        results["fuzzy_ms"] = timed(lambda: history.search_fuzzy("fluter anlyze"), 50)
+        history.close()
+        return results
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="History command persisten untuk terminal logger.")
+    parser.add_argument("query", nargs="?", help="Teks yang dicari (fuzzy)")
+    parser.add_argument("--prefix", action="store_true", help="Cari berdasarkan prefix, bukan fuzzy")
+    parser.add_argument("--limit", type=int, default=20, help="Jumlah hasil")
+    parser.add_argument("--measure", action="store_true", help="Ukur startup dan kecepatan recall")
+    parser.add_argument("--entries", type=int, default=200000, help="Ukuran history sintetis untuk --measure")
+    args = parser.parse_args()
+
+    if args.measure:
+        print(f"History sintetis: {args.entries} entri")
+        for label, value in measure(args.entries).items():
+            print(f"{label:18} {value:10.4f}")
+        return 0
+
+    history = CommandHistory()
+    try:
+        if args.query is None:
+            for number, command in history.tail(args.limit):
+                print(f"{number:6}  {command}")
+        else:
+            search = history.search_prefix if args.prefix else history.search_fuzzy
+            for command in search(args.query, args.limit):
+                print(command)
+    finally:
+        history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
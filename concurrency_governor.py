@@ -0,0 +1,414 @@
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import tracing
+
+STATE_FILE_NAME = ".concurrency_governor.json"
+STATE_VERSION = 1
+# Batas atas job bersamaan untuk semua jenis job (CI bisa mengecilkannya)
+MAX_WORKERS_ENV = "FLUTTER_SCRIPTS_MAX_WORKERS"
+MB = 1024 * 1024
+# Perkiraan RSS awal per jenis job sebelum ada hasil pengamatan
+DEFAULT_JOB_RSS = {
+    'analyze': 1024 * MB,
+    'test shard': 768 * MB,
+    'dart fix': 768 * MB,
+    'patch worker': 64 * MB,
+}
+FALLBACK_JOB_RSS = 512 * MB
+# Memori yang selalu disisakan untuk sistem: nilai terbesar dari keduanya
+RESERVE_FRACTION = 0.1
+MIN_RESERVE = 256 * MB
+# Spawn baru ditahan jika load average melebihi jumlah CPU dikali faktor ini
+OVERLOAD_FACTOR = 1.5
+# Interval sampling RSS dan pengecekan ulang saat spawn ditahan
+POLL_INTERVAL = 0.5
+# Bobot pengamatan baru pada estimasi RSS (exponential moving average)
+RSS_SMOOTHING = 0.5
+
+try:
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+
+
+def state_path():
+    """Estimasi RSS per jenis job disimpan di samping script agar run berikutnya langsung tepat."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), STATE_FILE_NAME)
+
+
+def format_bytes(value):
+    if value is None:
+        return "?"
+    if value >= 1024 * MB:
+        return f"{value / (1024 * MB):.1f}GB"
+    return f"{value / MB:.0f}MB"
+
+
+def read_loadavg():
+    """Load average 1 menit dari /proc/loadavg (atau os.getloadavg); None jika tidak tersedia."""
+    try:
+        with open('/proc/loadavg', 'r') as f:
+            return float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+
+
+def read_meminfo():
+    """(MemAvailable, MemTotal) dalam bytes dari /proc/meminfo; (None, None) di luar Linux."""
+    values = {}
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if name in ('MemAvailable', 'MemTotal'):
+                    values[name] = int(rest.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None, None
+    return values.get('MemAvailable'), values.get('MemTotal')
+
+
+def read_rss(pid):
+    """RSS satu proses (bytes) dari /proc/<pid>/statm; None jika proses sudah selesai."""
+    try:
+        with open(f'/proc/{pid}/statm', 'r') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def read_parent_map():
+    """{pid: ppid} semua proses dari /proc/<pid>/stat; kosong di luar Linux."""
+    parents = {}
+    try:
+        names = os.listdir('/proc')
+    except OSError:
+        return parents
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat', 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Nama command bisa berisi spasi/kurung: field setelah ')' terakhir
+        fields = stat[stat.rfind(')') + 2:].split()
+        if len(fields) > 1:
+            parents[int(name)] = int(fields[1])
+    return parents
+
+
+def tree_rss(pid, children):
+    """RSS proses beserta semua turunannya (flutter menjalankan dart, test menjalankan tester)."""
+    total = 0
+    pending = [pid]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        rss = read_rss(current)
+        if rss is None and current == pid:
+            return None
+        total += rss or 0
+        pending.extend(children.get(current, ()))
+    return total
+
+
+class Job:
+    """Satu job yang sedang memegang slot governor; RSS puncak proses yang di-track dicatat."""
+
+    def __init__(self, governor, kind):
+        self.governor = governor
+        self.kind = kind
+        self.pids = []
+        self.rss = 0
+        self.peak_rss = 0
+
+    def track(self, pid):
+        """Mulai mengamati RSS proses (dan turunannya) untuk job ini."""
+        self.pids.append(pid)
+        self.governor._ensure_sampler()
+
+
+class ConcurrencyGovernor:
+    """
+    Mengatur jumlah proses paralel (shard test, analyze, dart fix, worker diff)
+    dari kondisi mesin saat ini: load average, MemAvailable dan RSS per jenis
+    job yang teramati lewat /proc. plan_workers() menentukan ukuran pool;
+    slot() menahan spawn baru selama memori tidak cukup. Setiap keputusan
+    dicatat ke layar dan ke trace.
+    """
+
+    def __init__(self, max_workers=None, poll_interval=POLL_INTERVAL, path=None, verbose=True):
+        self.cpus = os.cpu_count() or 1
+        env_limit = os.environ.get(MAX_WORKERS_ENV)
+        if max_workers is None and env_limit:
+            max_workers = int(env_limit)
+        # Minimal 2 agar stage pipeline (analyze + test) tetap bisa berjalan bersamaan
+        self.max_workers = max(1, max_workers or max(2, self.cpus))
+        self.poll_interval = poll_interval
+        self.path = path or state_path()
+        self.verbose = verbose
+        self.estimates = {}
+        self.active = []
+        self.watches = []
+        self.decisions = []
+        self.condition = threading.Condition()
+        self.sampler = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == STATE_VERSION:
+            self.estimates.update(data.get('rss', {}))
+
+    def _save(self):
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': STATE_VERSION, 'rss': self.estimates}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # Estimasi hanya optimasi; folder read-only tidak boleh menggagalkan script
+            pass
+
+    def log(self, kind, message, **args):
+        self.decisions.append((time.time(), kind, message))
+        tracing.instant('governor', category='governor', kind=kind, decision=message, **args)
+        if self.verbose:
+            print(f"⚖️ Governor [{kind}]: {message}")
+
+    def estimate(self, kind):
+        return self.estimates.get(kind, DEFAULT_JOB_RSS.get(kind, FALLBACK_JOB_RSS))
+
+    def snapshot(self):
+        available, total = read_meminfo()
+        return {'load': read_loadavg(), 'mem_available': available, 'mem_total': total}
+
+    def memory_headroom(self, snapshot):
+        """
+        Memori yang masih bisa dipakai job baru. Job yang baru mulai belum mencapai
+        RSS puncaknya, jadi sisa pertumbuhannya (estimasi - RSS saat ini) dianggap
+        sudah terpakai. None jika /proc/meminfo tidak tersedia.
+        """
+        if snapshot['mem_available'] is None:
+            return None
+        reserve = max(MIN_RESERVE, int((snapshot['mem_total'] or 0) * RESERVE_FRACTION))
+        pending = sum(max(0, self.estimate(job.kind) - job.rss) for job in self.active)
+        return snapshot['mem_available'] - reserve - pending
+
+    def cpu_budget(self, snapshot):
+        """CPU yang tidak dipakai proses lain (load average dikurangi job governor sendiri)."""
+        if snapshot['load'] is None:
+            return self.cpus
+        external = max(0.0, snapshot['load'] - len(self.active))
+        return max(1, int(round(self.cpus - external)))
+
+    def plan_workers(self, kind, requested=None):
+        """Ukuran pool untuk `requested` job sejenis (default: jumlah CPU), minimal 1."""
+        with self.condition:
+            snapshot = self.snapshot()
+            estimate = self.estimate(kind)
+            limits = {'diminta': requested or self.cpus, 'maksimal': self.max_workers,
+                      'cpu': self.cpu_budget(snapshot)}
+            headroom = self.memory_headroom(snapshot)
+            if headroom is not None:
+                limits['memori'] = max(1, int(headroom // estimate))
+            reason = min(limits, key=limits.get)
+            workers = max(1, limits[reason])
+        load = "?" if snapshot['load'] is None else f"{snapshot['load']:.1f}"
+        self.log(kind, f"{workers} worker (dibatasi {reason}; load {load}/{self.cpus} CPU, "
+                       f"memori tersedia {format_bytes(headroom)}, estimasi {format_bytes(estimate)}/job)",
+                 workers=workers, limit=reason)
+        return workers
+
+    def _blocked_reason(self, kind, snapshot):
+        """(jenis alasan, pesan) jika spawn harus ditahan, selain itu None."""
+        if not self.active:
+            # Selalu ada kemajuan: job pertama tidak pernah ditahan
+            return None
+        if len(self.active) >= self.max_workers:
+            return 'workers', f"{len(self.active)} job aktif (maksimal {self.max_workers})"
+        if snapshot['load'] is not None and snapshot['load'] > self.cpus * OVERLOAD_FACTOR:
+            return 'load', f"load average {snapshot['load']:.1f} untuk {self.cpus} CPU"
+        headroom = self.memory_headroom(snapshot)
+        if headroom is not None and headroom < self.estimate(kind):
+            return 'memory', (f"memori tersedia {format_bytes(max(0, headroom))} < "
+                              f"estimasi job {format_bytes(self.estimate(kind))}")
+        return None
+
+    def acquire(self, kind):
+        """Menunggu sampai job `kind` boleh dimulai lalu mendaftarkannya sebagai aktif."""
+        started = time.perf_counter()
+        logged_reason = None
+        with self.condition:
+            while True:
+                blocked = self._blocked_reason(kind, self.snapshot())
+                if blocked is None:
+                    break
+                # Dicatat sekali per jenis alasan, bukan setiap kali angkanya berubah
+                if blocked[0] != logged_reason:
+                    self.log(kind, f"spawn ditahan: {blocked[1]}")
+                    logged_reason = blocked[0]
+                self.condition.wait(self.poll_interval)
+            job = Job(self, kind)
+            self.active.append(job)
+        if logged_reason is not None:
+            self.log(kind, f"spawn dilanjutkan setelah menunggu {time.perf_counter() - started:.1f}s")
+        return job
+
+    def release(self, job):
+        with self.condition:
+            self.active.remove(job)
+            self.condition.notify_all()
+        if job.peak_rss:
+            self.record_rss(job.kind, job.peak_rss)
+
+    @contextlib.contextmanager
+    def slot(self, kind):
+        job = self.acquire(kind)
+        try:
+            yield job
+        finally:
+            self.release(job)
+
+    def record_rss(self, kind, peak):
+        """Memperbarui estimasi RSS per jenis job dari RSS puncak yang teramati."""
+        with self.condition:
+            previous = self.estimates.get(kind)
+            if previous is None:
+                updated = peak
+            else:
+                updated = int(previous * (1 - RSS_SMOOTHING) + peak * RSS_SMOOTHING)
+            self.estimates[kind] = updated
+            self._save()
+        if previous is None or abs(updated - previous) > previous * 0.25:
+            self.log(kind, f"RSS puncak teramati {format_bytes(peak)}, estimasi kini {format_bytes(updated)}",
+                     peak=peak, estimate=updated)
+
+    @contextlib.contextmanager
+    def observe_children(self, kind):
+        """
+        Mengamati proses anak baru selama blok berjalan (misalnya worker
+        ProcessPoolExecutor) sebagai job `kind`; RSS puncak per anak menjadi estimasi.
+        """
+        watch = {'kind': kind, 'existing': set(self._own_children(read_parent_map())), 'peaks': {}}
+        with self.condition:
+            self.watches.append(watch)
+        self._ensure_sampler()
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.watches.remove(watch)
+            if watch['peaks']:
+                self.record_rss(kind, max(watch['peaks'].values()))
+
+    def run(self, kind, command, check=False, capture_output=False, **kwargs):
+        """
+        Pengganti subprocess.run: menunggu slot `kind`, lalu RSS proses diamati
+        selama berjalan. Argumen lain diteruskan ke subprocess.Popen.
+        """
+        if capture_output:
+            kwargs['stdout'] = subprocess.PIPE
+            kwargs['stderr'] = subprocess.PIPE
+        with self.slot(kind) as job:
+            with subprocess.Popen(command, **kwargs) as process:
+                job.track(process.pid)
+                try:
+                    stdout, stderr = process.communicate()
+                except BaseException:
+                    process.kill()
+                    raise
+                return_code = process.poll()
+        if check and return_code:
+            raise subprocess.CalledProcessError(return_code, command, output=stdout, stderr=stderr)
+        return subprocess.CompletedProcess(command, return_code, stdout, stderr)
+
+    def _own_children(self, parents):
+        own_pid = os.getpid()
+        return [pid for pid, parent in parents.items() if parent == own_pid]
+
+    def _ensure_sampler(self):
+        with self.condition:
+            if self.sampler is None or not self.sampler.is_alive():
+                self.sampler = threading.Thread(target=self._sample_loop, name='governor sampler', daemon=True)
+                self.sampler.start()
+
+    def _sample_loop(self):
+        while True:
+            with self.condition:
+                jobs = [job for job in self.active if job.pids]
+                watches = list(self.watches)
+            if not jobs and not watches:
+                return
+            parents = read_parent_map()
+            children = {}
+            for pid, parent in parents.items():
+                children.setdefault(parent, []).append(pid)
+            for job in jobs:
+                rss = sum(tree_rss(pid, children) or 0 for pid in job.pids)
+                job.rss = rss
+                job.peak_rss = max(job.peak_rss, rss)
+            if watches:
+                own_children = self._own_children(parents)
+                for watch in watches:
+                    for pid in own_children:
+                        if pid not in watch['existing']:
+                            rss = tree_rss(pid, children) or 0
+                            watch['peaks'][pid] = max(watch['peaks'].get(pid, 0), rss)
+            time.sleep(self.poll_interval)
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_governor():
+    """Governor bersama untuk satu proses, agar stage pipeline yang paralel saling memperhitungkan."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = ConcurrencyGovernor()
+        return _governor
+
+
+def main():
+    """Menampilkan kondisi mesin dan ukuran pool yang akan dipilih governor."""
+    parser = argparse.ArgumentParser(description="Menampilkan keputusan concurrency governor untuk mesin ini.")
+    parser.add_argument('--kind', action='append',
+                        help="Jenis job (default: semua jenis yang dikenal)")
+    args = parser.parse_args()
+
+    governor = ConcurrencyGovernor(verbose=False)
+    snapshot = governor.snapshot()
+    load = "?" if snapshot['load'] is None else f"{snapshot['load']:.2f}"
+    print(f"CPU: {governor.cpus}, load average: {load}, "
+          f"memori tersedia: {format_bytes(snapshot['mem_available'])} dari {format_bytes(snapshot['mem_total'])}")
+    print(f"Maksimal job bersamaan: {governor.max_workers}")
+    for kind in args.kind or sorted(set(DEFAULT_JOB_RSS) | set(governor.estimates)):
+        source = "teramati" if kind in governor.estimates else "default"
+        workers = governor.plan_workers(kind)
+        print(f"  {kind:14} estimasi {format_bytes(governor.estimate(kind)):>7} ({source}) → {workers} worker")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
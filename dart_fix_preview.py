@@ -0,0 +1,355 @@
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+from concurrency_governor import get_governor
+from project_lock import ProjectLock
+from script_core.sdk import require_executable
+
+PREVIEW_FILE_NAME = "dart_fix_preview.json"
+PREVIEW_DIFF_NAME = "dart_fix_preview.diff"
+PREVIEW_VERSION = 1
+
+# Baris ringkasan per rule di output `dart fix --dry-run`: "  unnecessary_new • 3 fixes"
+RULE_PATTERN = re.compile(r"^\s+([A-Za-z0-9_]+)\s+[•\-]\s+(\d+)\s+fix(?:es)?\s*$")
+# Di bawah jumlah file ini diff dihitung langsung tanpa process pool
+PARALLEL_MIN_FILES = 8
+
+
+def parse_dry_run(output):
+    """Mengambil usulan fix dari output `dart fix --dry-run`: {file: {rule: jumlah}}."""
+    proposals = {}
+    current_file = None
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        match = RULE_PATTERN.match(line)
+        if match and current_file is not None:
+            proposals[current_file][match.group(1)] = int(match.group(2))
+        elif not line[0].isspace() and line.rstrip().endswith('.dart'):
+            current_file = line.strip().replace(os.sep, '/')
+            proposals[current_file] = {}
+        elif not line[0].isspace():
+            current_file = None
+    return {path: rules for path, rules in proposals.items() if rules}
+
+
+def hash_file(path):
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def read_lines(path):
+    # newline='' agar CRLF tetap utuh saat patch diterapkan kembali
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return f.read().splitlines(keepends=True)
+
+
+def compute_patch(args):
+    """
+    Patch ringkas satu file: daftar [i1, i2, baris_baru] yang mengganti baris
+    i1:i2 di file asli. Dijalankan di process pool, jadi hanya menerima path.
+    """
+    rel_path, original_path, fixed_path = args
+    original = read_lines(original_path)
+    fixed = read_lines(fixed_path)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, original, fixed, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            ops.append([i1, i2, fixed[j1:j2]])
+    return rel_path, ops
+
+
+def apply_patch(lines, ops):
+    """Menerapkan patch dari compute_patch() ke daftar baris asli."""
+    result = []
+    position = 0
+    for i1, i2, new_lines in ops:
+        result.extend(lines[position:i1])
+        result.extend(new_lines)
+        position = i2
+    result.extend(lines[position:])
+    return result
+
+
+def run_dart_fix_command(dart_executable, cwd, mode, codes=None, target=None):
+    command = [dart_executable, 'fix', mode] + [f"--code={code}" for code in (codes or [])]
+    if target is not None:
+        command.append(target)
+    return get_governor().run('dart fix', command, text=True, capture_output=True, cwd=cwd)
+
+
+def dry_run_proposals(dart_executable, project_root, codes=None):
+    """
+    Menjalankan `dart fix --dry-run` dan mengembalikan usulan fix per file (hanya
+    rule di `codes` jika diberikan), atau None jika dry run gagal.
+    """
+    result = run_dart_fix_command(dart_executable, project_root, '--dry-run', codes)
+    if result.returncode != 0:
+        print(f"❌ ERROR: dart fix --dry-run gagal (return code {result.returncode})")
+        if result.stderr:
+            print(f"   📋 Detail error: {result.stderr.strip()}")
+        return None
+
+    proposals = parse_dry_run(result.stdout)
+    if codes:
+        proposals = {path: {rule: count for rule, count in rules.items() if rule in codes}
+                     for path, rules in proposals.items()}
+        proposals = {path: rules for path, rules in proposals.items() if rules}
+    return proposals
+
+
+def copy_files(source_root, target_root, rel_paths):
+    for rel_path in rel_paths:
+        target = os.path.join(target_root, rel_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(os.path.join(source_root, rel_path), target)
+
+
+def build_patch_records(dart_executable, project_root, proposals, codes=None, workers=None):
+    """
+    Menjalankan `dart fix --apply` sekali, langsung di project tetapi hanya pada
+    folder terkecil yang memuat semua file usulan dry run, sehingga package_config
+    dan dependency path tetap ter-resolve seperti biasa. File usulan dibackup
+    sebelumnya dan dikembalikan (beserta mtime-nya) di bawah lock eksklusif, lalu
+    patch setiap file yang berubah dihitung secara paralel.
+    """
+    rel_paths = [rel_path for rel_path in sorted(proposals)
+                 if os.path.isfile(os.path.join(project_root, rel_path))]
+    if not rel_paths:
+        return []
+    target = os.path.relpath(os.path.commonpath(
+        [os.path.dirname(os.path.join(project_root, rel_path)) for rel_path in rel_paths]), project_root)
+
+    work_root = tempfile.mkdtemp(prefix='dart_fix_preview_')
+    original_root = os.path.join(work_root, 'original')
+    fixed_root = os.path.join(work_root, 'fixed')
+    restored = True
+    try:
+        # Lock eksklusif: analyze/test tidak melihat hasil fix sementara di project
+        with ProjectLock(exclusive=True):
+            copy_files(project_root, original_root, rel_paths)
+            restored = False
+            try:
+                result = run_dart_fix_command(dart_executable, project_root, '--apply', codes, target)
+                if result.returncode != 0:
+                    raise RuntimeError((result.stderr or result.stdout).strip())
+                copy_files(project_root, fixed_root, rel_paths)
+            finally:
+                copy_files(original_root, project_root, rel_paths)
+                restored = True
+
+        jobs = []
+        hashes = {}
+        for rel_path in rel_paths:
+            original_path = os.path.join(original_root, rel_path)
+            fixed_path = os.path.join(fixed_root, rel_path)
+            hashes[rel_path] = hash_file(original_path)
+            if hash_file(fixed_path) != hashes[rel_path]:
+                jobs.append((rel_path, original_path, fixed_path))
+
+        if len(jobs) >= PARALLEL_MIN_FILES:
+            from concurrent.futures import ProcessPoolExecutor
+
+            governor = get_governor()
+            if workers is None:
+                workers = governor.plan_workers('patch worker')
+            with governor.observe_children('patch worker'), ProcessPoolExecutor(max_workers=workers) as executor:
+                patches = list(executor.map(compute_patch, jobs, chunksize=max(1, len(jobs) // 32)))
+        else:
+            patches = [compute_patch(job) for job in jobs]
+    finally:
+        if restored:
+            shutil.rmtree(work_root, ignore_errors=True)
+        else:
+            # Isi asli belum kembali ke project; backup jangan dihapus
+            print(f"⚠️ Backup file asli disimpan di: {original_root}")
+
+    records = []
+    for rel_path, ops in patches:
+        rules = proposals.get(rel_path, {})
+        if codes:
+            rules = {rule: count for rule, count in rules.items() if rule in codes}
+        records.append({'file': rel_path, 'hash': hashes[rel_path], 'rules': rules, 'ops': ops})
+    return records
+
+
+def save_preview(path, records, codes):
+    data = {
+        'version': PREVIEW_VERSION,
+        'generated': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'codes': codes or [],
+        'records': records,
+    }
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def load_preview(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != PREVIEW_VERSION:
+        return None
+    return data
+
+
+def format_unified_diff(project_root, records):
+    """Unified diff semua record untuk ditinjau (dibuat dari patch, bukan dari salinan)."""
+    chunks = []
+    for record in records:
+        original = read_lines(os.path.join(project_root, record['file']))
+        fixed = apply_patch(original, record['ops'])
+        rules = ", ".join(f"{rule} x{count}" for rule, count in sorted(record['rules'].items()))
+        chunks.append(f"# {record['file']}: {rules}\n")
+        for line in difflib.unified_diff(original, fixed, f"a/{record['file']}", f"b/{record['file']}"):
+            chunks.append(line if line.endswith('\n') else line + "\n\\ No newline at end of file\n")
+    return "".join(chunks)
+
+
+def select_records(records, files=None, rules=None):
+    """Memilih record berdasarkan daftar file dan/atau rule."""
+    selected = []
+    for record in records:
+        if files and record['file'] not in files:
+            continue
+        if rules and not set(record['rules']) & set(rules):
+            continue
+        selected.append(record)
+    return selected
+
+
+def apply_records(project_root, records):
+    """
+    Menulis semua patch sekaligus. File yang berubah sejak preview dibuat (hash
+    berbeda) dilewati. Mengembalikan (applied, stale).
+    """
+    applied = []
+    stale = []
+    pending = []
+    for record in records:
+        path = os.path.join(project_root, record['file'])
+        if not os.path.isfile(path) or hash_file(path) != record['hash']:
+            stale.append(record['file'])
+            continue
+        pending.append((path, apply_patch(read_lines(path), record['ops'])))
+
+    # Isi baru disiapkan dulu semua, baru ditulis; setiap file diganti secara atomik
+    for path, lines in pending:
+        tmp_path = path + '.dartfix.tmp'
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.writelines(lines)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+        applied.append(os.path.relpath(path, project_root).replace(os.sep, '/'))
+    return applied, stale
+
+
+def run_preview(dart_executable, project_root, script_dir, codes=None, workers=None):
+    """Dry run + patch preview; menyimpan record JSON dan unified diff di script_dir."""
+    proposals = dry_run_proposals(dart_executable, project_root, codes)
+    if proposals is None:
+        return False
+    if not proposals:
+        print("🎉 Tidak ada fix yang diusulkan.")
+        save_preview(os.path.join(script_dir, PREVIEW_FILE_NAME), [], codes)
+        return True
+
+    started = time.perf_counter()
+    records = build_patch_records(dart_executable, project_root, proposals, codes, workers)
+    elapsed = time.perf_counter() - started
+    save_preview(os.path.join(script_dir, PREVIEW_FILE_NAME), records, codes)
+    diff_path = os.path.join(script_dir, PREVIEW_DIFF_NAME)
+    with open(diff_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(format_unified_diff(project_root, records))
+
+    rule_totals = {}
+    for record in records:
+        for rule, count in record['rules'].items():
+            rule_totals[rule] = rule_totals.get(rule, 0) + count
+    print(f"📝 {sum(rule_totals.values())} fix di {len(records)} file (patch dihitung dalam {elapsed:.2f}s)")
+    for rule, count in sorted(rule_totals.items(), key=lambda item: -item[1]):
+        print(f"   {count:5}  {rule}")
+    print(f"✅ Preview disimpan ke: {diff_path}")
+    return True
+
+
+def run_apply(dart_executable, project_root, script_dir, files=None, rules=None):
+    """
+    Menerapkan fix pilihan dalam satu penulisan. Tanpa --rules, patch diambil dari
+    preview tersimpan. Dengan --rules, patch dihitung ulang sekali khusus untuk
+    rule tersebut.
+    """
+    if rules:
+        proposals = dry_run_proposals(dart_executable, project_root, rules)
+        if proposals is None:
+            return False
+        records = build_patch_records(dart_executable, project_root, proposals, rules)
+    else:
+        preview = load_preview(os.path.join(script_dir, PREVIEW_FILE_NAME))
+        if preview is None:
+            print("⚠️ Belum ada preview. Jalankan 'dart_fix_preview.py preview' terlebih dahulu.")
+            return False
+        records = preview['records']
+
+    records = select_records(records, files, rules)
+    if not records:
+        print("⚠️ Tidak ada fix yang cocok dengan pilihan.")
+        return True
+
+    # Lock eksklusif: analyze/test tidak melihat source setengah ditulis
+    with ProjectLock(exclusive=True):
+        applied, stale = apply_records(project_root, records)
+    print(f"✅ Fix diterapkan ke {len(applied)} file.")
+    for path in stale:
+        print(f"   ⚠️ Dilewati, file berubah sejak preview: {path}")
+    return not stale
+
+
+def main():
+    """Preview dan penerapan selektif hasil `dart fix`."""
+    parser = argparse.ArgumentParser(description="Preview dart fix per file dan terapkan fix pilihan.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    preview_parser = subparsers.add_parser('preview', help="Dry run dan simpan patch per file")
+    preview_parser.add_argument('--rules', nargs='+', help="Hanya rule (kode diagnostic) ini")
+    preview_parser.add_argument('--workers', type=int, default=None,
+                                help="Jumlah proses untuk menghitung diff (default: otomatis dari CPU, load dan memori)")
+
+    apply_parser = subparsers.add_parser('apply', help="Terapkan fix pilihan dalam satu penulisan")
+    apply_parser.add_argument('--files', nargs='+', help="Hanya file ini (path relatif project)")
+    apply_parser.add_argument('--rules', nargs='+', help="Hanya rule (kode diagnostic) ini")
+
+    args = parser.parse_args()
+    dart_executable = require_executable('dart', quiet=True)
+    if not dart_executable:
+        return 1
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    try:
+        if args.command == 'preview':
+            success = run_preview(dart_executable, project_root, script_dir, args.rules, args.workers)
+        else:
+            files = [path.replace(os.sep, '/') for path in args.files] if args.files else None
+            success = run_apply(dart_executable, project_root, script_dir, files, args.rules)
+    except (OSError, RuntimeError) as e:
+        print(f"❌ Terjadi error: {e}")
+        success = False
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+import json
+import os
+import re
+
+# Directive yang membuat satu file Dart bergantung pada file lain.
+# 'part of' sengaja tidak ikut karena arah dependensinya dari library ke part.
+DIRECTIVE_PATTERN = re.compile(
+    r"""^\s*(?:import|export|part)\s+['"]([^'"]+)['"]""", re.MULTILINE
+)
+PACKAGE_NAME_PATTERN = re.compile(r"^name:\s*['\"]?([A-Za-z0-9_]+)", re.MULTILINE)
+
+INDEX_FILE_NAME = ".dart_import_graph.json"
+INDEX_VERSION = 1
+
+# Folder yang tidak pernah berisi source Dart milik project
+SKIPPED_DIRS = {'build', 'Pods', 'node_modules'}
+
+
+def read_package_name(project_root):
+    """Membaca nama package dari pubspec.yaml (None jika tidak ada)."""
+    pubspec = os.path.join(project_root, 'pubspec.yaml')
+    try:
+        with open(pubspec, 'r', encoding='utf-8', errors='ignore') as f:
+            match = PACKAGE_NAME_PATTERN.search(f.read())
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def collect_dart_files(project_root):
+    """Mengumpulkan semua file .dart di project sebagai path relatif (pakai '/')."""
+    dart_files = []
+    for current_dir, dirs, files in os.walk(project_root):
+        # Lewati folder tersembunyi (.dart_tool, .git, ...) dan hasil build
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in SKIPPED_DIRS]
+        for name in files:
+            if name.endswith('.dart'):
+                full_path = os.path.join(current_dir, name)
+                dart_files.append(os.path.relpath(full_path, project_root).replace(os.sep, '/'))
+    dart_files.sort()
+    return dart_files
+
+
+def extract_dependencies(content):
+    """Mengambil semua URI dari directive import/export/part di source Dart."""
+    return DIRECTIVE_PATTERN.findall(content)
+
+
+def resolve_uri(uri, source_file, package_name):
+    """
+    Mengubah URI directive menjadi path relatif terhadap root project.
+    Mengembalikan None untuk dart:, package lain, atau URI yang tidak dikenal.
+    """
+    if uri.startswith('dart:'):
+        return None
+    if uri.startswith('package:'):
+        package_path = uri[len('package:'):]
+        name, _, rest = package_path.partition('/')
+        if package_name and name == package_name and rest:
+            return 'lib/' + rest
+        return None
+    if ':' in uri:
+        return None
+    base_dir = os.path.dirname(source_file)
+    return os.path.normpath(os.path.join(base_dir, uri)).replace(os.sep, '/')
+
+
+def build_graph(project_root, contents, package_name=None):
+    """
+    Membangun graph dependensi dari isi file yang sudah dibaca.
+    `contents` adalah dict {path_relatif: source}; hasilnya {path: set(dependensi)}.
+    """
+    if package_name is None:
+        package_name = read_package_name(project_root)
+
+    graph = {}
+    for rel_path, content in contents.items():
+        deps = set()
+        for uri in extract_dependencies(content):
+            resolved = resolve_uri(uri, rel_path, package_name)
+            if resolved:
+                deps.add(resolved)
+        graph[rel_path] = deps
+    return graph
+
+
+def reverse_dependents(graph, changed_files):
+    """
+    Mencari semua file yang (secara transitif) bergantung pada file yang berubah,
+    termasuk file yang berubah itu sendiri.
+    """
+    reverse = {}
+    for source, deps in graph.items():
+        for dep in deps:
+            reverse.setdefault(dep, set()).add(source)
+
+    affected = set(changed_files)
+    pending = list(changed_files)
+    while pending:
+        current = pending.pop()
+        for dependent in reverse.get(current, ()):
+            if dependent not in affected:
+                affected.add(dependent)
+                pending.append(dependent)
+    return affected
+
+
+def dependency_closure(graph, start):
+    """Semua file yang dibutuhkan `start` secara transitif (termasuk `start`)."""
+    closure = {start}
+    pending = [start]
+    while pending:
+        current = pending.pop()
+        for dep in graph.get(current, ()):
+            if dep not in closure:
+                closure.add(dep)
+                pending.append(dep)
+    return closure
+
+
+class ImportGraphIndex:
+    """
+    Index graph import/part yang disimpan di disk. Saat diperbarui, hanya file
+    yang mtime atau ukurannya berubah yang dibaca dan di-parse ulang.
+    """
+
+    def __init__(self, path, project_root):
+        self.path = path
+        self.project_root = project_root
+        self.package_name = None
+        self.files = {}
+
+    def load(self):
+        """Memuat index dari disk. Index rusak atau versi lama diabaikan."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != INDEX_VERSION:
+            return False
+        self.package_name = data.get('package_name')
+        self.files = data.get('files', {})
+        return True
+
+    def save(self):
+        """Menyimpan index secara atomik."""
+        data = {
+            'version': INDEX_VERSION,
+            'package_name': self.package_name,
+            'files': self.files,
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def update(self):
+        """
+        Menyinkronkan index dengan isi project.
+        Mengembalikan (changed, deleted); changed berisi file baru/berubah yang di-parse ulang.
+        """
+        package_name = read_package_name(self.project_root)
+        if package_name != self.package_name:
+            # Nama package mempengaruhi resolusi semua URI package:
+            self.package_name = package_name
+            self.files = {}
+
+        current = collect_dart_files(self.project_root)
+        current_set = set(current)
+        deleted = {path for path in self.files if path not in current_set}
+        for path in deleted:
+            del self.files[path]
+
+        changed = set()
+        for rel_path in current:
+            try:
+                stat = os.stat(os.path.join(self.project_root, rel_path))
+            except OSError:
+                continue
+            entry = self.files.get(rel_path)
+            if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                continue
+            try:
+                with open(os.path.join(self.project_root, rel_path), 'r',
+                          encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+            except OSError:
+                continue
+            deps = set()
+            for uri in extract_dependencies(content):
+                resolved = resolve_uri(uri, rel_path, self.package_name)
+                if resolved:
+                    deps.add(resolved)
+            self.files[rel_path] = {
+                'mtime': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'deps': sorted(deps),
+            }
+            changed.add(rel_path)
+        return changed, deleted
+
+    def graph(self):
+        """Graph dependensi dalam bentuk {file: set(dependensi)}."""
+        return {path: set(entry['deps']) for path, entry in self.files.items()}
+
+
+def select_affected_tests(graph, test_files, changed_files):
+    """Memilih file test yang bergantung (transitif) pada salah satu file yang berubah."""
+    affected = reverse_dependents(graph, changed_files)
+    return [test_file for test_file in test_files if test_file in affected]
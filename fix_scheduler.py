@@ -0,0 +1,194 @@
+import os
+import random
+import threading
+import time
+
+# Default penjadwalan auto fixer
+DEFAULT_MAX_BACKOFF = 600.0
+DEFAULT_JITTER = 0.1
+DEFAULT_MAX_DUTY = 0.5
+# Penundaan karena lock lebih singkat dari ini tidak dihitung sebagai "ditunda"
+DEFER_THRESHOLD = 0.5
+
+
+class FixScheduler:
+    """
+    Penjadwal job periodik (dart fix). Trigger yang datang selagi job menunggu
+    atau berjalan digabung menjadi satu run. Kegagalan berulang memperpanjang
+    jeda secara eksponensial, setiap jeda diberi jitter, dan jeda minimum dijaga
+    agar job tidak memakan lebih dari `max_duty` porsi waktu.
+    """
+
+    def __init__(self, job, interval, stop_event, lock_factory=None, max_backoff=DEFAULT_MAX_BACKOFF,
+                 jitter=DEFAULT_JITTER, max_duty=DEFAULT_MAX_DUTY, on_run=None):
+        self.job = job
+        self.on_run = on_run
+        self.interval = interval
+        self.stop_event = stop_event
+        self.lock_factory = lock_factory
+        self.max_backoff = max(max_backoff, interval)
+        self.jitter = jitter
+        self.max_duty = min(max(max_duty, 0.01), 1.0)
+
+        self.condition = threading.Condition()
+        self.pending = 0
+        self.failures = 0
+        self.next_due = time.monotonic()
+        self.earliest = 0.0
+        self.running = False
+        self.paused = False
+        self.last_run = None
+        self.started_at = time.time()
+        self.stats = {'requested': 0, 'runs': 0, 'failed': 0, 'coalesced': 0, 'deferred': 0, 'wait_time': 0.0}
+
+    def trigger(self):
+        """Meminta run secepatnya (tetap menghormati batas duty cycle)."""
+        with self.condition:
+            self._add_pending()
+            self.condition.notify()
+
+    def pause(self):
+        """Run periodik dan trigger ditahan (trigger tetap dicatat di antrean)."""
+        with self.condition:
+            self.paused = True
+
+    def resume(self):
+        with self.condition:
+            self.paused = False
+            self.condition.notify()
+
+    def stop(self):
+        """Menghentikan loop penjadwal, termasuk yang sedang tidur menunggu jadwal."""
+        self.stop_event.set()
+        with self.condition:
+            self.condition.notify_all()
+
+    def _add_pending(self):
+        self.stats['requested'] += 1
+        if self.pending:
+            self.stats['coalesced'] += 1
+        self.pending += 1
+
+    def next_delay(self, duration, ok):
+        """Jeda sampai run periodik berikutnya setelah run yang memakan `duration` detik."""
+        if ok:
+            delay = self.interval
+        else:
+            delay = min(self.interval * (2 ** self.failures), self.max_backoff)
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(delay, self.min_idle(duration))
+
+    def min_idle(self, duration):
+        """Jeda minimum agar duration / (duration + jeda) <= max_duty."""
+        return duration * (1 - self.max_duty) / self.max_duty
+
+    def status_line(self):
+        with self.condition:
+            now = time.monotonic()
+            if self.last_run is None:
+                last = "belum pernah"
+            else:
+                finished, duration, ok = self.last_run
+                last = (f"{time.strftime('%H:%M:%S', time.localtime(time.time() - (now - finished)))} "
+                        f"({duration:.1f}s, {'ok' if ok else 'gagal'})")
+            if self.running:
+                state = "berjalan"
+            elif self.paused:
+                state = "dijeda"
+            else:
+                state = f"berikutnya {max(0.0, self.next_due - now):.1f}s"
+            backoff = f" | backoff x{2 ** self.failures}" if self.failures else ""
+            return f"⏱️ antrean: {self.pending} | run terakhir: {last} | {state}{backoff}"
+
+    def metrics(self):
+        """Metrik run dalam bentuk dict (untuk control socket dan file metrik)."""
+        with self.condition:
+            now = time.monotonic()
+            cpu = os.times()
+            data = dict(self.stats)
+            data.update({
+                'uptime': time.time() - self.started_at,
+                'pending': self.pending,
+                'paused': self.paused,
+                'running': self.running,
+                'consecutive_failures': self.failures,
+                'next_run_in': None if self.paused else max(0.0, self.next_due - now),
+                'last_run_at': None,
+                'last_run_duration': None,
+                'last_run_ok': None,
+                # CPU proses ini (scheduler) dan proses anak (dart fix)
+                'cpu_self': cpu.user + cpu.system,
+                'cpu_children': cpu.children_user + cpu.children_system,
+            })
+            if self.last_run is not None:
+                finished, duration, ok = self.last_run
+                data.update(last_run_at=time.time() - (now - finished), last_run_duration=duration, last_run_ok=ok)
+            return data
+
+    def format_stats(self):
+        stats = self.stats
+        return (f"{stats['requested']} permintaan, {stats['runs']} run ({stats['failed']} gagal), "
+                f"{stats['coalesced']} digabung, {stats['deferred']} ditunda "
+                f"({stats['wait_time']:.1f}s menunggu analyze/test)")
+
+    def _wait_for_work(self):
+        """Menunggu sampai ada trigger yang boleh dijalankan. False jika dihentikan."""
+        with self.condition:
+            while not self.stop_event.is_set():
+                now = time.monotonic()
+                if self.paused:
+                    # Tidur tanpa timeout: tidak ada wakeup periodik saat dijeda
+                    self.condition.wait()
+                    continue
+                if now >= self.next_due and not self.pending:
+                    self._add_pending()
+                if self.pending and now >= self.earliest:
+                    return True
+                wake_at = self.earliest if self.pending else self.next_due
+                # trigger(), resume() dan stop() membangunkan lebih awal lewat notify
+                self.condition.wait(max(wake_at - now, 0.01))
+            return False
+
+    def run(self):
+        """Loop penjadwal; dijalankan di thread terpisah sampai stop_event di-set."""
+        while self._wait_for_work():
+            lock = self.lock_factory() if self.lock_factory else None
+            if lock is not None and not lock.acquire(stop_event=self.stop_event):
+                break
+            try:
+                with self.condition:
+                    # Semua trigger yang menumpuk sampai sini dilayani oleh satu run
+                    self.pending = 0
+                    self.running = True
+                    self.stats['runs'] += 1
+                    if lock is not None and lock.wait_time >= DEFER_THRESHOLD:
+                        self.stats['deferred'] += 1
+                        self.stats['wait_time'] += lock.wait_time
+                if lock is not None and lock.wait_time >= DEFER_THRESHOLD:
+                    print(f"[{time.strftime('%H:%M:%S')}] ⏳ Fix ditunda {lock.wait_time:.1f}s "
+                          f"menunggu analyze/test selesai.")
+                started = time.monotonic()
+                try:
+                    ok = bool(self.job())
+                except Exception as e:
+                    print(f"[{time.strftime('%H:%M:%S')}] ❌ Terjadi error yang tidak terduga: {e}")
+                    ok = False
+                duration = time.monotonic() - started
+            finally:
+                if lock is not None:
+                    lock.release()
+
+            with self.condition:
+                self.running = False
+                finished = time.monotonic()
+                self.last_run = (finished, duration, ok)
+                if ok:
+                    self.failures = 0
+                else:
+                    self.failures += 1
+                    self.stats['failed'] += 1
+                self.next_due = finished + self.next_delay(duration, ok)
+                self.earliest = finished + self.min_idle(duration)
+            print(self.status_line())
+            if self.on_run is not None:
+                self.on_run(self)
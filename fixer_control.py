@@ -0,0 +1,125 @@
+import json
+import os
+import secrets
+import selectors
+import socket
+
+CONTROL_FILE_NAME = ".auto_fixer_control.json"
+# Batas ukuran satu permintaan; perintah kontrol hanya beberapa byte
+MAX_REQUEST_BYTES = 4096
+CLIENT_TIMEOUT = 5.0
+
+
+def default_control_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), CONTROL_FILE_NAME)
+
+
+class ControlServer:
+    """
+    Socket kontrol lokal (TCP 127.0.0.1) untuk daemon auto fixer. Satu permintaan
+    JSON per koneksi: {"command": ..., "token": ...}. Port dan token ditulis ke
+    file kontrol yang hanya bisa dibaca pemiliknya.
+
+    Loop utama memblok di selector tanpa timeout, jadi daemon yang menganggur tidak
+    bangun secara periodik; stop() membangunkannya lewat socket pasangan.
+    """
+
+    def __init__(self, handler, port=0, control_path=None):
+        self.handler = handler
+        self.control_path = control_path or default_control_path()
+        self.token = secrets.token_hex(16)
+        self.server = socket.create_server(('127.0.0.1', port))
+        self.port = self.server.getsockname()[1]
+        self.wakeup_reader, self.wakeup_writer = socket.socketpair()
+        self.stopping = False
+
+    def write_control_file(self):
+        data = {'pid': os.getpid(), 'port': self.port, 'token': self.token}
+        tmp_path = self.control_path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.control_path)
+
+    def _handle_connection(self, connection):
+        connection.settimeout(CLIENT_TIMEOUT)
+        try:
+            data = b""
+            while not data.endswith(b"\n") and len(data) < MAX_REQUEST_BYTES:
+                chunk = connection.recv(MAX_REQUEST_BYTES)
+                if not chunk:
+                    break
+                data += chunk
+            try:
+                request = json.loads(data.decode('utf-8'))
+            except ValueError:
+                response = {'ok': False, 'error': 'permintaan bukan JSON'}
+            else:
+                if not secrets.compare_digest(str(request.get('token', '')), self.token):
+                    response = {'ok': False, 'error': 'token tidak valid'}
+                else:
+                    response = self.handler(request.get('command'))
+            connection.sendall(json.dumps(response).encode('utf-8') + b"\n")
+        except OSError:
+            pass
+        finally:
+            connection.close()
+
+    def serve(self):
+        """Melayani permintaan sampai stop() dipanggil."""
+        self.write_control_file()
+        selector = selectors.DefaultSelector()
+        selector.register(self.server, selectors.EVENT_READ)
+        selector.register(self.wakeup_reader, selectors.EVENT_READ)
+        try:
+            while not self.stopping:
+                for key, _ in selector.select():
+                    if key.fileobj is self.wakeup_reader:
+                        self.wakeup_reader.recv(64)
+                        continue
+                    try:
+                        connection, _ = self.server.accept()
+                    except OSError:
+                        continue
+                    self._handle_connection(connection)
+        finally:
+            selector.close()
+            self.server.close()
+            self.wakeup_reader.close()
+            self.wakeup_writer.close()
+            try:
+                os.remove(self.control_path)
+            except OSError:
+                pass
+
+    def stop(self):
+        """Aman dipanggil dari signal handler atau thread lain."""
+        self.stopping = True
+        try:
+            self.wakeup_writer.send(b"x")
+        except OSError:
+            pass
+
+
+def send_command(command, control_path=None):
+    """Mengirim perintah ke daemon yang berjalan. Mengembalikan dict respons."""
+    control_path = control_path or default_control_path()
+    try:
+        with open(control_path, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return {'ok': False, 'error': f"daemon tidak berjalan (file kontrol {control_path} tidak ada)"}
+
+    request = json.dumps({'command': command, 'token': info.get('token')}).encode('utf-8') + b"\n"
+    try:
+        with socket.create_connection(('127.0.0.1', info['port']), timeout=CLIENT_TIMEOUT) as connection:
+            connection.sendall(request)
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = connection.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data.decode('utf-8'))
+    except (OSError, ValueError) as e:
+        return {'ok': False, 'error': f"tidak dapat menghubungi daemon: {e}"}
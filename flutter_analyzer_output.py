@@ -1,115 +1,312 @@
+import argparse
 import subprocess
 import os
 import time
-import shutil
-
-def find_flutter_executable():
-    """Mencari lokasi executable flutter."""
-    # Coba cari flutter di PATH
-    flutter_path = shutil.which('flutter')
-    if flutter_path:
-        return flutter_path
+import sys
+
+from analysis_cache import (
+    CACHE_FILE_NAME,
+    AnalysisCache,
+    compute_config_hash,
+    format_issue,
+    format_issues,
+    hash_files,
+    parse_analyze_output,
+    should_run_full,
+)
+from analysis_baseline import (
+    PINNED_FILE_NAME,
+    PREVIOUS_FILE_NAME,
+    DIFF_FILE_NAME,
+    diff_issues,
+    load_baseline,
+    save_baseline,
+)
+from concurrency_governor import get_governor
+from dart_import_graph import build_graph, collect_dart_files, reverse_dependents
+from project_lock import ProjectLock
+from script_core.sdk import combine_output, require_executable
+from sdk_locator import read_flutter_sdk_version
+import tracing
+
+def analyze_with_cache(flutter_executable, project_root, cache_path):
+    """
+    Menjalankan flutter analyze hanya untuk file yang terpengaruh perubahan.
+    Mengembalikan (return_code, full_output, issues, cache_info); issues None jika analisis gagal.
+    """
+    started = time.perf_counter()
+
+    with tracing.span('hash dart files') as span:
+        dart_files = collect_dart_files(project_root)
+        current_hashes, contents = hash_files(project_root, dart_files)
+        span.set(files=len(dart_files))
+    config_hash = compute_config_hash(project_root, read_flutter_sdk_version(flutter_executable))
+
+    cache = AnalysisCache(cache_path)
+    cache.load()
+    plan = cache.plan(config_hash, current_hashes)
+
+    scope = None
+    deleted = set()
+    if plan is not None:
+        changed, deleted = plan
+        if not changed and not deleted:
+            # Tidak ada yang berubah: langsung pakai hasil dari cache
+            issues = cache.all_issues()
+            elapsed = time.perf_counter() - started
+            cache_info = {
+                'hits': len(current_hashes),
+                'total': len(current_hashes),
+                'mode': 'cache',
+                'saved': max(0.0, cache.last_full_duration - elapsed),
+            }
+            return (1 if issues else 0), format_issues(issues), issues, cache_info
+
+        # File yang meng-import file berubah/terhapus juga harus dianalisis ulang
+        with tracing.span('import graph'):
+            graph = build_graph(project_root, contents)
+            scope = reverse_dependents(graph, changed | deleted) & set(current_hashes)
+        if should_run_full(scope, len(current_hashes)):
+            scope = None
+
+    if scope is None:
+        command = [flutter_executable, 'analyze']
+    else:
+        command = [flutter_executable, 'analyze'] + sorted(scope)
+
+    run_started = time.perf_counter()
+    if scope is not None and not scope:
+        # Hanya ada file terhapus tanpa dependent: tidak perlu menjalankan flutter
+        result = subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+    else:
+        with tracing.span('flutter analyze', category='process', files=len(scope) if scope else 'all'):
+            result = get_governor().run(
+                'analyze',
+                command,
+                text=True,
+                capture_output=True,
+                cwd=project_root
+            )
+    run_duration = time.perf_counter() - run_started
+
+    issues = parse_analyze_output(result.stdout or "", project_root)
+    if analysis_failed(result, issues):
+        # Analisis gagal (bukan sekadar menemukan issue): jangan simpan ke cache
+        cache_info = {'hits': 0, 'total': len(current_hashes), 'mode': 'error', 'saved': 0.0}
+        return result.returncode, combine_output(result), None, cache_info
+
+    if scope is None:
+        cache.replace_all(config_hash, current_hashes, issues)
+        cache.last_full_duration = run_duration
+        cache_info = {'hits': 0, 'total': len(current_hashes), 'mode': 'full', 'saved': 0.0}
+        return_code = result.returncode
+        full_output = combine_output(result)
+    else:
+        cache.merge(scope, deleted, current_hashes, issues)
+        issues = cache.all_issues()
+        elapsed = time.perf_counter() - started
+        cache_info = {
+            'hits': len(current_hashes) - len(scope),
+            'total': len(current_hashes),
+            'mode': 'partial',
+            'saved': max(0.0, cache.last_full_duration - elapsed),
+        }
+        return_code = 1 if issues else 0
+        full_output = format_issues(issues)
+
+    try:
+        with tracing.span('save analysis cache'):
+            cache.save()
+    except OSError as e:
+        print(f"⚠️ Cache analisis tidak dapat disimpan: {e}")
+
+    return return_code, full_output, issues, cache_info
+
+def analysis_failed(result, issues):
+    """True jika flutter analyze gagal berjalan (bukan sekadar menemukan issue)."""
+    return result.returncode not in (0, 1) or (result.returncode != 0 and not issues)
+
+def write_baseline_diff(issues, script_dir, baseline_mode, pin_baseline, timestamp):
+    """
+    Membandingkan issue saat ini dengan baseline dan menulis laporan diff.
+    Mengembalikan (new_issues, resolved_issues), atau None jika belum ada baseline.
+    """
+    previous_path = os.path.join(script_dir, PREVIOUS_FILE_NAME)
+    pinned_path = os.path.join(script_dir, PINNED_FILE_NAME)
+    baseline_path = pinned_path if baseline_mode == 'pinned' else previous_path
+
+    baseline = load_baseline(baseline_path)
+    diff = None
+    if baseline is not None:
+        new_issues, resolved_issues = diff_issues(issues, baseline)
+        diff = (new_issues, resolved_issues)
+
+        lines = [
+            "Flutter Analyze Diff",
+            f"Generated: {timestamp}",
+            f"Baseline: {baseline_path}",
+            f"New: {len(new_issues)}  Resolved: {len(resolved_issues)}",
+            "",
+            "="*60,
+            f"NEW ISSUES ({len(new_issues)}):",
+            "="*60,
+        ]
+        lines.extend(format_issue(issue) for issue in new_issues)
+        lines.extend([
+            "",
+            "="*60,
+            f"RESOLVED ISSUES ({len(resolved_issues)}):",
+            "="*60,
+        ])
+        lines.extend(format_issue(issue) for issue in resolved_issues)
+
+        diff_file = os.path.join(script_dir, DIFF_FILE_NAME)
+        with open(diff_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"🧮 Diff vs baseline: {len(new_issues)} baru, {len(resolved_issues)} terselesaikan "
+              f"(lihat {diff_file})")
+    elif baseline_mode == 'pinned':
+        print(f"⚠️ Baseline belum di-pin. Jalankan dengan --pin-baseline terlebih dahulu.")
+
+    # Hasil run ini menjadi pembanding untuk run berikutnya
+    save_baseline(previous_path, issues, timestamp)
+    if pin_baseline:
+        save_baseline(pinned_path, issues, timestamp)
+        print(f"📌 Baseline di-pin ke: {pinned_path}")
+
+    return diff
+
+def write_analyze_report(command_line, project_root, script_dir, return_code, full_output, issues,
+                         status_line, baseline_mode='previous', pin_baseline=False, fail_on_new=False):
+    """Menulis laporan flutter_analyze.txt, menampilkan ringkasan, dan membuat diff baseline."""
+    # Jika tidak ada output, beri pesan default
+    if not full_output.strip():
+        full_output = "No issues found by flutter analyze."
     
-    # Jika tidak ditemukan di PATH, coba lokasi umum Flutter
-    common_paths = [
-        os.path.expanduser('~/flutter/bin/flutter'),
-        os.path.expanduser('~/AppData/Local/Pub/Cache/bin/flutter'),
-        'C:/flutter/bin/flutter',
-        'C:/flutter/bin/flutter.exe',
-        os.path.expanduser('~/flutter/bin/flutter.exe'),
-    ]
+    # Tambahkan timestamp dan informasi eksekusi
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+    header = f"""Flutter Analyze Report
+Generated: {timestamp}
+Command: {command_line}
+Working Directory: {project_root}
+Return Code: {return_code}
+{status_line}
+
+{'='*60}
+ANALYSIS RESULTS:
+{'='*60}
+
+"""
     
-    for path in common_paths:
-        if os.path.isfile(path):
-            return path
+    final_output = header + full_output
     
-    return None
-
-def run_flutter_analyze():
-    """Menjalankan perintah 'flutter analyze' dan menyimpan output ke file."""
-    print("🔍 Memeriksa ketersediaan Flutter SDK...")
+    # Tulis ke file di directory yang sama dengan script (akan replace jika sudah ada)
+    output_file = os.path.join(script_dir, "flutter_analyze.txt")
+    with tracing.span('write report', report="flutter_analyze.txt"):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(final_output)
     
-    # Cari executable flutter
-    flutter_executable = find_flutter_executable()
+    print(f"✅ Analisis selesai! Output disimpan ke: {output_file}")
+    print(f"📊 Return code: {return_code}")
+    print(f"⚡ {status_line}")
+    
+    # Tampilkan ringkasan
+    if return_code == 0:
+        print("🎉 Tidak ada masalah ditemukan!")
+    else:
+        print("⚠️ Ditemukan masalah dalam kode. Lihat file untuk detail lengkap.")
+    
+    # Tampilkan beberapa baris pertama sebagai preview
+    lines = full_output.strip().split('\n')
+    if len(lines) > 0:
+        print(f"\n📋 Preview (5 baris pertama):")
+        for i, line in enumerate(lines[:5]):
+            print(f"   {line}")
+        if len(lines) > 5:
+            print(f"   ... dan {len(lines) - 5} baris lainnya")
     
+    # Bandingkan dengan baseline agar hanya issue baru/terselesaikan yang dilaporkan
+    if issues is not None:
+        print()
+        with tracing.span('baseline diff'):
+            diff = write_baseline_diff(issues, script_dir, baseline_mode, pin_baseline, timestamp)
+        if fail_on_new and diff is not None and diff[0]:
+            print(f"❌ Ditemukan {len(diff[0])} issue baru dibanding baseline.")
+            return False
+    
+    return True
+
+@tracing.traced()
+def run_flutter_analyze(use_cache=True, baseline_mode='previous', pin_baseline=False, fail_on_new=False,
+                        outcome=None):
+    """
+    Menjalankan perintah 'flutter analyze' dan menyimpan output ke file.
+    `outcome` (dict) diisi return code dan jumlah issue per severity.
+    """
+    # Cari executable flutter
+    flutter_executable = require_executable('flutter')
     if not flutter_executable:
-        print("❌ ERROR: Perintah 'flutter' tidak ditemukan di PATH atau lokasi umum.")
-        print("\n💡 SOLUSI:")
-        print("1. Pastikan Flutter SDK sudah diinstall")
-        print("2. Tambahkan Flutter ke PATH sistem Anda")
-        print("3. Restart terminal/command prompt setelah menambahkan PATH")
-        print("4. Atau jalankan script ini dari terminal yang sudah memiliki akses Flutter")
         return False
     
-    print(f"✅ Flutter ditemukan di: {flutter_executable}")
     print("\n🔄 Menjalankan flutter analyze...")
     
     try:
         # Menjalankan perintah flutter analyze dari root project (parent directory dari script)
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        result = subprocess.run(
-            [flutter_executable, 'analyze'], 
-            text=True, 
-            capture_output=True,
-            cwd=project_root  # Jalankan dari root project, bukan dari folder script
-        )
-        
-        # Gabungkan stdout dan stderr untuk output lengkap
-        full_output = ""
-        if result.stdout:
-            full_output += result.stdout
-        if result.stderr:
-            if full_output:
-                full_output += "\n" + "="*50 + "\nSTDERR:\n" + "="*50 + "\n"
-            full_output += result.stderr
-        
-        # Jika tidak ada output, beri pesan default
-        if not full_output.strip():
-            full_output = "No issues found by flutter analyze."
-        
-        # Tambahkan timestamp dan informasi eksekusi
-        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-        header = f"""Flutter Analyze Report
-Generated: {timestamp}
-Command: {flutter_executable} analyze
-Working Directory: {project_root}
-Return Code: {result.returncode}
-
-{'='*60}
-ANALYSIS RESULTS:
-{'='*60}
-
-"""
-        
-        final_output = header + full_output
-        
         # Dapatkan directory tempat script berada
         script_dir = os.path.dirname(os.path.abspath(__file__))
+
+        # Lock bersama: dart fix (auto_fixer_dart) tidak mengubah source selama analisis
+        lock = ProjectLock(exclusive=False)
+        with tracing.span('project lock wait'):
+            lock.acquire()
+        if lock.wait_time >= 0.5:
+            print(f"⏳ Menunggu dart fix selesai: {lock.wait_time:.1f}s")
+        try:
+            cache_info = None
+            if use_cache:
+                cache_path = os.path.join(script_dir, CACHE_FILE_NAME)
+                return_code, full_output, issues, cache_info = analyze_with_cache(
+                    flutter_executable, project_root, cache_path
+                )
+            else:
+                with tracing.span('flutter analyze', category='process', files='all'):
+                    result = get_governor().run(
+                        'analyze',
+                        [flutter_executable, 'analyze'], 
+                        text=True, 
+                        capture_output=True,
+                        cwd=project_root  # Jalankan dari root project, bukan dari folder script
+                    )
+                return_code = result.returncode
+                # Gabungkan stdout dan stderr untuk output lengkap
+                full_output = combine_output(result)
+                issues = parse_analyze_output(result.stdout or "", project_root)
+                if analysis_failed(result, issues):
+                    issues = None
+        finally:
+            lock.release()
         
-        # Tulis ke file di directory yang sama dengan script (akan replace jika sudah ada)
-        output_file = os.path.join(script_dir, "flutter_analyze.txt")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(final_output)
-        
-        print(f"✅ Analisis selesai! Output disimpan ke: {output_file}")
-        print(f"📊 Return code: {result.returncode}")
+        if outcome is not None:
+            counts = None
+            if issues is not None:
+                counts = {}
+                for issue in issues:
+                    counts[issue['severity']] = counts.get(issue['severity'], 0) + 1
+            outcome.update(return_code=return_code, issue_counts=counts)
         
-        # Tampilkan ringkasan
-        if result.returncode == 0:
-            print("🎉 Tidak ada masalah ditemukan!")
+        # Informasi cache untuk header laporan
+        if cache_info is None:
+            cache_line = "Cache: disabled"
         else:
-            print("⚠️ Ditemukan masalah dalam kode. Lihat file untuk detail lengkap.")
-        
-        # Tampilkan beberapa baris pertama sebagai preview
-        lines = full_output.strip().split('\n')
-        if len(lines) > 0:
-            print(f"\n📋 Preview (5 baris pertama):")
-            for i, line in enumerate(lines[:5]):
-                print(f"   {line}")
-            if len(lines) > 5:
-                print(f"   ... dan {len(lines) - 5} baris lainnya")
+            hit_rate = (cache_info['hits'] / cache_info['total'] * 100) if cache_info['total'] else 0.0
+            cache_line = (f"Cache: {cache_info['mode']} - {cache_info['hits']}/{cache_info['total']} "
+                          f"file hit ({hit_rate:.1f}%), estimated time saved: {cache_info['saved']:.1f}s")
         
-        return True
+        return write_analyze_report(
+            f"{flutter_executable} analyze", project_root, script_dir, return_code, full_output,
+            issues, cache_line, baseline_mode, pin_baseline, fail_on_new
+        )
         
     except FileNotFoundError:
         print("❌ ERROR: Perintah 'flutter' tidak ditemukan.")
@@ -124,12 +321,105 @@ ANALYSIS RESULTS:
         print(f"❌ Terjadi error yang tidak terduga: {e}")
         return False
 
+def run_analysis_server_mode(server_command=None, baseline_mode='previous', pin_baseline=False,
+                             fail_on_new=False):
+    """
+    Menjaga satu proses analysis server tetap hidup dan menganalisis ulang setiap
+    kali [ENTER] ditekan. Hanya file yang berubah yang dianalisis ulang oleh server.
+    """
+    import shlex
+    from analysis_server import AnalysisServerClient, AnalysisServerError, analysis_server_command
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+
+    if server_command:
+        command = shlex.split(server_command)
+    else:
+        flutter_executable = require_executable('flutter')
+        if not flutter_executable:
+            return False
+        command = analysis_server_command(flutter_executable)
+
+    command_line = " ".join(command)
+    print(f"🛰️ Menjalankan analysis server: {command_line}")
+    client = AnalysisServerClient(command, project_root)
+    try:
+        client.start()
+    except (OSError, AnalysisServerError) as e:
+        print(f"❌ ERROR: Analysis server tidak dapat dijalankan: {e}")
+        return False
+
+    success = True
+    try:
+        while True:
+            with ProjectLock(exclusive=False):
+                started = time.perf_counter()
+                with tracing.span('analysis server analyze', category='process') as span:
+                    issues, changed_count = client.analyze()
+                    span.set(changed=changed_count)
+                elapsed = time.perf_counter() - started
+
+            status_line = (f"Analysis server: {changed_count} file berubah, "
+                           f"dianalisis dalam {elapsed:.2f}s")
+            success = write_analyze_report(
+                command_line, project_root, script_dir, 1 if issues else 0,
+                format_issues(issues), issues, status_line, baseline_mode, pin_baseline, fail_on_new
+            )
+            # Baseline hanya di-pin dari hasil analisis pertama
+            pin_baseline = False
+
+            print("\n=======================================================")
+            print("   Analysis server tetap berjalan.")
+            print("   Tekan [ENTER] untuk analisis ulang, ketik 'q' untuk keluar.")
+            print("=======================================================")
+            if input().strip().lower() in ('q', 'quit', 'exit'):
+                break
+    except AnalysisServerError as e:
+        print(f"❌ ERROR: {e}")
+        success = False
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        client.stop()
+        print("🛑 Analysis server dihentikan.")
+
+    return success
+
 def main():
     """Fungsi utama program."""
+    parser = argparse.ArgumentParser(description="Menjalankan flutter analyze dan menyimpan hasilnya ke file.")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Abaikan cache dan analisis ulang seluruh project")
+    parser.add_argument('--baseline', choices=['previous', 'pinned'], default='previous',
+                        help="Pembanding diff: hasil run sebelumnya atau baseline yang di-pin")
+    parser.add_argument('--pin-baseline', action='store_true',
+                        help="Simpan hasil run ini sebagai baseline yang di-pin")
+    parser.add_argument('--fail-on-new', action='store_true',
+                        help="Gagal (exit code 1) jika ada issue baru dibanding baseline")
+    parser.add_argument('--server', action='store_true',
+                        help="Mode analysis server persisten (dart language-server)")
+    parser.add_argument('--server-command',
+                        help="Command analysis server kustom, mis. untuk stub server")
+    args = parser.parse_args()
+
     print("🚀 Flutter Analyzer - Menyimpan hasil analisis ke file")
     print("="*55)
     
-    success = run_flutter_analyze()
+    if args.server or args.server_command:
+        success = run_analysis_server_mode(
+            server_command=args.server_command,
+            baseline_mode=args.baseline,
+            pin_baseline=args.pin_baseline,
+            fail_on_new=args.fail_on_new,
+        )
+    else:
+        success = run_flutter_analyze(
+            use_cache=not args.no_cache,
+            baseline_mode=args.baseline,
+            pin_baseline=args.pin_baseline,
+            fail_on_new=args.fail_on_new,
+        )
     
     if success:
         print("\n✨ Program selesai dengan sukses!")
@@ -137,6 +427,7 @@ def main():
         print("\n💥 Program gagal dijalankan.")
     
     print("\n👋 Terima kasih telah menggunakan Flutter Analyzer!")
+    return 0 if success else 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,233 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+from auto_fixer_dart import run_dart_fix
+from concurrency_governor import get_governor
+from flutter_analyzer_output import run_flutter_analyze
+from flutter_tester import plan_test_run, run_flutter_test
+from project_lock import ProjectLock
+from sdk_locator import find_dart_executable, find_flutter_executable, read_flutter_sdk_version
+import tracing
+
+PIPELINE_REPORT_NAME = "flutter_pipeline.txt"
+STAGES = ['fix', 'analyze', 'test']
+# Laporan detail yang ditulis masing-masing stage
+STAGE_REPORTS = {
+    'analyze': "flutter_analyze.txt",
+    'test': "flutter_test_results.txt",
+}
+
+
+def parse_stage_list(value):
+    """Argumen daftar stage dipisah koma; 'none' berarti daftar kosong."""
+    if value.strip().lower() == 'none':
+        return []
+    stages = [stage.strip() for stage in value.split(',') if stage.strip()]
+    for stage in stages:
+        if stage not in STAGES:
+            raise argparse.ArgumentTypeError(f"stage tidak dikenal: {stage} (pilihan: {', '.join(STAGES)})")
+    return stages
+
+
+class StageResult:
+    """Hasil satu stage: status, waktu mulai relatif terhadap pipeline, durasi dan detail."""
+
+    def __init__(self, name):
+        self.name = name
+        self.status = 'skipped'
+        self.detail = ""
+        self.started = None
+        self.duration = 0.0
+        self.outcome = {}
+
+    def run(self, pipeline_start, func):
+        """Menjalankan func() -> (ok, detail) dan mencatat waktunya."""
+        self.started = time.perf_counter() - pipeline_start
+        began = time.perf_counter()
+        try:
+            with tracing.span(f"stage {self.name}", category='pipeline'):
+                ok, self.detail = func()
+        except Exception as e:
+            ok, self.detail = False, f"error tidak terduga: {e}"
+        self.duration = time.perf_counter() - began
+        self.status = 'ok' if ok else 'failed'
+        return ok
+
+
+def analyze_detail(outcome):
+    """Stage analyze gagal jika analisis tidak berjalan atau ada issue severity error."""
+    counts = outcome.get('issue_counts')
+    if counts is None:
+        return False, f"analisis gagal (return code {outcome.get('return_code')})"
+    parts = [f"{counts.get(severity, 0)} {severity}" for severity in ('error', 'warning', 'info')]
+    return not counts.get('error'), ", ".join(parts)
+
+
+def test_detail(outcome):
+    summary = outcome.get('summary')
+    if summary is None:
+        return False, "test tidak berjalan"
+    detail = (f"{summary['total']} test: {summary['passed']} lulus, {summary['failed']} gagal, "
+              f"{summary['error']} error, {summary['skipped']} dilewati, {summary['flaky']} flaky")
+    return outcome.get('return_code') == 0, detail
+
+
+def write_pipeline_report(script_dir, results, total_duration, stop_reason):
+    """Laporan gabungan semua stage dengan waktu mulai dan durasi masing-masing."""
+    stage_total = sum(result.duration for result in results.values())
+    lines = [
+        "Flutter Pipeline Report",
+        f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+        f"Total: {total_duration:.2f}s (jumlah durasi stage {stage_total:.2f}s, "
+        f"hemat {max(0.0, stage_total - total_duration):.2f}s dari overlap)",
+    ]
+    if stop_reason:
+        lines.append(f"Dihentikan: {stop_reason}")
+    lines += ["", "="*60, "STAGE:", "="*60]
+    for name in STAGES:
+        result = results.get(name)
+        if result is None:
+            continue
+        timing = (f"+{result.started:6.2f}s  {result.duration:7.2f}s"
+                  if result.started is not None else f"{'-':>8}  {'-':>8}")
+        lines.append(f"{result.status.upper():8} {name:8} {timing}  {result.detail}")
+        if name in STAGE_REPORTS and result.status != 'skipped':
+            lines.append(f"{'':17}laporan: {os.path.join(script_dir, STAGE_REPORTS[name])}")
+
+    report_path = os.path.join(script_dir, PIPELINE_REPORT_NAME)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    return report_path, lines
+
+
+def run_pipeline(stages, stop_on, use_cache=True, fail_on_new=False, shards=1, changed_only=False,
+                 base='HEAD', retries=0):
+    """
+    Menjalankan fix -> analyze -> test. Fix mengubah source sehingga selalu selesai
+    lebih dulu. Persiapan test (pemilihan test, graph import, content hash) berjalan
+    bersamaan dengan analyze; jika kegagalan analyze tidak menghentikan pipeline,
+    test sekaligus dijalankan paralel dengan analyze.
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    pipeline_start = time.perf_counter()
+    results = {name: StageResult(name) for name in stages}
+    stop_reason = None
+
+    # Lokasi SDK dicari sekali; semua stage memakai hasil memo sdk_locator yang sama
+    flutter_executable = find_flutter_executable()
+    if flutter_executable:
+        print(f"✅ Flutter {read_flutter_sdk_version(flutter_executable)} di: {flutter_executable}")
+    if 'fix' in stages:
+        print(f"✅ Dart di: {find_dart_executable() or '-'}")
+
+    if 'fix' in results:
+        def fix_stage():
+            # Lock eksklusif: tidak bentrok dengan auto_fixer/analyze/test di terminal lain
+            with ProjectLock(exclusive=True):
+                return run_dart_fix(project_root), "dart fix --apply"
+
+        print("\n" + "="*20 + " FIX " + "="*20)
+        ok = results['fix'].run(pipeline_start, fix_stage)
+        if not ok and 'fix' in stop_on:
+            stop_reason = "stage fix gagal"
+
+    analyze_thread = None
+    if 'analyze' in results and stop_reason is None:
+        def analyze_stage():
+            outcome = results['analyze'].outcome
+            if not run_flutter_analyze(use_cache=use_cache, fail_on_new=fail_on_new, outcome=outcome):
+                return False, "flutter analyze gagal atau ada issue baru"
+            return analyze_detail(outcome)
+
+        print("\n" + "="*20 + " ANALYZE " + "="*20)
+        analyze_thread = threading.Thread(
+            target=results['analyze'].run, args=(pipeline_start, analyze_stage)
+        )
+        analyze_thread.start()
+
+    test_thread = None
+    if 'test' in results and stop_reason is None:
+        def test_stage(plan):
+            outcome = results['test'].outcome
+            if not run_flutter_test(shards=shards, changed_only=changed_only, base=base,
+                                    retries=retries, plan=plan, outcome=outcome):
+                return False, "flutter test gagal dijalankan"
+            return test_detail(outcome)
+
+        # Pemilihan test dan content hash tidak bergantung pada hasil analyze
+        plan = plan_test_run(project_root, script_dir, changed_only, base)
+        if analyze_thread is not None and 'analyze' in stop_on:
+            analyze_thread.join()
+            analyze_thread = None
+            if results['analyze'].status == 'failed':
+                stop_reason = "stage analyze gagal"
+
+        if stop_reason is None:
+            print("\n" + "="*20 + " TEST " + "="*20)
+            test_thread = threading.Thread(
+                target=results['test'].run, args=(pipeline_start, lambda: test_stage(plan))
+            )
+            test_thread.start()
+
+    for thread in (analyze_thread, test_thread):
+        if thread is not None:
+            thread.join()
+    if stop_reason is None and 'test' in stop_on and results.get('test') and results['test'].status == 'failed':
+        stop_reason = "stage test gagal"
+
+    total_duration = time.perf_counter() - pipeline_start
+    report_path, lines = write_pipeline_report(script_dir, results, total_duration, stop_reason)
+    print("\n" + "\n".join(lines))
+    print(f"\n✅ Laporan pipeline disimpan ke: {report_path}")
+    return all(result.status != 'failed' for result in results.values()) and stop_reason is None
+
+
+def main():
+    """Fungsi utama program."""
+    parser = argparse.ArgumentParser(description="Menjalankan dart fix, flutter analyze dan flutter test sebagai satu pipeline.")
+    parser.add_argument('--stages', type=parse_stage_list, default=list(STAGES),
+                        help="Stage yang dijalankan, dipisah koma (default: fix,analyze,test)")
+    parser.add_argument('--stop-on', type=parse_stage_list, default=['fix', 'analyze'],
+                        help="Stage yang kegagalannya menghentikan pipeline (default: fix,analyze; 'none' = jalankan semua)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Analisis penuh tanpa cache incremental")
+    parser.add_argument('--fail-on-new', action='store_true',
+                        help="Stage analyze gagal jika ada issue baru dibanding baseline")
+    parser.add_argument('--shards', type=int, default=1,
+                        help="Jumlah shard paralel untuk test (0 = otomatis dari CPU, load dan memori; 1 = satu proses seperti biasa)")
+    parser.add_argument('--changed-only', action='store_true',
+                        help="Hanya jalankan test yang terpengaruh perubahan file Dart")
+    parser.add_argument('--base', default='HEAD',
+                        help="Revisi git pembanding untuk --changed-only (default: HEAD)")
+    parser.add_argument('--retries', type=int, default=0,
+                        help="Jalankan ulang test yang gagal hingga N kali")
+    args = parser.parse_args()
+    stages = [stage for stage in STAGES if stage in args.stages]
+
+    print("🚀 Flutter Pipeline - " + " → ".join(stages))
+    print("="*55)
+
+    success = run_pipeline(
+        stages,
+        args.stop_on,
+        use_cache=not args.no_cache,
+        fail_on_new=args.fail_on_new,
+        shards=args.shards if args.shards > 0 else get_governor().plan_workers('test shard'),
+        changed_only=args.changed_only,
+        base=args.base,
+        retries=args.retries,
+    )
+
+    if success:
+        print("\n✨ Pipeline selesai dengan sukses!")
+    else:
+        print("\n💥 Pipeline gagal.")
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
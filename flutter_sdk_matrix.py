@@ -0,0 +1,364 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from flutter_pipeline import StageResult, analyze_detail, test_detail
+from sdk_locator import read_flutter_sdk_version
+
+MATRIX_REPORT_NAME = "flutter_sdk_matrix.txt"
+MATRIX_JSON_NAME = "flutter_sdk_matrix.json"
+MATRIX_STAGES = ['analyze', 'test']
+# Penanda baris hasil worker di stdout (sisa output worker masuk ke log per SDK)
+RESULT_MARKER = "MATRIX_RESULT "
+# Folder yang tidak disalin ke salinan project per SDK (dibuat ulang oleh flutter/git)
+EXCLUDED_DIRS = {'.git', '.dart_tool', 'build', 'coverage', '.idea', '.gradle', 'Pods'}
+
+
+def parse_matrix_stages(value):
+    stages = [stage.strip() for stage in value.split(',') if stage.strip()]
+    for stage in stages:
+        if stage not in MATRIX_STAGES:
+            raise argparse.ArgumentTypeError(f"stage tidak dikenal: {stage} (pilihan: {', '.join(MATRIX_STAGES)})")
+    return stages
+
+
+def resolve_sdk(path):
+    """Menerima root SDK atau path executable flutter. Mengembalikan (root, executable) atau None."""
+    path = os.path.abspath(os.path.expanduser(path))
+    if os.path.isfile(path):
+        return os.path.dirname(os.path.dirname(path)), path
+    for name in ('flutter', 'flutter.bat'):
+        executable = os.path.join(path, 'bin', name)
+        if os.path.isfile(executable):
+            return path, executable
+    return None
+
+
+def default_work_dir(project_root):
+    """Salinan project dan pub cache per SDK disimpan di temp agar bisa dipakai ulang antar run."""
+    digest = hashlib.sha1(os.path.abspath(project_root).encode('utf-8')).hexdigest()[:10]
+    return os.path.join(tempfile.gettempdir(), "flutter_sdk_matrix", digest)
+
+
+def sdk_slug(sdk_root):
+    digest = hashlib.sha1(sdk_root.encode('utf-8')).hexdigest()[:8]
+    return f"{os.path.basename(sdk_root.rstrip(os.sep)) or 'sdk'}-{digest}"
+
+
+def sync_project_copy(project_root, target, scripts_rel):
+    """
+    Menyinkronkan salinan project: hanya file yang ukuran/mtime-nya berubah yang
+    disalin dan file yang sudah dihapus di sumber ikut dihapus. Dari folder script
+    hanya file .py yang disalin; laporan, cache dan lock milik salinan dibiarkan
+    karena isinya khusus untuk SDK tersebut.
+    Mengembalikan (jumlah disalin, jumlah dihapus).
+    """
+    def is_script_state(rel_path):
+        return os.path.dirname(rel_path) == scripts_rel and not rel_path.endswith('.py')
+
+    copied = removed = 0
+    source_files = set()
+    for dirpath, dirnames, filenames in os.walk(project_root):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+        rel_dir = os.path.relpath(dirpath, project_root)
+        os.makedirs(os.path.join(target, rel_dir), exist_ok=True)
+        for name in filenames:
+            rel_path = os.path.normpath(os.path.join(rel_dir, name))
+            if is_script_state(rel_path):
+                continue
+            source_files.add(rel_path)
+            source = os.path.join(project_root, rel_path)
+            destination = os.path.join(target, rel_path)
+            try:
+                source_stat = os.stat(source)
+            except OSError:
+                continue
+            try:
+                destination_stat = os.stat(destination)
+            except OSError:
+                destination_stat = None
+            if (destination_stat is None or destination_stat.st_size != source_stat.st_size
+                    or destination_stat.st_mtime_ns != source_stat.st_mtime_ns):
+                shutil.copy2(source, destination)
+                copied += 1
+
+    for dirpath, dirnames, filenames in os.walk(target):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+        rel_dir = os.path.relpath(dirpath, target)
+        for name in filenames:
+            rel_path = os.path.normpath(os.path.join(rel_dir, name))
+            if rel_path not in source_files and not is_script_state(rel_path):
+                os.remove(os.path.join(target, rel_path))
+                removed += 1
+    return copied, removed
+
+
+class SdkRun:
+    """Satu baris matrix: SDK, salinan project-nya dan hasil tiap stage."""
+
+    def __init__(self, sdk_path):
+        self.sdk_path = sdk_path
+        self.root = None
+        self.executable = None
+        self.version = None
+        self.status = 'pending'
+        self.error = ""
+        self.duration = 0.0
+        self.stages = {}
+        self.log_path = None
+
+    def to_dict(self):
+        return {
+            'sdk': self.sdk_path,
+            'root': self.root,
+            'version': self.version,
+            'status': self.status,
+            'error': self.error,
+            'duration': self.duration,
+            'stages': self.stages,
+            'log': self.log_path,
+        }
+
+
+def new_process_group_options():
+    """Opsi Popen agar proses anak berada di process group/session baru."""
+    if os.name == 'nt':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def kill_process_group(process):
+    """Mematikan proses beserta semua turunannya (dijalankan dengan new_process_group_options)."""
+    if os.name == 'nt':
+        # taskkill /T mengikuti pohon proses; process group Windows tidak bisa di-kill langsung
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        import signal
+
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    process.kill()
+
+
+def run_sdk(run, project_root, scripts_rel, work_dir, stages, worker_args, timeout):
+    """
+    Menjalankan satu SDK. Exception (salinan project gagal, disk penuh, output worker
+    rusak) dicatat sebagai status 'error' SDK itu saja, seperti timeout, sehingga
+    SDK lain tetap selesai dan laporan matrix tetap ditulis.
+    """
+    started = time.perf_counter()
+    try:
+        return _run_sdk(run, project_root, scripts_rel, work_dir, stages, worker_args, timeout, started)
+    except Exception as e:
+        run.status, run.error = 'error', f"{type(e).__name__}: {e}"
+        run.duration = time.perf_counter() - started
+        return run
+
+
+def _run_sdk(run, project_root, scripts_rel, work_dir, stages, worker_args, timeout, started):
+    """Menyiapkan salinan project dan pub cache terisolasi lalu menjalankan worker untuk satu SDK."""
+    resolved = resolve_sdk(run.sdk_path)
+    if resolved is None:
+        run.status, run.error = 'error', "flutter tidak ditemukan di SDK ini"
+        return run
+    run.root, run.executable = resolved
+    run.version = read_flutter_sdk_version(run.executable)
+
+    sdk_dir = os.path.join(work_dir, sdk_slug(run.root))
+    project_copy = os.path.join(sdk_dir, 'project')
+    pub_cache = os.path.join(sdk_dir, 'pub-cache')
+    os.makedirs(pub_cache, exist_ok=True)
+    copied, removed = sync_project_copy(project_root, project_copy, scripts_rel)
+    print(f"   📁 {run.version}: salinan project diperbarui ({copied} file disalin, {removed} dihapus)")
+
+    # SDK ini ditaruh paling depan di PATH sehingga sdk_locator di worker menemukannya;
+    # pub cache terpisah agar versi paket/artefak SDK tidak saling menimpa
+    env = dict(os.environ)
+    env['PATH'] = os.path.join(run.root, 'bin') + os.pathsep + env.get('PATH', '')
+    env['FLUTTER_ROOT'] = run.root
+    env['PUB_CACHE'] = pub_cache
+    env['PYTHONIOENCODING'] = 'utf-8'
+
+    worker = os.path.join(project_copy, scripts_rel, os.path.basename(__file__))
+    command = [sys.executable, worker, '--worker', '--stages', ','.join(stages)] + worker_args
+    run.log_path = os.path.join(sdk_dir, 'matrix_run.log')
+    with open(run.log_path, 'w', encoding='utf-8') as log:
+        # Worker di process group sendiri: saat timeout, flutter/dart yang dijalankannya
+        # ikut dimatikan dan tidak terus menulis ke salinan project dan pub cache
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=log, text=True,
+                                   encoding='utf-8', errors='replace', env=env, cwd=project_copy,
+                                   **new_process_group_options())
+        try:
+            stdout, _ = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_group(process)
+            stdout, _ = process.communicate()
+            log.write(stdout)
+            run.status, run.error = 'error', f"timeout setelah {timeout}s"
+            run.duration = time.perf_counter() - started
+            return run
+        log.write(stdout)
+
+    result = None
+    for line in reversed(stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            result = json.loads(line[len(RESULT_MARKER):])
+            break
+    run.duration = time.perf_counter() - started
+    if result is None:
+        run.status, run.error = 'error', f"worker gagal (return code {process.returncode}), lihat {run.log_path}"
+        return run
+    run.stages = result['stages']
+    run.status = 'ok' if all(stage['status'] == 'ok' for stage in run.stages.values()) else 'failed'
+    return run
+
+
+def run_worker(stages, use_cache, shards):
+    """
+    Dijalankan di dalam salinan project dengan PATH/PUB_CACHE milik satu SDK.
+    Analyze dan test berjalan bersamaan seperti di flutter_pipeline; hasil dicetak
+    sebagai satu baris JSON.
+    """
+    from flutter_analyzer_output import run_flutter_analyze
+    from flutter_tester import run_flutter_test
+
+    pipeline_start = time.perf_counter()
+    results = {name: StageResult(name) for name in stages}
+
+    def analyze_stage():
+        outcome = results['analyze'].outcome
+        if not run_flutter_analyze(use_cache=use_cache, outcome=outcome):
+            return False, "flutter analyze gagal dijalankan"
+        return analyze_detail(outcome)
+
+    def test_stage():
+        outcome = results['test'].outcome
+        if not run_flutter_test(shards=shards, outcome=outcome):
+            return False, "flutter test gagal dijalankan"
+        return test_detail(outcome)
+
+    stage_funcs = {'analyze': analyze_stage, 'test': test_stage}
+    threads = [threading.Thread(target=results[name].run, args=(pipeline_start, stage_funcs[name]))
+               for name in stages]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    data = {'stages': {name: {'status': result.status, 'detail': result.detail,
+                              'duration': result.duration, 'outcome': result.outcome}
+                       for name, result in results.items()}}
+    print(RESULT_MARKER + json.dumps(data), flush=True)
+    return 0 if all(result.status == 'ok' for result in results.values()) else 1
+
+
+def format_matrix(runs, stages, wall_time):
+    """Tabel perbandingan: satu baris per SDK, satu kolom per stage."""
+    sum_time = sum(run.duration for run in runs)
+    lines = [
+        "Flutter SDK Matrix Report",
+        f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+        f"Total: {wall_time:.2f}s (jumlah waktu per SDK {sum_time:.2f}s, "
+        f"SDK paling lambat {max((run.duration for run in runs), default=0.0):.2f}s)",
+        "",
+    ]
+    version_width = max([len("versi")] + [len(run.version or "-") for run in runs])
+    header = f"{'status':8} {'versi':{version_width}} {'waktu':>8}  " + "  ".join(f"{stage}" for stage in stages)
+    lines += [header, "-" * len(header)]
+    for run in runs:
+        row = f"{run.status.upper():8} {run.version or '-':{version_width}} {run.duration:7.2f}s  "
+        if run.error:
+            row += run.error
+        else:
+            row += "  |  ".join(f"{run.stages[stage]['status'].upper()} {run.stages[stage]['detail']} "
+                                f"({run.stages[stage]['duration']:.1f}s)"
+                                for stage in stages if stage in run.stages)
+        lines.append(row)
+        lines.append(f"{'':9}{run.root or run.sdk_path}")
+    return lines
+
+
+def run_matrix(sdk_paths, stages, use_cache=True, shards=1, jobs=None, work_dir=None, timeout=None):
+    """Menjalankan analyze/test untuk setiap SDK secara paralel; waktu total ≈ SDK paling lambat."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+    scripts_rel = os.path.relpath(script_dir, project_root)
+    work_dir = os.path.abspath(work_dir or default_work_dir(project_root))
+    if os.path.commonpath([work_dir, project_root]) == project_root:
+        print("❌ ERROR: --work-dir tidak boleh berada di dalam project (akan ikut tersalin).")
+        return False
+
+    worker_args = ['--shards', str(shards)] + ([] if use_cache else ['--no-cache'])
+    runs = [SdkRun(path) for path in sdk_paths]
+    print(f"🧪 Menjalankan {', '.join(stages)} untuk {len(runs)} SDK (salinan project di {work_dir})")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs or len(runs)) as executor:
+        futures = [executor.submit(run_sdk, run, project_root, scripts_rel, work_dir, stages,
+                                   worker_args, timeout) for run in runs]
+        for future in futures:
+            run = future.result()
+            print(f"   {'✅' if run.status == 'ok' else '❌'} {run.version or run.sdk_path}: "
+                  f"{run.status} dalam {run.duration:.1f}s")
+    wall_time = time.perf_counter() - started
+
+    lines = format_matrix(runs, stages, wall_time)
+    report_path = os.path.join(script_dir, MATRIX_REPORT_NAME)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    with open(os.path.join(script_dir, MATRIX_JSON_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'wall_time': wall_time, 'runs': [run.to_dict() for run in runs]}, f, indent=2)
+
+    print("\n" + "\n".join(lines))
+    print(f"\n✅ Laporan matrix disimpan ke: {report_path} (+ .json, log per SDK di {work_dir})")
+    return all(run.status == 'ok' for run in runs)
+
+
+def main():
+    """Fungsi utama program."""
+    parser = argparse.ArgumentParser(description="Menjalankan flutter analyze/test untuk beberapa versi Flutter SDK sekaligus.")
+    parser.add_argument('sdks', nargs='*', help="Root Flutter SDK atau path executable flutter")
+    parser.add_argument('--sdk-file', help="File berisi daftar path SDK, satu per baris")
+    parser.add_argument('--stages', type=parse_matrix_stages, default=list(MATRIX_STAGES),
+                        help="Stage yang dijalankan, dipisah koma (default: analyze,test)")
+    parser.add_argument('--no-cache', action='store_true', help="Analisis penuh tanpa cache incremental")
+    parser.add_argument('--shards', type=int, default=1, help="Jumlah shard test per SDK")
+    parser.add_argument('--jobs', type=int, help="Maksimal SDK yang berjalan bersamaan (default: semua)")
+    parser.add_argument('--work-dir', help="Folder salinan project dan pub cache per SDK")
+    parser.add_argument('--timeout', type=float, help="Batas waktu per SDK (detik)")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args.stages, not args.no_cache, args.shards)
+
+    sdk_paths = list(args.sdks)
+    if args.sdk_file:
+        with open(args.sdk_file, 'r', encoding='utf-8') as f:
+            sdk_paths += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if not sdk_paths:
+        parser.error("berikan minimal satu path SDK (argumen atau --sdk-file)")
+
+    success = run_matrix(sdk_paths, args.stages, use_cache=not args.no_cache, shards=args.shards,
+                         jobs=args.jobs, work_dir=args.work_dir, timeout=args.timeout)
+    if success:
+        print("\n✨ Semua SDK lulus!")
+    else:
+        print("\n💥 Ada SDK yang gagal.")
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,71 +1,400 @@
+import argparse
 import subprocess
 import os
-import shutil
+import sys
+import threading
+import time
+from collections import deque
 
-def find_flutter_executable():
-    """Mencari lokasi executable flutter."""
-    flutter_path = shutil.which('flutter')
-    if flutter_path:
-        return flutter_path
-    
-    common_paths = [
-        os.path.expanduser('~/flutter/bin/flutter'),
-        os.path.expanduser('~/AppData/Local/Pub/Cache/bin/flutter'),
-        'C:/flutter/bin/flutter',
-        'C:/flutter/bin/flutter.exe',
-        os.path.expanduser('~/flutter/bin/flutter.exe'),
-    ]
-    
-    for path in common_paths:
-        if os.path.isfile(path):
-            return path
-    
-    return None
+from concurrency_governor import get_governor
+from dart_import_graph import INDEX_FILE_NAME, ImportGraphIndex, select_affected_tests
+from lcov_tools import (
+    COVERAGE_BASELINE_NAME,
+    COVERAGE_PREVIOUS_NAME,
+    COVERAGE_REPORT_NAME,
+    diff_summaries,
+    format_summary,
+    load_summary,
+    merge_lcov,
+    percent,
+    save_summary,
+    summarize_lcov,
+    write_lcov,
+)
+from project_lock import ProjectLock
+from script_core.sdk import require_executable, stderr_section
+from test_history import HISTORY_FILE_NAME, TestHistory, compute_content_hashes
+from test_reporter import TEXT_REPORT_NAME, JsonReporterParser, RetryCollector, TestReport, open_report
+import tracing
+from test_sharding import (
+    attribute_shard_duration,
+    discover_test_files,
+    estimate_durations,
+    plan_shards,
+)
 
-def run_flutter_test():
-    """Menjalankan perintah 'flutter test' dan menyimpan output ke file."""
-    print("🔍 Memeriksa ketersediaan Flutter SDK...")
-    
-    flutter_executable = find_flutter_executable()
+# Perubahan pada file ini bisa mempengaruhi semua test
+GLOBAL_CHANGE_FILES = {'pubspec.yaml', 'pubspec.lock', 'analysis_options.yaml'}
+# Jumlah baris stderr terakhir yang disimpan untuk laporan
+STDERR_TAIL_LINES = 200
+
+def git_changed_files(project_root, base='HEAD'):
+    """File yang berubah dibanding `base` menurut git, plus file untracked (None jika git gagal)."""
+    try:
+        diff = subprocess.run(
+            ['git', 'diff', '--name-only', '--relative', base],
+            text=True, capture_output=True, cwd=project_root
+        )
+        untracked = subprocess.run(
+            ['git', 'ls-files', '--others', '--exclude-standard'],
+            text=True, capture_output=True, cwd=project_root
+        )
+    except OSError:
+        return None
+    if diff.returncode != 0 or untracked.returncode != 0:
+        return None
+    return {line.strip() for line in (diff.stdout + untracked.stdout).splitlines() if line.strip()}
+
+def select_impacted_tests(project_root, script_dir, test_files, base='HEAD'):
+    """
+    Memilih test yang terpengaruh perubahan berdasarkan graph import yang di-cache.
+    Mengembalikan (selected_files, source) dengan source 'git', 'mtime' atau 'global'.
+    """
+    index = ImportGraphIndex(os.path.join(script_dir, INDEX_FILE_NAME), project_root)
+    index.load()
+    mtime_changed, deleted = index.update()
+    try:
+        index.save()
+    except OSError as e:
+        print(f"⚠️ Index graph import tidak dapat disimpan: {e}")
+
+    changed = git_changed_files(project_root, base)
+    source = 'git'
+    if changed is None:
+        # Bukan repo git: pakai file yang berubah sejak index terakhir diperbarui
+        changed = mtime_changed | deleted
+        source = 'mtime'
+
+    for path in changed:
+        name = os.path.basename(path)
+        in_source_dir = path.startswith('lib/') or path.startswith('test/')
+        if name in GLOBAL_CHANGE_FILES or (in_source_dir and not path.endswith('.dart')):
+            # Dependensi, konfigurasi, atau fixture berubah: jalankan semua test
+            return list(test_files), 'global'
+
+    return select_affected_tests(index.graph(), test_files, changed), source
+
+def stream_flutter_test(command, project_root, report, parser_label=None, on_start=None):
+    """
+    Menjalankan `flutter test --reporter json` dan mem-parse event saat output
+    mengalir, tanpa menampung seluruh output di memori. `on_start(pid)` dipanggil
+    setelah proses dibuat (dipakai governor untuk mengamati RSS).
+    Mengembalikan (return_code, suite_durations).
+    """
+    with tracing.span('spawn flutter test', category='process', label=parser_label or ''):
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+            cwd=project_root
+        )
+    if on_start is not None:
+        on_start(process.pid)
+
+    # stderr dibaca di thread terpisah agar pipe tidak penuh; hanya bagian akhirnya disimpan
+    stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+    stderr_thread = threading.Thread(target=stderr_tail.extend, args=(process.stderr,), daemon=True)
+    stderr_thread.start()
+
+    parser = JsonReporterParser(report, project_root)
+    with tracing.span('drain flutter test output', category='process', label=parser_label or '') as span:
+        first_line = True
+        for line in process.stdout:
+            if first_line:
+                tracing.instant('first output', category='process', label=parser_label or '')
+                first_line = False
+            parser.feed(line)
+        return_code = process.wait()
+        stderr_thread.join()
+        parser.finish()
+        span.set(return_code=return_code)
+
+    if stderr_tail and return_code != 0:
+        label = f" ({parser_label})" if parser_label else ""
+        for line in stderr_section(label):
+            report.raw(line)
+        for line in stderr_tail:
+            report.raw(line)
+
+    return return_code, parser.suite_durations()
+
+def run_shard(flutter_executable, project_root, index, files, coverage_path, concurrency, report):
+    """Menjalankan satu shard `flutter test` dan mengukur durasinya."""
+    # Governor menahan spawn shard berikutnya jika memori tidak cukup
+    with get_governor().slot('test shard') as job:
+        started = time.perf_counter()
+        return_code, suite_durations = stream_flutter_test(
+            [flutter_executable, 'test', '--coverage', '--coverage-path', coverage_path,
+             '--reporter', 'json', '--concurrency', str(concurrency)] + files,
+            project_root, report, f"shard {index + 1}", on_start=job.track
+        )
+    elapsed = time.perf_counter() - started
+    print(f"   🧩 Shard {index + 1}: {len(files)} file, {elapsed:.1f}s, return code {return_code}")
+    return {
+        'index': index,
+        'files': files,
+        'returncode': return_code,
+        'elapsed': elapsed,
+        'suite_durations': suite_durations,
+        'coverage_path': coverage_path,
+    }
+
+def run_sharded_tests(flutter_executable, project_root, history, shard_count, report, test_files=None):
+    """
+    Membagi file test ke beberapa shard berdasarkan durasi run sebelumnya dan
+    menjalankan shard secara paralel. Mengembalikan return code gabungan.
+    """
+    if test_files is None:
+        test_files = discover_test_files(project_root)
+    if not test_files:
+        report.raw("No test files found.")
+        return 0
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    estimates = estimate_durations(test_files, history.suite_durations())
+    shards = plan_shards(test_files, estimates, shard_count)
+
+    # Jumlah shard yang berjalan bersamaan mengikuti load dan memori mesin; setiap
+    # shard aktif mendapat bagian core yang sama agar mesin tidak oversubscribed
+    workers = get_governor().plan_workers('test shard', len(shards))
+    concurrency = max(1, (os.cpu_count() or 1) // workers)
+    coverage_dir = os.path.join(project_root, 'coverage')
+    os.makedirs(coverage_dir, exist_ok=True)
+
+    print(f"🧩 {len(test_files)} file test dibagi ke {len(shards)} shard "
+          f"({workers} bersamaan, concurrency {concurrency} per shard)")
+    for index, shard in enumerate(shards):
+        print(f"   Shard {index + 1}: {len(shard['files'])} file, estimasi {shard['estimate']:.1f}s")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                run_shard, flutter_executable, project_root, index, shard['files'],
+                os.path.join(coverage_dir, f'lcov_shard_{index}.info'), concurrency, report
+            )
+            for index, shard in enumerate(shards)
+        ]
+        results = [future.result() for future in futures]
+    wall_clock = time.perf_counter() - started
+
+    # Gabungkan coverage semua shard menjadi coverage/lcov.info
+    write_lcov(merge_lcov([r['coverage_path'] for r in results]), os.path.join(coverage_dir, 'lcov.info'))
+    for r in results:
+        try:
+            os.remove(r['coverage_path'])
+        except OSError:
+            pass
+
+    # Durasi per file dari event reporter; jika tidak ada, dibagi dari durasi shard
+    measured = {}
+    for r in results:
+        measured.update(attribute_shard_duration(r['files'], estimates, r['elapsed']))
+        measured.update(r['suite_durations'])
+    history.record_suite_durations(measured)
+
+    total_shard_time = sum(r['elapsed'] for r in results)
+    print(f"⏱️ Wall-clock {wall_clock:.1f}s untuk total {total_shard_time:.1f}s waktu shard")
+
+    report.raw("")
+    for r in results:
+        report.raw(f"Shard {r['index'] + 1}/{len(results)}: {len(r['files'])} file, "
+                   f"{r['elapsed']:.1f}s, return code {r['returncode']}")
+    report.raw(f"Wall-clock: {wall_clock:.1f}s, total shard time: {total_shard_time:.1f}s")
+
+    return next((r['returncode'] for r in results if r['returncode'] != 0), 0)
+
+def retry_failed_tests(flutter_executable, project_root, report, max_retries):
+    """
+    Menjalankan ulang hanya test yang gagal (per file dengan --plain-name), hingga
+    `max_retries` kali. Test yang lulus saat retry ditandai flaky.
+    Mengembalikan True jika semua test yang gagal akhirnya lulus.
+    """
+    if report.failures_omitted:
+        # Tidak semua nama test gagal disimpan, jadi retry tidak bisa membuat run ini lulus
+        print(f"🔁 Retry dilewati: lebih dari {len(report.failures)} test gagal")
+        return False
+    for attempt in range(2, max_retries + 2):
+        targets = set(report.failures)
+        if not targets:
+            break
+        suites = sorted({suite for suite, _ in targets})
+        names = sorted({name for _, name in targets})
+        print(f"🔁 Retry {attempt - 1}/{max_retries}: {len(targets)} test gagal di {len(suites)} file")
+
+        command = [flutter_executable, 'test', '--reporter', 'json']
+        for name in names:
+            command += ['--plain-name', name]
+        collector = RetryCollector(report, targets, attempt)
+        stream_flutter_test(command + suites, project_root, TestReport([collector]), f"retry {attempt - 1}")
+
+        for suite, name in sorted(collector.passed):
+            report.mark_flaky(suite, name)
+            print(f"   ⚠️ Flaky (lulus saat retry): {suite}: {name}")
+
+    return not report.failures
+
+def report_coverage(project_root, script_dir, baseline_mode='previous', pin_baseline=False):
+    """Meringkas coverage/lcov.info dan membandingkannya dengan baseline coverage."""
+    lcov_path = os.path.join(project_root, 'coverage', 'lcov.info')
+    if not os.path.isfile(lcov_path):
+        return None
+
+    summary = summarize_lcov(lcov_path)
+    previous_path = os.path.join(script_dir, COVERAGE_PREVIOUS_NAME)
+    pinned_path = os.path.join(script_dir, COVERAGE_BASELINE_NAME)
+    baseline_path = pinned_path if baseline_mode == 'pinned' else previous_path
+
+    baseline = load_summary(baseline_path)
+    diff = diff_summaries(summary, baseline) if baseline is not None else None
+
+    report_path = os.path.join(script_dir, COVERAGE_REPORT_NAME)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(format_summary(summary, diff, os.path.basename(baseline_path)))
+
+    save_summary(previous_path, summary)
+    if pin_baseline:
+        save_summary(pinned_path, summary)
+        print(f"📌 Baseline coverage di-pin ke: {pinned_path}")
+
+    total = summary['total']
+    delta_text = f" ({diff[0]:+.2f}% vs baseline)" if diff is not None else ""
+    print(f"📈 Line coverage: {percent(total['lines_hit'], total['lines_found']):.2f}%{delta_text} "
+          f"- detail di {report_path}")
+    return summary
+
+@tracing.traced()
+def plan_test_run(project_root, script_dir, changed_only=False, base='HEAD'):
+    """
+    Menentukan file test yang dijalankan dan content hash-nya. Tidak menjalankan
+    flutter, sehingga bisa dikerjakan sambil stage lain berjalan.
+    """
+    # None berarti semua test dijalankan seperti biasa
+    selected_files = None
+    skipped_line = ""
+    if changed_only:
+        all_tests = discover_test_files(project_root)
+        selected_files, source = select_impacted_tests(project_root, script_dir, all_tests, base)
+        skipped = len(all_tests) - len(selected_files)
+        skipped_line = (f"Test impact ({source}): {len(selected_files)} dari {len(all_tests)} "
+                        f"file test dijalankan, {skipped} dilewati")
+        print(f"🎯 {skipped_line}")
     
+    run_files = selected_files if selected_files is not None else discover_test_files(project_root)
+    return {
+        'selected_files': selected_files,
+        'skipped_line': skipped_line,
+        'content_hashes': compute_content_hashes(project_root, script_dir, run_files),
+    }
+
+@tracing.traced()
+def run_flutter_test(shards=1, changed_only=False, base='HEAD', coverage_baseline='previous',
+                     pin_coverage_baseline=False, retries=0, plan=None, outcome=None):
+    """
+    Menjalankan perintah 'flutter test' dan menyimpan hasil ke file laporan.
+    `plan` dari plan_test_run() bisa disiapkan lebih dulu; `outcome` (dict) diisi
+    return code dan ringkasan hasil test.
+    """
+    flutter_executable = require_executable('flutter')
     if not flutter_executable:
-        print("❌ ERROR: Perintah 'flutter' tidak ditemukan di PATH atau lokasi umum.")
         return False
     
-    print(f"✅ Flutter ditemukan di: {flutter_executable}")
     print("\n🔄 Menjalankan flutter test...")
     
     try:
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        result = subprocess.run(
-            [flutter_executable, 'test', '--coverage'], 
-            text=True, 
-            capture_output=True,
-            cwd=project_root
-        )
-        
-        full_output = ""
-        if result.stdout:
-            full_output += result.stdout
-        if result.stderr:
-            if full_output:
-                full_output += "\n" + "="*50 + "\nSTDERR:\n" + "="*50 + "\n"
-            full_output += result.stderr
+        script_dir = os.path.dirname(os.path.abspath(__file__))
         
-        if not full_output.strip():
-            full_output = "No issues found by flutter test."
+        # Lock bersama: dart fix (auto_fixer_dart) tidak mengubah source selama test berjalan
+        lock = ProjectLock(exclusive=False)
+        with tracing.span('project lock wait'):
+            lock.acquire()
+        if lock.wait_time >= 0.5:
+            print(f"⏳ Menunggu dart fix selesai: {lock.wait_time:.1f}s")
+        try:
+            if plan is None:
+                plan = plan_test_run(project_root, script_dir, changed_only, base)
+            selected_files = plan['selected_files']
+            skipped_line = plan['skipped_line']
+            content_hashes = plan['content_hashes']
+            
+            # Riwayat durasi dan hasil setiap test untuk shard, laporan slow/flaky, dan retry
+            history = TestHistory(os.path.join(script_dir, HISTORY_FILE_NAME))
+            history.start_run(project_root, f"shards={shards} changed_only={changed_only}")
+            
+            # Laporan teks, JSONL dan JUnit XML ditulis bertahap selama test berjalan
+            report = open_report(script_dir, [history.writer(content_hashes)])
+            if skipped_line:
+                report.raw(skipped_line)
+                report.raw("")
+            
+            try:
+                if selected_files is not None and not selected_files:
+                    return_code = 0
+                    report.raw("No affected tests to run.")
+                elif shards > 1:
+                    return_code = run_sharded_tests(
+                        flutter_executable, project_root, history, shards, report, selected_files
+                    )
+                else:
+                    with get_governor().slot('test shard') as job:
+                        return_code, suite_durations = stream_flutter_test(
+                            [flutter_executable, 'test', '--coverage', '--reporter', 'json'] + (selected_files or []),
+                            project_root, report, on_start=job.track
+                        )
+                    history.record_suite_durations(suite_durations)
+
+                if return_code != 0 and retries > 0 and report.failures:
+                    with tracing.span('retry failed tests', failures=len(report.failures)):
+                        if retry_failed_tests(flutter_executable, project_root, report, retries):
+                            return_code = 0
+            finally:
+                with tracing.span('write report', report=TEXT_REPORT_NAME):
+                    report.close()
+            with tracing.span('write test history'):
+                history.finish_run(return_code)
+                history.close()
+        finally:
+            lock.release()
         
-        output_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "flutter_test_results.txt")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(full_output)
+        # Coverage dari run sebagian (--changed-only) tidak sebanding dengan baseline penuh
+        if selected_files is None:
+            with tracing.span('coverage report'):
+                report_coverage(project_root, script_dir, coverage_baseline, pin_coverage_baseline)
         
-        print(f"✅ Pengujian selesai! Output disimpan ke: {output_file}")
-        print(f"📊 Return code: {result.returncode}")
+        summary = report.summary
+        if outcome is not None:
+            outcome.update(return_code=return_code, summary=dict(summary))
+        print(f"✅ Pengujian selesai! Laporan disimpan ke: "
+              f"{os.path.join(script_dir, TEXT_REPORT_NAME)} (+ .jsonl, .xml)")
+        print(f"📊 Return code: {return_code}")
+        print(f"🧪 {summary['total']} test: {summary['passed']} lulus, {summary['failed']} gagal, "
+              f"{summary['error']} error, {summary['skipped']} dilewati, {summary['flaky']} flaky")
         
-        if result.returncode == 0:
+        if return_code == 0:
             print("🎉 Tidak ada masalah ditemukan!")
         else:
             print("⚠️ Ditemukan masalah dalam kode. Lihat file untuk detail lengkap.")
+            for suite, name in report.failures[:5]:
+                print(f"   ❌ {suite}: {name}")
+            remaining = len(report.failures) + report.failures_omitted - 5
+            if remaining > 0:
+                print(f"   ... dan {remaining} test gagal lainnya")
         
         return True
         
@@ -79,12 +408,62 @@ def run_flutter_test():
         print(f"❌ Terjadi error yang tidak terduga: {e}")
         return False
 
+def show_history_report(limit=20):
+    """Menampilkan test terlambat, makin lambat, dan flaky dari database riwayat."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    history_path = os.path.join(script_dir, HISTORY_FILE_NAME)
+    if not os.path.isfile(history_path):
+        print("⚠️ Belum ada riwayat test. Jalankan flutter_tester.py terlebih dahulu.")
+        return False
+
+    history = TestHistory(history_path)
+    try:
+        report_text = history.format_report(limit)
+    finally:
+        history.close()
+
+    output_file = os.path.join(script_dir, "flutter_test_history.txt")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(report_text)
+    print(report_text)
+    print(f"✅ Laporan riwayat disimpan ke: {output_file}")
+    return True
+
 def main():
     """Fungsi utama program."""
+    parser = argparse.ArgumentParser(description="Menjalankan flutter test dan menyimpan hasilnya ke file.")
+    parser.add_argument('--shards', type=int, default=1,
+                        help="Jumlah shard paralel (0 = otomatis dari CPU, load dan memori; 1 = satu proses seperti biasa)")
+    parser.add_argument('--changed-only', action='store_true',
+                        help="Hanya jalankan test yang terpengaruh perubahan file Dart")
+    parser.add_argument('--base', default='HEAD',
+                        help="Revisi git pembanding untuk --changed-only (default: HEAD)")
+    parser.add_argument('--coverage-baseline', choices=['previous', 'pinned'], default='previous',
+                        help="Pembanding coverage: run sebelumnya atau baseline yang di-pin")
+    parser.add_argument('--pin-coverage-baseline', action='store_true',
+                        help="Simpan coverage run ini sebagai baseline yang di-pin")
+    parser.add_argument('--retries', type=int, default=0,
+                        help="Jalankan ulang test yang gagal hingga N kali; yang lalu lulus ditandai flaky")
+    parser.add_argument('--report', action='store_true',
+                        help="Tampilkan laporan test terlambat/makin lambat/flaky dari riwayat")
+    parser.add_argument('--report-limit', type=int, default=20,
+                        help="Jumlah baris per bagian laporan riwayat")
+    args = parser.parse_args()
+    if args.report:
+        return 0 if show_history_report(args.report_limit) else 1
+    shards = args.shards if args.shards > 0 else get_governor().plan_workers('test shard')
+
     print("🚀 Flutter Tester - Menyimpan hasil pengujian ke file")
     print("="*55)
     
-    success = run_flutter_test()
+    success = run_flutter_test(
+        shards=shards,
+        changed_only=args.changed_only,
+        base=args.base,
+        coverage_baseline=args.coverage_baseline,
+        pin_coverage_baseline=args.pin_coverage_baseline,
+        retries=args.retries,
+    )
     
     if success:
         print("\n✨ Program selesai dengan sukses!")
@@ -92,6 +471,7 @@ def main():
         print("\n💥 Program gagal dijalankan.")
     
     print("\n👋 Terima kasih telah menggunakan Flutter Tester!")
+    return 0 if success else 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
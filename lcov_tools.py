@@ -0,0 +1,289 @@
+import argparse
+import json
+import os
+import sys
+
+COVERAGE_REPORT_NAME = "flutter_coverage.txt"
+COVERAGE_PREVIOUS_NAME = "flutter_coverage_previous.json"
+COVERAGE_BASELINE_NAME = "flutter_coverage_baseline.json"
+
+# Perubahan persentase di bawah ambang ini tidak dilaporkan di diff
+DIFF_THRESHOLD = 0.01
+
+
+def iter_lcov_records(path):
+    """
+    Membaca file lcov secara streaming, satu record (SF ... end_of_record) per kali.
+    Menghasilkan (source_file, lines, branches, functions) dengan lines {baris: hits},
+    branches {(baris, block, branch): taken} dan functions {nama: [posisi, hits]}.
+    taken None berarti '-' (branch tidak pernah dieksekusi), berbeda dengan 0
+    (dieksekusi tapi tidak diambil). Posisi fungsi adalah teks setelah 'FN:'
+    ("baris" atau "baris_awal,baris_akhir" di lcov 2.x); None jika hanya ada FNDA.
+    """
+    source_file = None
+    lines = {}
+    branches = {}
+    functions = {}
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if line.startswith('DA:'):
+                fields = line[3:].split(',', 2)
+                line_no = int(fields[0])
+                lines[line_no] = lines.get(line_no, 0) + int(fields[1])
+            elif line.startswith('BRDA:'):
+                line_no, block, branch, taken = line[5:].rstrip().split(',', 3)
+                key = (int(line_no), block, branch)
+                branches[key] = add_taken(branches.get(key), None if taken == '-' else int(taken))
+            elif line.startswith('FN:'):
+                position, name = split_function_position(line[3:].rstrip('\r\n'))
+                entry = functions.setdefault(name, [None, 0])
+                if entry[0] is None:
+                    entry[0] = position
+            elif line.startswith('FNDA:'):
+                hits, name = line[5:].rstrip('\r\n').split(',', 1)
+                functions.setdefault(name, [None, 0])[1] += int(hits)
+            elif line.startswith('SF:'):
+                source_file = line[3:].rstrip('\r\n')
+            elif line.startswith('end_of_record'):
+                if source_file is not None:
+                    yield source_file, lines, branches, functions
+                source_file = None
+                lines = {}
+                branches = {}
+                functions = {}
+        if source_file is not None:
+            yield source_file, lines, branches, functions
+
+
+def split_function_position(text):
+    """'12,foo' atau '12,20,foo' (lcov 2.x) menjadi (posisi, nama)."""
+    fields = text.split(',', 2)
+    if len(fields) == 3 and fields[1].isdigit():
+        return f"{fields[0]},{fields[1]}", fields[2]
+    position, _, name = text.partition(',')
+    return position, name
+
+
+def _function_sort_key(item):
+    position = item[1][0]
+    if position is None:
+        return (1, 0, item[0])
+    return (0, int(position.split(',', 1)[0]), item[0])
+
+
+def add_taken(a, b):
+    """Menjumlahkan taken branch; hasilnya None hanya jika kedua sisi tidak pernah dieksekusi."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a + b
+
+
+def merge_lcov(paths):
+    """
+    Menggabungkan beberapa file lcov (shard atau package). Hit untuk baris yang sama
+    dijumlahkan. Memori sebanding dengan jumlah baris unik, bukan ukuran file lcov.
+    Mengembalikan {source_file: (lines, branches, functions)}.
+    """
+    merged = {}
+    for path in paths:
+        if not os.path.isfile(path):
+            continue
+        for source_file, lines, branches, functions in iter_lcov_records(path):
+            existing = merged.get(source_file)
+            if existing is None:
+                merged[source_file] = (lines, branches, functions)
+                continue
+            merged_lines, merged_branches, merged_functions = existing
+            for line_no, hits in lines.items():
+                merged_lines[line_no] = merged_lines.get(line_no, 0) + hits
+            for key, hits in branches.items():
+                merged_branches[key] = add_taken(merged_branches.get(key), hits)
+            for name, (position, hits) in functions.items():
+                entry = merged_functions.setdefault(name, [position, 0])
+                if entry[0] is None:
+                    entry[0] = position
+                entry[1] += hits
+    return merged
+
+
+def write_lcov(merged, output_path):
+    """Menulis hasil merge kembali ke format lcov (atomik)."""
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        for source_file in sorted(merged):
+            lines, branches, functions = merged[source_file]
+            out.write(f"SF:{source_file}\n")
+            ordered = sorted(functions.items(), key=_function_sort_key)
+            for name, (position, _) in ordered:
+                if position is not None:
+                    out.write(f"FN:{position},{name}\n")
+            for name, (_, hits) in ordered:
+                out.write(f"FNDA:{hits},{name}\n")
+            if functions:
+                out.write(f"FNF:{len(functions)}\nFNH:{sum(1 for _, hits in functions.values() if hits)}\n")
+            for line_no in sorted(lines):
+                out.write(f"DA:{line_no},{lines[line_no]}\n")
+            for key in sorted(branches):
+                taken = branches[key]
+                out.write(f"BRDA:{key[0]},{key[1]},{key[2]},{'-' if taken is None else taken}\n")
+            if branches:
+                out.write(f"BRF:{len(branches)}\nBRH:{sum(1 for t in branches.values() if t)}\n")
+            out.write(f"LF:{len(lines)}\nLH:{sum(1 for h in lines.values() if h)}\n")
+            out.write("end_of_record\n")
+    os.replace(tmp_path, output_path)
+
+
+def percent(hit, found):
+    return (hit / found * 100) if found else 100.0
+
+
+def _record_summary(lines, branches):
+    return {
+        'lines_found': len(lines),
+        'lines_hit': sum(1 for hits in lines.values() if hits),
+        'branches_found': len(branches),
+        'branches_hit': sum(1 for taken in branches.values() if taken),
+    }
+
+
+def _summary_from_entries(entries):
+    files = {}
+    totals = {'lines_found': 0, 'lines_hit': 0, 'branches_found': 0, 'branches_hit': 0}
+    for source_file, entry in entries:
+        files[source_file] = entry
+        for key in totals:
+            totals[key] += entry[key]
+    return {'files': files, 'total': totals}
+
+
+def summarize(merged):
+    """Ringkasan coverage baris dan branch per file dan total."""
+    return _summary_from_entries((source_file, _record_summary(lines, branches))
+                                 for source_file, (lines, branches, _) in merged.items())
+
+
+def summarize_lcov(path):
+    """
+    Ringkasan satu file lcov secara streaming: setiap record langsung dijumlahkan
+    lalu dibuang, sehingga memori hanya sebanding dengan jumlah source file. File
+    lcov hasil concat (source file sama di beberapa record) perlu digabung per
+    baris dulu, jadi untuk kasus itu dipakai merge_lcov.
+    """
+    entries = []
+    seen = set()
+    for source_file, lines, branches, _ in iter_lcov_records(path):
+        if source_file in seen:
+            return summarize(merge_lcov([path]))
+        seen.add(source_file)
+        entries.append((source_file, _record_summary(lines, branches)))
+    return _summary_from_entries(entries)
+
+
+def diff_summaries(current, baseline):
+    """
+    Membandingkan coverage baris per file dengan baseline.
+    Mengembalikan (total_delta, changes) dengan changes berisi (file, lama, baru);
+    None berarti file tidak ada di salah satu sisi.
+    """
+    changes = []
+    current_files = current['files']
+    baseline_files = baseline['files']
+    for source_file in sorted(set(current_files) | set(baseline_files)):
+        new = current_files.get(source_file)
+        old = baseline_files.get(source_file)
+        new_pct = percent(new['lines_hit'], new['lines_found']) if new else None
+        old_pct = percent(old['lines_hit'], old['lines_found']) if old else None
+        if new_pct is None or old_pct is None or abs(new_pct - old_pct) >= DIFF_THRESHOLD:
+            changes.append((source_file, old_pct, new_pct))
+
+    total_new = percent(current['total']['lines_hit'], current['total']['lines_found'])
+    total_old = percent(baseline['total']['lines_hit'], baseline['total']['lines_found'])
+    return total_new - total_old, changes
+
+
+def load_summary(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_summary(path, summary):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def format_summary(summary, diff=None, baseline_label=None):
+    """Menyusun laporan coverage dalam bentuk teks."""
+    total = summary['total']
+    lines = [
+        f"Line coverage:   {percent(total['lines_hit'], total['lines_found']):6.2f}% "
+        f"({total['lines_hit']}/{total['lines_found']})",
+    ]
+    if total['branches_found']:
+        lines.append(f"Branch coverage: {percent(total['branches_hit'], total['branches_found']):6.2f}% "
+                     f"({total['branches_hit']}/{total['branches_found']})")
+
+    if diff is not None:
+        total_delta, changes = diff
+        lines.append("")
+        lines.append(f"Diff vs {baseline_label}: {total_delta:+.2f}% total, {len(changes)} file berubah")
+        for source_file, old_pct, new_pct in changes:
+            old_text = f"{old_pct:6.2f}%" if old_pct is not None else "   baru"
+            new_text = f"{new_pct:6.2f}%" if new_pct is not None else "  hapus"
+            lines.append(f"  {old_text} -> {new_text}  {source_file}")
+
+    lines.append("")
+    lines.append("="*60)
+    lines.append("PER FILE:")
+    lines.append("="*60)
+    for source_file in sorted(summary['files']):
+        entry = summary['files'][source_file]
+        lines.append(f"{percent(entry['lines_hit'], entry['lines_found']):6.2f}% "
+                     f"({entry['lines_hit']}/{entry['lines_found']})  {source_file}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """CLI kecil untuk merge dan ringkasan lcov di luar flutter_tester."""
+    parser = argparse.ArgumentParser(description="Merge dan ringkasan file lcov.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    merge_parser = subparsers.add_parser('merge', help="Gabungkan beberapa file lcov")
+    merge_parser.add_argument('output')
+    merge_parser.add_argument('inputs', nargs='+')
+
+    summary_parser = subparsers.add_parser('summary', help="Ringkasan coverage file lcov")
+    summary_parser.add_argument('inputs', nargs='+')
+    summary_parser.add_argument('--baseline', help="File ringkasan JSON pembanding")
+    summary_parser.add_argument('--save', help="Simpan ringkasan JSON ke file ini")
+
+    args = parser.parse_args()
+    if args.command == 'merge':
+        merged = merge_lcov(args.inputs)
+        write_lcov(merged, args.output)
+        print(f"✅ {len(merged)} file digabung ke {args.output}")
+        return 0
+
+    if len(args.inputs) == 1:
+        summary = summarize_lcov(args.inputs[0])
+    else:
+        summary = summarize(merge_lcov(args.inputs))
+    diff = None
+    if args.baseline:
+        baseline = load_summary(args.baseline)
+        if baseline is not None:
+            diff = diff_summaries(summary, baseline)
+    print(format_summary(summary, diff, args.baseline), end='')
+    if args.save:
+        save_summary(args.save, summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
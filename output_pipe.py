@@ -0,0 +1,73 @@
+import threading
+
+# Ukuran satu read dari pipe; baris yang lebih panjang membuat buffer diperbesar
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Kebijakan byte non-UTF-8 saat output ditampilkan ke layar (log tetap berisi byte asli)
+DECODE_POLICIES = ("replace", "backslashreplace", "surrogateescape", "ignore")
+DEFAULT_DECODE_POLICY = "replace"
+
+
+def iter_line_batches(pipe, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Membaca pipe bytes (Popen dengan bufsize=0) per chunk besar ke satu bytearray
+    yang dipakai ulang. Setiap chunk menghasilkan (region, lines): `region` adalah
+    memoryview semua baris lengkap di chunk itu, `lines` memoryview per baris
+    (termasuk "\\n"). Tidak ada salinan per baris; sisa baris yang belum lengkap
+    digeser ke awal buffer. View hanya valid sampai iterasi berikutnya.
+    Baris terakhir tanpa "\\n" dikirim saat EOF.
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    filled = 0
+    while True:
+        if filled == len(buffer):
+            # Satu baris lebih panjang dari buffer: pindah ke buffer dua kali lebih besar.
+            # Buffer lama tidak di-resize karena view batch sebelumnya mungkin masih dipegang.
+            larger = bytearray(len(buffer) * 2)
+            larger[:filled] = buffer
+            buffer = larger
+            view = memoryview(buffer)
+        count = pipe.readinto(view[filled:])
+        if not count:
+            if filled:
+                yield view[:filled], [view[:filled]]
+            return
+        search_from = filled
+        filled += count
+
+        lines = []
+        start = 0
+        end = buffer.find(b"\n", search_from, filled)
+        while end != -1:
+            lines.append(view[start:end + 1])
+            start = end + 1
+            end = buffer.find(b"\n", start, filled)
+        if not lines:
+            continue
+        yield view[:start], lines
+        del lines
+        # Geser sisa baris (biasanya pendek) ke awal; panjang buffer tidak berubah
+        remaining = filled - start
+        if remaining:
+            buffer[:remaining] = buffer[start:filled]
+        filled = remaining
+
+
+def drain_in_background(pipe, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Menguras pipe sampai EOF di thread terpisah ke bytearray. Dipakai untuk stderr
+    agar proses anak tidak pernah terblok karena pipe stderr penuh selagi stdout
+    dibaca. Mengembalikan (thread, buffer); buffer lengkap setelah thread.join().
+    """
+    buffer = bytearray()
+
+    def drain():
+        while True:
+            chunk = pipe.read(chunk_size)
+            if not chunk:
+                break
+            buffer.extend(chunk)
+
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    return thread, buffer
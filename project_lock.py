@@ -0,0 +1,86 @@
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: tidak ada fcntl, pakai msvcrt (hanya lock eksklusif)
+    fcntl = None
+    import msvcrt
+
+LOCK_FILE_NAME = ".flutter_project.lock"
+# Jeda antar percobaan mengambil lock saat menunggu proses lain
+POLL_INTERVAL = 0.1
+
+
+def default_lock_path():
+    """Lock dibagi semua script di folder yang sama (satu project)."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), LOCK_FILE_NAME)
+
+
+class ProjectLock:
+    """
+    Lock antar proses untuk source project. `dart fix` mengambil lock eksklusif
+    karena menulis file; analyze dan test mengambil lock bersama (shared) sehingga
+    bisa berjalan bersamaan, tetapi tidak selama fix mengubah file.
+    """
+
+    def __init__(self, path=None, exclusive=True):
+        self.path = path or default_lock_path()
+        # msvcrt tidak mendukung lock bersama
+        self.exclusive = exclusive or fcntl is None
+        self.file = None
+        self.wait_time = 0.0
+
+    def _try_lock(self):
+        try:
+            if fcntl is not None:
+                mode = fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH
+                fcntl.flock(self.file.fileno(), mode | fcntl.LOCK_NB)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self, timeout=None, stop_event=None):
+        """
+        Mengambil lock, menunggu jika dipegang proses lain. Mengembalikan False jika
+        timeout habis atau stop_event di-set. Lama menunggu dicatat di wait_time.
+        """
+        self.file = open(self.path, 'a+')
+        started = time.perf_counter()
+        try:
+            while not self._try_lock():
+                waited = time.perf_counter() - started
+                if (timeout is not None and waited >= timeout) or (stop_event is not None and stop_event.is_set()):
+                    self.file.close()
+                    self.file = None
+                    return False
+                time.sleep(POLL_INTERVAL)
+        finally:
+            self.wait_time = time.perf_counter() - started
+        return True
+
+    def release(self):
+        if self.file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        self.file.close()
+        self.file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
@@ -0,0 +1,33 @@
+"""
+Inti bersama untuk Log_writer*.py dan script Flutter. Nama di bawah di-import
+dari submodule-nya saat pertama kali dipakai, sehingga entry point hanya
+membayar import yang benar-benar dibutuhkan (misalnya terminal logger tidak
+ikut memuat helper SDK).
+"""
+import importlib
+
+_EXPORTS = {
+    "TerminalLogger": "terminal",
+    "AliasTerminalLogger": "shell_aliases",
+    "ProfileTerminalLogger": "shell_aliases",
+    "test_powershell_profile": "shell_aliases",
+    "require_executable": "sdk",
+    "combine_output": "sdk",
+    "stderr_section": "sdk",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    # Simpan di namespace paket: akses berikutnya tidak lewat __getattr__ lagi
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,46 @@
+from sdk_locator import find_executable
+
+SDK_LABELS = {'flutter': 'Flutter', 'dart': 'Dart'}
+# Petunjuk yang sama untuk semua script saat SDK tidak ditemukan
+SOLUTION_LINES = (
+    "1. Pastikan Flutter SDK sudah diinstall",
+    "2. Tambahkan Flutter ke PATH sistem Anda",
+    "3. Restart terminal/command prompt setelah menambahkan PATH",
+    "4. Atau jalankan script ini dari terminal yang sudah memiliki akses Flutter",
+)
+
+
+def require_executable(name, quiet=False):
+    """
+    Mencari executable SDK (flutter/dart) dengan pesan standar. Mengembalikan
+    path, atau None setelah menampilkan petunjuk solusi. `quiet` hanya
+    menampilkan pesan jika executable tidak ditemukan (untuk pemanggilan berulang).
+    """
+    label = SDK_LABELS.get(name, name)
+    if not quiet:
+        print(f"🔍 Memeriksa ketersediaan {label} SDK...")
+    executable = find_executable(name)
+    if not executable:
+        print(f"\n❌ ERROR: Perintah '{name}' tidak ditemukan di PATH atau lokasi umum.")
+        print("\n💡 SOLUSI:")
+        for line in SOLUTION_LINES:
+            print(line)
+        return None
+    if not quiet:
+        print(f"✅ {label} ditemukan di: {executable}")
+    return executable
+
+
+def stderr_section(label=""):
+    """Baris pemisah sebelum stderr di laporan"""
+    return ["=" * 50, f"STDERR{label}:", "=" * 50]
+
+
+def combine_output(result):
+    """Menggabungkan stdout dan stderr dari hasil subprocess."""
+    full_output = result.stdout or ""
+    if result.stderr:
+        if full_output:
+            full_output += "\n" + "\n".join(stderr_section()) + "\n"
+        full_output += result.stderr
+    return full_output
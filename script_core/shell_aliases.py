@@ -0,0 +1,527 @@
+import os
+
+from alias_expansion import build_alias_closure, expand_command
+from output_pipe import DEFAULT_DECODE_POLICY
+from script_core.terminal import IS_WINDOWS, SCRIPT_DIR, TerminalLogger
+import tracing
+
+# Baris stderr yang selalu muncul dari `bash -i` tanpa terminal; tidak dicatat
+BASH_STDERR_NOISE = (
+    "bash: cannot set terminal process group",
+    "bash: no job control in this shell",
+)
+POWERSHELL_STDERR_NOISE = ("Unable to find type", "ObjectNotFound")
+
+
+def powershell_profile_paths(include_all_hosts=False):
+    """Lokasi profile PowerShell (Windows PowerShell lalu PowerShell 7)"""
+    documents = os.path.join(os.environ.get("USERPROFILE", ""), "Documents")
+    names = ["Microsoft.PowerShell_profile.ps1"]
+    if include_all_hosts:
+        names.append("profile.ps1")
+    return [
+        os.path.join(documents, folder, name)
+        for name in names
+        for folder in ("WindowsPowerShell", "PowerShell")
+    ]
+
+
+def shell_config_paths():
+    """File konfigurasi bash/zsh di home directory, urut prioritas"""
+    home = os.path.expanduser("~")
+    names = (".bashrc", ".bash_profile", ".zshrc", ".profile", ".bash_aliases")
+    return [os.path.join(home, name) for name in names]
+
+
+def parse_alias_definition(definition):
+    """'name=command' (tanpa kata 'alias') menjadi (name, command) dengan kutip dibuang"""
+    name, command = definition.split("=", 1)
+    return name.strip(), command.strip().strip("'\"")
+
+
+class AliasTerminalLogger(TerminalLogger):
+    """
+    Terminal logger dengan alias dari bash (`alias` di shell interaktif dan file
+    konfigurasi shell). Command dijalankan lewat `bash -i -c` agar alias dan
+    function shell tetap tersedia. File log disimpan di folder script.
+    """
+
+    stderr_noise = BASH_STDERR_NOISE
+
+    def __init__(self, output_file="terminal_log.txt", decode_errors=DEFAULT_DECODE_POLICY):
+        # Simpan file log di direktori yang sama dengan script
+        super().__init__(os.path.join(SCRIPT_DIR, output_file), decode_errors)
+        self.aliases = {}
+        # Peta ekspansi alias yang sudah di-resolve; None = perlu dibangun ulang
+        self.alias_closure = None
+        self.functions = {}
+        self.shell_config = self.detect_shell_config()
+        self.load_aliases()
+
+    def detect_shell_config(self):
+        """Mendeteksi file konfigurasi shell yang digunakan"""
+        # Untuk Windows, cek PowerShell profile
+        if IS_WINDOWS:
+            ps_profile = powershell_profile_paths()[0]
+            if os.path.exists(ps_profile):
+                return ps_profile
+
+        # Cari file config yang ada
+        for config in shell_config_paths():
+            if os.path.exists(config):
+                return config
+
+        return None
+
+    @tracing.traced("load aliases")
+    def load_aliases(self):
+        """Load aliases dari shell configuration files"""
+        print("Loading aliases...")
+        self.alias_closure = None
+
+        if not IS_WINDOWS:
+            self.load_bash_aliases()
+
+        # Manual parsing dari config file sebagai backup
+        if self.shell_config and os.path.exists(self.shell_config):
+            self.parse_bash_config(self.shell_config)
+
+    def load_bash_aliases(self, timeout=None):
+        """Load aliases dari output `alias` di bash interaktif"""
+        import subprocess
+
+        try:
+            result = subprocess.run(
+                'bash -i -c "alias"',
+                shell=True,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+
+            if result.stdout:
+                for line in result.stdout.strip().split("\n"):
+                    # Format: alias name='command'
+                    if "=" in line:
+                        name, command = parse_alias_definition(line.replace("alias ", "", 1))
+                        self.aliases[name] = command
+
+            print(f"Loaded {len(self.aliases)} bash aliases")
+
+        except subprocess.TimeoutExpired:
+            print("Bash command timed out")
+        except Exception as e:
+            print(f"Could not load bash aliases: {e}")
+
+    def parse_bash_config(self, config_path):
+        """Parse definisi alias dari file konfigurasi bash/zsh"""
+        try:
+            with open(config_path, "r", encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith("alias "):
+                        alias_def = line[6:].strip()
+                        if "=" in alias_def:
+                            name, command = parse_alias_definition(alias_def)
+                            self.aliases[name] = command
+
+            print(f"Parsed aliases from {os.path.basename(config_path)}")
+
+        except Exception as e:
+            print(f"Error reading {config_path}: {e}")
+
+    def get_alias_closure(self):
+        """Peta ekspansi alias, dibangun ulang hanya setelah alias berubah"""
+        if self.alias_closure is None:
+            self.alias_closure = build_alias_closure(self.aliases)
+        return self.alias_closure
+
+    def expand_aliases(self, command):
+        """Expand aliases dalam command (rantai alias di-resolve seperti bash)"""
+        expanded, names = expand_command(self.get_alias_closure(), command)
+        if names:
+            print(f"Expanding alias: {', '.join(names)} -> {expanded}")
+        return expanded
+
+    def shell_command(self, command, expanded_command):
+        if IS_WINDOWS:
+            return expanded_command, True
+        # Untuk Unix/Linux/Mac, gunakan bash dengan mode interaktif
+        # untuk memastikan aliases dan functions tersedia
+        return f'bash -i -c "{expanded_command}"', True
+
+    def format_stderr(self, stderr_output):
+        # Filter out warning bawaan shell interaktif
+        filtered_errors = [
+            line
+            for line in stderr_output.split("\n")
+            if line.strip() and not any(noise in line for noise in self.stderr_noise)
+        ]
+        if not filtered_errors:
+            return None
+        return f"ERROR: {chr(10).join(filtered_errors)}\n"
+
+    def log_startup_details(self):
+        # Log loaded aliases
+        if self.aliases:
+            self.write_log(f"Loaded {len(self.aliases)} aliases:\n")
+            for alias, cmd in self.aliases.items():
+                self.write_log(f"  {alias} = {cmd}\n")
+            self.write_log("\n")
+
+    def show_aliases(self):
+        """Menampilkan daftar aliases yang tersedia"""
+        if not self.aliases:
+            self.write_log("No aliases loaded.\n")
+        else:
+            self.write_log("Available aliases:\n")
+            for alias, cmd in sorted(self.aliases.items()):
+                self.write_log(f"  {alias:<15} = {cmd}\n")
+
+    def add_alias(self, alias_def):
+        """Menambahkan alias baru secara temporary"""
+        if not alias_def or "=" not in alias_def:
+            self.write_log("Format: alias name=command\n")
+            return
+
+        name, command = parse_alias_definition(alias_def)
+        if not name:
+            self.write_log("Error: Alias name cannot be empty\n")
+            return
+
+        self.aliases[name] = command
+        self.alias_closure = None
+        self.write_log(f"Alias added: {name} = {command}\n")
+
+    def reload_aliases(self):
+        """Membuang alias (termasuk yang temporary) lalu memuat ulang dari konfigurasi"""
+        self.aliases.clear()
+        self.functions.clear()
+        self.load_aliases()
+        self.write_log(f"Aliases reloaded. {len(self.aliases)} aliases available.\n")
+
+    def print_help(self):
+        print("Commands khusus:")
+        print("  'show aliases' - Tampilkan daftar aliases")
+        print("  'alias name=cmd' - Tambah alias temporary")
+        print("  'reload aliases' - Reload aliases dari config")
+        print("  'history [n]' - Tampilkan history (juga 'history search teks')")
+        print("  '!!', '!n', '!teks' - Ulangi command dari history")
+        print("  'cache on|off|stats|clear' - Cache output command read-only")
+        print("  'clear' - Bersihkan layar")
+        print("  'exit' atau 'quit' - Keluar\n")
+
+    def handle_builtin(self, command):
+        lowered = command.lower()
+        if lowered == "show aliases":
+            self.show_aliases()
+        elif lowered.startswith("alias "):
+            self.add_alias(command[6:])
+        elif lowered == "reload aliases":
+            self.reload_aliases()
+        else:
+            return super().handle_builtin(command)
+        return True
+
+
+class ProfileTerminalLogger(AliasTerminalLogger):
+    """
+    Varian alias yang juga memuat function shell dan, di Windows, alias serta
+    function PowerShell (dari PowerShell sendiri dan dari file profile).
+    Command dijalankan lewat PowerShell di Windows dan bash di sistem lain.
+    """
+
+    stderr_noise = BASH_STDERR_NOISE + POWERSHELL_STDERR_NOISE
+    log_success_return_code = False
+    interrupt_exits = False
+
+    def detect_shell_config(self):
+        """Mendeteksi semua file konfigurasi shell yang ada"""
+        configs_found = []
+
+        if IS_WINDOWS:
+            # Cek PowerShell profiles
+            for profile in powershell_profile_paths():
+                if os.path.exists(profile):
+                    configs_found.append(profile)
+                    print(f"Found PowerShell profile: {profile}")
+
+            # Cek juga Git Bash jika ada
+            git_bash_rc = shell_config_paths()[0]
+            if os.path.exists(git_bash_rc):
+                configs_found.append(git_bash_rc)
+                print(f"Found Git Bash config: {git_bash_rc}")
+
+        else:
+            # Unix/Linux/Mac
+            for config in shell_config_paths():
+                if os.path.exists(config):
+                    configs_found.append(config)
+                    print(f"Found shell config: {config}")
+
+        return configs_found
+
+    def load_powershell_aliases(self):
+        """Load aliases dan functions dari PowerShell"""
+        # json dan subprocess hanya dibutuhkan di Windows
+        import json
+        import subprocess
+
+        try:
+            # Get aliases dari PowerShell
+            ps_command = """
+            $aliases = @{}
+            Get-Alias | ForEach-Object {
+                $aliases[$_.Name] = $_.Definition
+            }
+
+            # Get custom functions
+            $functions = @{}
+            Get-Command -CommandType Function | Where-Object {
+                $_.Source -eq "" -and $_.Name -notlike "*:*"
+            } | ForEach-Object {
+                $functions[$_.Name] = $_.Definition
+            }
+
+            @{
+                Aliases = $aliases
+                Functions = $functions
+            } | ConvertTo-Json -Depth 3
+            """
+
+            result = subprocess.run(
+                ["powershell", "-NoProfile", "-Command", ps_command],
+                capture_output=True,
+                text=True,
+                shell=False,
+                timeout=10,  # Tambahkan timeout untuk menghindari hang
+            )
+
+            if result.stdout:
+                try:
+                    data = json.loads(result.stdout)
+
+                    # Load aliases
+                    if "Aliases" in data and data["Aliases"]:
+                        for name, definition in data["Aliases"].items():
+                            self.aliases[name] = definition
+                        print(f"Loaded {len(data['Aliases'])} PowerShell aliases")
+
+                    # Load functions (yang bisa berfungsi seperti aliases)
+                    if "Functions" in data and data["Functions"]:
+                        for name, definition in data["Functions"].items():
+                            # Skip built-in functions yang terlalu complex
+                            if len(str(definition)) < 500:  # Simple functions only
+                                self.functions[name] = definition
+                        print(f"Loaded {len(self.functions)} PowerShell functions")
+                except json.JSONDecodeError as e:
+                    print(f"Error parsing PowerShell output: {e}")
+
+        except subprocess.TimeoutExpired:
+            print("PowerShell command timed out")
+        except Exception as e:
+            print(f"Could not load PowerShell aliases: {e}")
+
+    def parse_powershell_profile(self, profile_path):
+        """Parse PowerShell profile untuk mencari alias dan function definitions"""
+        import re
+
+        try:
+            with open(profile_path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read()
+
+                # Pattern untuk Set-Alias dan New-Alias
+                for command in ("Set-Alias", "New-Alias"):
+                    alias_pattern = (
+                        command + r"\s+(?:-Name\s+)?([^\s]+)\s+(?:-Value\s+)?([^\s\n]+)"
+                    )
+                    for match in re.finditer(alias_pattern, content, re.IGNORECASE):
+                        name = match.group(1).strip("\"'")
+                        value = match.group(2).strip("\"'")
+                        self.aliases[name] = value
+
+                # Pattern untuk function definitions yang simple
+                func_pattern = r"function\s+([^\s\{]+)\s*\{([^\}]+)\}"
+                for match in re.finditer(func_pattern, content):
+                    name = match.group(1).strip()
+                    body = match.group(2).strip()
+                    # Hanya ambil function yang simple (one-liner)
+                    if "\n" not in body and len(body) < 200:
+                        self.functions[name] = body
+
+                print(
+                    f"Parsed {len(self.aliases)} aliases and {len(self.functions)} functions from {os.path.basename(profile_path)}"
+                )
+
+        except Exception as e:
+            print(f"Error parsing PowerShell profile {profile_path}: {e}")
+
+    @tracing.traced("load aliases")
+    def load_aliases(self):
+        """Load aliases dan functions dari shell configuration files"""
+        print("\nLoading aliases and functions...")
+        self.alias_closure = None
+
+        if IS_WINDOWS:
+            # Load dari PowerShell
+            self.load_powershell_aliases()
+
+            # Parse profile files jika ada
+            for config in self.shell_config:
+                if config.endswith(".ps1"):
+                    self.parse_powershell_profile(config)
+                elif os.path.basename(config) in [".bashrc", ".bash_profile"]:
+                    self.parse_bash_config(config)
+        else:
+            # Unix/Linux/Mac
+            self.load_bash_aliases(timeout=5)
+
+            for config in self.shell_config:
+                self.parse_bash_config(config)
+
+        print(
+            f"Total loaded: {len(self.aliases)} aliases, {len(self.functions)} functions\n"
+        )
+
+    def expand_aliases(self, command):
+        """Expand aliases dalam command; function shell dijalankan apa adanya"""
+        expanded = super().expand_aliases(command)
+        if expanded == command:
+            cmd_name = command.split(None, 1)[0] if command.strip() else ""
+            if cmd_name in self.functions:
+                print(f"Found function: {cmd_name}")
+        return expanded
+
+    def shell_command(self, command, expanded_command):
+        if not IS_WINDOWS:
+            return super().shell_command(command, expanded_command)
+        # Function PowerShell dijalankan dengan nama aslinya; selain itu command
+        # hasil ekspansi lewat PowerShell agar alias PowerShell tetap berlaku
+        cmd_name = command.split()[0] if command.split() else ""
+        if cmd_name in self.functions:
+            return ["powershell", "-Command", command], False
+        return ["powershell", "-Command", expanded_command], False
+
+    def log_startup_details(self):
+        import platform
+
+        self.write_log(f"Platform: {platform.system()} {platform.release()}\n")
+
+        # Log configuration files found
+        if self.shell_config:
+            self.write_log("Configuration files found:\n")
+            for config in self.shell_config:
+                self.write_log(f"  - {config}\n")
+
+        # Log loaded aliases
+        if self.aliases:
+            self.write_log(f"\nLoaded {len(self.aliases)} aliases:\n")
+            for alias, cmd in sorted(self.aliases.items())[:10]:  # Show first 10
+                self.write_log(f"  {alias} = {cmd}\n")
+            if len(self.aliases) > 10:
+                self.write_log(f"  ... and {len(self.aliases) - 10} more\n")
+
+        # Log loaded functions
+        if self.functions:
+            self.write_log(f"\nLoaded {len(self.functions)} functions:\n")
+            for func in sorted(self.functions.keys())[:10]:  # Show first 10
+                self.write_log(f"  {func}\n")
+            if len(self.functions) > 10:
+                self.write_log(f"  ... and {len(self.functions) - 10} more\n")
+
+        self.write_log("\n")
+
+    def show_aliases(self):
+        """Menampilkan daftar aliases dan functions yang tersedia"""
+        if not self.aliases and not self.functions:
+            self.write_log("No aliases or functions loaded.\n")
+            return
+
+        if self.aliases:
+            self.write_log(f"Available aliases ({len(self.aliases)}):\n")
+            for alias, cmd in sorted(self.aliases.items()):
+                self.write_log(
+                    f"  {alias:<20} = {cmd[:60]}{'...' if len(cmd) > 60 else ''}\n"
+                )
+
+        if self.functions:
+            self.write_log(f"\nAvailable functions ({len(self.functions)}):\n")
+            for func in sorted(self.functions.keys()):
+                self.write_log(f"  {func}\n")
+
+    def reload_aliases(self):
+        self.aliases.clear()
+        self.functions.clear()
+        self.load_aliases()
+        self.write_log(
+            f"Aliases reloaded. {len(self.aliases)} aliases, {len(self.functions)} functions available.\n"
+        )
+
+    def print_help(self):
+        print("\nCommands khusus:")
+        print("  'show aliases' - Tampilkan daftar aliases dan functions")
+        print("  'alias name=cmd' - Tambah alias temporary")
+        print("  'reload aliases' - Reload aliases dari config")
+        print("  'history [n]' - Tampilkan history (juga 'history search teks')")
+        print("  '!!', '!n', '!teks' - Ulangi command dari history")
+        print("  'cache on|off|stats|clear' - Cache output command read-only")
+        print("  'clear' - Bersihkan layar")
+        print("  'exit' atau 'quit' - Keluar")
+
+        if IS_WINDOWS:
+            print("\nNote: Menggunakan PowerShell untuk eksekusi commands")
+            print("PowerShell aliases dan functions sudah di-load")
+
+        print("-" * 50)
+
+
+def test_powershell_profile():
+    """Test function untuk cek PowerShell profile"""
+    import subprocess
+
+    print("=== Checking PowerShell Profile ===")
+
+    # Cek berbagai lokasi PowerShell profile
+    print("\nChecking profile locations:")
+    for profile in powershell_profile_paths(include_all_hosts=True):
+        exists = os.path.exists(profile)
+        print(f"  {'✓ EXISTS' if exists else '✗ NOT FOUND'}: {profile}")
+
+        if exists:
+            try:
+                size = os.path.getsize(profile)
+                print(f"         Size: {size} bytes")
+
+                # Baca beberapa baris pertama
+                with open(profile, "r", encoding="utf-8", errors="ignore") as f:
+                    lines = f.readlines()[:5]
+                    if lines:
+                        print(f"         First lines:")
+                        for line in lines:
+                            print(f"           {line.rstrip()[:60]}")
+            except Exception as e:
+                print(f"         Error reading: {e}")
+
+    # Cek PowerShell $PROFILE variable
+    print("\nChecking PowerShell $PROFILE variable:")
+    try:
+        result = subprocess.run(
+            ["powershell", "-NoProfile", "-Command", "$PROFILE"],
+            capture_output=True,
+            text=True,
+            shell=False,
+            timeout=5,
+        )
+        if result.stdout:
+            profile_path = result.stdout.strip()
+            print(f"  $PROFILE points to: {profile_path}")
+            if os.path.exists(profile_path):
+                print(f"  ✓ Profile exists at this location")
+            else:
+                print(f"  ✗ Profile does not exist at this location")
+    except subprocess.TimeoutExpired:
+        print(f"  PowerShell command timed out")
+    except Exception as e:
+        print(f"  Error checking $PROFILE: {e}")
+
+    print("\n" + "=" * 50 + "\n")
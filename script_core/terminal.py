@@ -0,0 +1,326 @@
+import os
+import sys
+import time
+
+from output_pipe import DEFAULT_DECODE_POLICY
+import tracing
+
+# Folder script (induk paket ini): tempat file log dan state terminal logger
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IS_WINDOWS = os.name == "nt"
+
+
+class TerminalLogger:
+    """
+    Terminal interaktif yang mencatat setiap command dan output-nya ke file log.
+    Subclass mengatur alias dan shell lewat expand_aliases(), shell_command(),
+    format_stderr() dan handle_builtin(); sisanya (log bytes, cache, history)
+    sama untuk semua varian.
+    """
+
+    # Varian yang hanya mencatat return code jika command gagal mengubah ini
+    log_success_return_code = True
+    # False: Ctrl+C hanya membatalkan input, bukan keluar dari terminal
+    interrupt_exits = True
+
+    def __init__(self, output_file="terminal_log.txt", decode_errors=DEFAULT_DECODE_POLICY):
+        self.output_file = output_file
+        self.log_file = None
+        # Kebijakan byte non-UTF-8 untuk echo ke layar; file log menyimpan byte asli
+        self.decode_errors = decode_errors
+        self.prefix_second = None
+        self.prefix = b""
+        self.history = None
+        # Cache hasil command read-only (opt-in lewat 'cache on')
+        self.command_cache = None
+        self.captured = None
+
+    def write_log(self, message):
+        """Menulis pesan ke file log dengan timestamp"""
+        if not message:
+            return
+
+        if self.log_file:
+            encoded = f"{message}\n".encode("utf-8", errors="replace")
+            try:
+                self.log_file.write(self.timestamp_prefix() + encoded)
+                self.log_file.flush()
+            except Exception as e:
+                print(f"Error writing to log: {e}")
+
+        if self.captured is not None:
+            self.captured.append(message)
+
+        print(message, end="")
+
+    def timestamp_prefix(self):
+        """Prefix '[timestamp] ' dalam bytes, diformat ulang hanya sekali per detik"""
+        now = int(time.time())
+        if now != self.prefix_second:
+            self.prefix_second = now
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            self.prefix = f"[{timestamp}] ".encode()
+        return self.prefix
+
+    def write_log_lines(self, region, lines):
+        """Menulis baris output mentah (bytes) ke log; decode hanya untuk echo ke layar"""
+        if self.log_file:
+            prefix = self.timestamp_prefix()
+            parts = []
+            for line in lines:
+                # Terminator asli (\n atau \r\n) dibuang: setiap baris log diakhiri satu \n
+                end = len(line)
+                if end and line[end - 1] == 0x0A:
+                    end -= 1
+                if end and line[end - 1] == 0x0D:
+                    end -= 1
+                parts += (prefix, line[:end], b"\n")
+            self.log_file.writelines(parts)
+            self.log_file.flush()
+
+        text = str(region, "utf-8", self.decode_errors)
+        if self.captured is not None:
+            self.captured.append(text)
+        sys.stdout.write(text)
+
+    def start_logging(self):
+        """Memulai logging ke file"""
+        try:
+            self.log_file = open(self.output_file, "wb")
+            self.write_log("=== Terminal Logging Started ===\n")
+            print(f"Logging dimulai. Output akan disimpan ke: {self.output_file}")
+            self.log_startup_details()
+            return True
+        except Exception as e:
+            print(f"Error membuka file log: {e}")
+            return False
+
+    def log_startup_details(self):
+        """Informasi tambahan di awal log (alias, konfigurasi shell) untuk subclass"""
+
+    def stop_logging(self):
+        """Menghentikan logging"""
+        if self.log_file:
+            try:
+                self.write_log("=== Terminal Logging Stopped ===\n")
+                self.log_file.close()
+            except Exception as e:
+                print(f"Error closing log file: {e}")
+            finally:
+                self.log_file = None
+
+    def expand_aliases(self, command):
+        """Command setelah ekspansi alias; tanpa dukungan alias command tidak berubah"""
+        return command
+
+    def shell_command(self, command, expanded_command):
+        """(args, shell) untuk Popen"""
+        return expanded_command, True
+
+    def format_stderr(self, stderr_output):
+        """Pesan log untuk stderr command, atau None jika tidak ada yang perlu dicatat"""
+        return f"ERROR: {stderr_output}"
+
+    @tracing.traced("TerminalLogger.run_command")
+    def run_command(self, command):
+        """Menjalankan command dan mencatat output"""
+        if not command:
+            return
+
+        # Baru dibutuhkan saat command pertama dijalankan, bukan saat startup
+        import subprocess
+        from output_pipe import drain_in_background, iter_line_batches
+
+        try:
+            expanded_command = self.expand_aliases(command)
+
+            self.write_log(f"$ {command}\n")
+            if expanded_command != command:
+                self.write_log(f"  (expanded to: {expanded_command})\n")
+
+            # Command read-only yang sudah di-cache: output diputar ulang tanpa dijalankan
+            cache_key = None
+            if self.command_cache is not None:
+                cache_key, cached = self.command_cache.lookup(expanded_command)
+                if cached is not None:
+                    self.replay_cached(cached)
+                    return
+                if cache_key is not None:
+                    self.captured = []
+            started = time.perf_counter()
+
+            # Menjalankan command
+            args, use_shell = self.shell_command(command, expanded_command)
+            with tracing.span("spawn process", category="process"):
+                process = subprocess.Popen(
+                    args,
+                    shell=use_shell,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    bufsize=0,
+                )
+
+            # stderr dikuras di thread terpisah agar proses anak tidak terblok
+            stderr_thread, stderr_buffer = drain_in_background(process.stderr)
+
+            # Membaca output per chunk besar sebagai bytes; baris dipotong tanpa salinan
+            with tracing.span("drain stdout", category="process"):
+                first_output = True
+                for region, lines in iter_line_batches(process.stdout):
+                    if first_output:
+                        tracing.instant("first output", category="process")
+                        first_output = False
+                    self.write_log_lines(region, lines)
+                process.wait()
+
+            # Membaca error jika ada
+            with tracing.span("drain stderr", category="process"):
+                stderr_thread.join()
+                stderr_output = str(stderr_buffer, "utf-8", self.decode_errors)
+            if stderr_output:
+                message = self.format_stderr(stderr_output)
+                if message:
+                    self.write_log(message)
+
+            return_code = process.poll()
+            if return_code != 0 or self.log_success_return_code:
+                self.write_log(f"Command finished with return code: {return_code}\n")
+            if self.captured is not None:
+                captured, self.captured = self.captured, None
+                duration = time.perf_counter() - started
+                self.command_cache.store(cache_key, expanded_command, captured, return_code, duration)
+
+        except Exception as e:
+            self.write_log(f"Error executing command: {e}\n")
+        finally:
+            self.captured = None
+
+    def replay_cached(self, entry):
+        """Memutar ulang output command dari cache ke log, ditandai sebagai cached"""
+        age = time.time() - entry["created"]
+        self.write_log(f"  (cached {age:.0f}s lalu, run asli {entry['duration']:.1f}s)\n")
+        for message in entry["messages"]:
+            self.write_log(message)
+
+    def handle_cache_command(self, argument):
+        """Perintah 'cache on|off|stats|clear' untuk memo hasil command read-only"""
+        action = argument.strip().lower()
+        if action == "on":
+            if self.command_cache is None:
+                # hashlib/json baru dimuat jika cache benar-benar diaktifkan
+                from command_cache import CommandCache
+
+                try:
+                    self.command_cache = CommandCache()
+                except ValueError as e:
+                    self.write_log(f"Error membaca aturan cache: {e}\n")
+                    return
+            prefixes = ", ".join(rule["prefix"] for rule in self.command_cache.rules)
+            self.write_log(f"Cache command aktif untuk: {prefixes}\n")
+        elif action == "off":
+            self.command_cache = None
+            self.write_log("Cache command dimatikan.\n")
+        elif action in ("stats", "clear"):
+            if self.command_cache is None:
+                self.write_log("Cache command tidak aktif. Gunakan 'cache on'.\n")
+            elif action == "clear":
+                self.command_cache.clear()
+                self.write_log("Cache command dikosongkan.\n")
+            else:
+                self.write_log(f"{self.command_cache.format_stats()}\n")
+        else:
+            self.write_log("Format: cache on|off|stats|clear\n")
+
+    def open_history(self):
+        """Membuka history command persisten; indeks pencarian dibangun di background"""
+        from command_history import CommandHistory
+
+        try:
+            self.history = CommandHistory()
+            self.history.warm_up()
+        except OSError as e:
+            print(f"History tidak dapat dibuka: {e}")
+            self.history = None
+
+    def recall_history(self, command):
+        """Ekspansi !!, !n, !-n, !teks dan !?teks lalu simpan command ke history"""
+        if self.history is None or not command:
+            return command
+        expanded, error = self.history.expand(command)
+        if error:
+            self.write_log(f"{error}\n")
+            return None
+        if expanded != command:
+            # Seperti bash, command hasil ekspansi ditampilkan sebelum dijalankan
+            print(expanded)
+        try:
+            self.history.append(expanded)
+        except OSError as e:
+            print(f"History tidak dapat disimpan: {e}")
+        return expanded
+
+    def show_history(self, argument):
+        """Menampilkan history: 'history [n]', 'history search teks', 'history prefix teks'"""
+        if self.history is None:
+            self.write_log("History tidak tersedia.\n")
+            return
+        from command_history import history_builtin
+
+        for line in history_builtin(self.history, argument):
+            self.write_log(f"{line}\n")
+
+    def print_help(self):
+        """Daftar command khusus yang ditampilkan saat terminal interaktif dimulai"""
+
+    def handle_builtin(self, command):
+        """Menjalankan command khusus terminal; True jika command sudah ditangani"""
+        lowered = command.lower()
+        if lowered == "cache" or lowered.startswith("cache "):
+            self.handle_cache_command(command[5:])
+        elif lowered == "history" or lowered.startswith("history "):
+            self.show_history(command[7:])
+        elif lowered == "clear":
+            # Clear screen tapi tetap log
+            os.system("cls" if IS_WINDOWS else "clear")
+            self.write_log("Screen cleared\n")
+        else:
+            return False
+        return True
+
+    def interactive_terminal(self):
+        """Terminal interaktif yang mencatat semua aktivitas"""
+        print("\n=== Terminal Interaktif (ketik 'exit' untuk keluar) ===")
+        print("Semua command dan output akan dicatat ke file log.")
+        self.print_help()
+
+        self.open_history()
+
+        while True:
+            try:
+                # Input command dari user
+                command = input("\n$ ").strip()
+                # Ekspansi history (!!, !n, ...) sebelum command diproses
+                command = self.recall_history(command)
+                if command is None or command == "":
+                    continue
+
+                if command.lower() in ["exit", "quit"]:
+                    self.write_log("User exited terminal\n")
+                    break
+                if self.handle_builtin(command):
+                    continue
+
+                # Jalankan command dan catat hasilnya
+                self.run_command(command)
+
+            except KeyboardInterrupt:
+                self.write_log("\nKeyboard interrupt received\n")
+                if self.interrupt_exits:
+                    break
+                print("\nUse 'exit' to quit properly")
+            except EOFError:
+                self.write_log("\nEOF received\n")
+                break
+            except Exception as e:
+                self.write_log(f"Error in interactive terminal: {e}\n")
+                print(f"Error: {e}")
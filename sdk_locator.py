@@ -0,0 +1,271 @@
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+import tracing
+
+CACHE_FILE_NAME = ".sdk_locator_cache.json"
+CACHE_VERSION = 2
+
+# Lokasi umum SDK jika executable tidak ada di PATH
+COMMON_PATHS = {
+    'dart': [
+        os.path.expanduser('~/flutter/bin/dart'),
+        os.path.expanduser('~/AppData/Local/Pub/Cache/bin/dart'),
+        'C:/flutter/bin/dart',
+        'C:/flutter/bin/dart.exe',
+        os.path.expanduser('~/flutter/bin/dart.exe'),
+    ],
+    'flutter': [
+        os.path.expanduser('~/flutter/bin/flutter'),
+        os.path.expanduser('~/AppData/Local/Pub/Cache/bin/flutter'),
+        'C:/flutter/bin/flutter',
+        'C:/flutter/bin/flutter.exe',
+        os.path.expanduser('~/flutter/bin/flutter.exe'),
+    ],
+}
+
+# Hasil pencarian di proses ini; cache disk hanya dibaca sekali per proses
+_memo = {}
+_disk_cache = None
+# flutter_sdk_matrix memanggil dari beberapa thread: load/ubah/simpan cache harus berurutan
+_lock = threading.RLock()
+# Lokasi cache disk pengganti (dipakai measure_startup agar cache asli tidak disentuh)
+_cache_path_override = None
+
+
+def cache_path():
+    """Cache disk disimpan di samping script."""
+    if _cache_path_override is not None:
+        return _cache_path_override
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), CACHE_FILE_NAME)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_disk_cache():
+    global _disk_cache
+    if _disk_cache is None:
+        try:
+            with open(cache_path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if data.get('version') != CACHE_VERSION or data.get('path_env') != os.environ.get('PATH', ''):
+            # PATH berubah: semua hasil pencarian lama tidak berlaku
+            data = {'version': CACHE_VERSION, 'path_env': os.environ.get('PATH', ''),
+                    'executables': {}, 'sdk_versions': {}}
+        _disk_cache = data
+    return _disk_cache
+
+
+def _save_disk_cache():
+    # File sementara per proses: beberapa script bisa menyimpan cache bersamaan
+    tmp_path = f"{cache_path()}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_disk_cache, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path())
+    except OSError:
+        # Cache hanya optimasi; folder read-only tidak boleh menggagalkan script
+        pass
+
+
+def _search_dirs_valid(entry):
+    """
+    Entry cache valid jika folder PATH sebelum lokasi hasil (dan untuk hasil
+    kosong, juga lokasi umum) tidak berubah isinya.
+    """
+    for directory, mtime in entry['dirs']:
+        if _mtime(directory) != mtime:
+            return False
+    return entry['path'] is None or _mtime(entry['path']) == entry['mtime']
+
+
+def _search(name):
+    """Pencarian sebenarnya: PATH lalu lokasi umum. Mengembalikan entry cache."""
+    path = shutil.which(name)
+    if path is None:
+        path = next((p for p in COMMON_PATHS.get(name, ()) if os.path.isfile(p)), None)
+
+    # mtime folder PATH yang diperiksa sebelum hasil ditemukan; file baru di salah
+    # satu folder ini bisa mengubah hasil pencarian
+    dirs = []
+    found_dir = os.path.dirname(path) if path else None
+    for directory in os.environ.get('PATH', '').split(os.pathsep):
+        if not directory:
+            continue
+        dirs.append((directory, _mtime(directory)))
+        if found_dir and os.path.normcase(os.path.abspath(directory)) == os.path.normcase(found_dir):
+            break
+    if path is None:
+        # Tidak ditemukan: SDK yang nanti diinstall di lokasi umum juga harus terdeteksi.
+        # Folder yang belum ada tercatat dengan mtime None dan ikut berubah saat dibuat.
+        for candidate in COMMON_PATHS.get(name, ()):
+            for watched in (os.path.dirname(candidate), candidate):
+                if all(watched != directory for directory, _ in dirs):
+                    dirs.append((watched, _mtime(watched)))
+    return {'path': path, 'mtime': _mtime(path) if path else None, 'dirs': dirs}
+
+
+def find_executable(name):
+    """
+    Mencari executable SDK (dart/flutter). Hasil disimpan di memori proses dan di
+    cache disk dengan kunci PATH dan mtime, sehingga panggilan berikutnya hanya
+    beberapa stat tanpa menjelajah PATH. Hasil kosong tidak disimpan di memori:
+    proses yang berjalan lama (daemon auto_fixer) tetap melihat SDK yang baru diinstall.
+    """
+    if name in _memo:
+        return _memo[name]
+
+    with _lock, tracing.span('sdk lookup', executable=name) as span:
+        cache = _load_disk_cache()
+        entry = cache['executables'].get(name)
+        if entry is None or not _search_dirs_valid(entry):
+            entry = _search(name)
+            cache['executables'][name] = entry
+            _save_disk_cache()
+            span.set(source='search')
+        else:
+            span.set(source='disk cache')
+
+    if entry['path'] is not None:
+        _memo[name] = entry['path']
+    return entry['path']
+
+
+def find_dart_executable():
+    """Mencari lokasi executable dart."""
+    return find_executable('dart')
+
+
+def find_flutter_executable():
+    """Mencari lokasi executable flutter."""
+    return find_executable('flutter')
+
+
+def _sdk_version_files(flutter_executable):
+    sdk_root = os.path.dirname(os.path.dirname(os.path.realpath(flutter_executable)))
+    return (os.path.join(sdk_root, 'bin', 'cache', 'flutter.version.json'),
+            os.path.join(sdk_root, 'version'))
+
+
+def _read_sdk_version(flutter_executable):
+    version_json, version_file = _sdk_version_files(flutter_executable)
+    try:
+        with open(version_json, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return f"{data.get('frameworkVersion')}+{data.get('frameworkRevision')}"
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(version_file, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        pass
+    # Fallback: path dan mtime executable sudah cukup untuk mendeteksi upgrade
+    try:
+        return f"{flutter_executable}@{os.path.getmtime(flutter_executable)}"
+    except OSError:
+        return flutter_executable
+
+
+def read_flutter_sdk_version(flutter_executable):
+    """
+    Versi Flutter SDK dibaca dari file di dalam SDK tanpa menjalankan flutter.
+    Di-cache dengan kunci mtime file versi dan executable; cocok dipakai sebagai
+    bagian kunci cache lain.
+    """
+    memo_key = ('version', flutter_executable)
+    if memo_key in _memo:
+        return _memo[memo_key]
+
+    stamp = [_mtime(path) for path in _sdk_version_files(flutter_executable)]
+    stamp.append(_mtime(flutter_executable))
+    with _lock:
+        cache = _load_disk_cache()
+        entry = cache['sdk_versions'].get(flutter_executable)
+        if entry is None or entry['stamp'] != stamp:
+            entry = {'stamp': stamp, 'version': _read_sdk_version(flutter_executable)}
+            cache['sdk_versions'][flutter_executable] = entry
+            _save_disk_cache()
+
+    _memo[memo_key] = entry['version']
+    return entry['version']
+
+
+def reset_memo():
+    """Melupakan hasil di memori proses (cache disk tetap divalidasi ulang)."""
+    global _disk_cache
+    with _lock:
+        _memo.clear()
+        _disk_cache = None
+
+
+def measure_startup(repeat=200):
+    """
+    Mengukur biaya pencarian SDK: tanpa cache, cache disk, dan memo proses (ms).
+    Pengukuran memakai file cache sementara; cache milik user tidak dihapus.
+    """
+    global _cache_path_override
+
+    def timed(prepare):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            prepare()
+            flutter = find_flutter_executable()
+            find_dart_executable()
+            if flutter:
+                read_flutter_sdk_version(flutter)
+        return (time.perf_counter() - started) / repeat * 1000
+
+    def cold():
+        reset_memo()
+        try:
+            os.remove(cache_path())
+        except OSError:
+            pass
+
+    import tempfile
+
+    temp_dir = tempfile.mkdtemp(prefix='sdk_locator_')
+    previous_override = _cache_path_override
+    _cache_path_override = os.path.join(temp_dir, CACHE_FILE_NAME)
+    try:
+        reset_memo()
+        results = {
+            'cold_ms': timed(cold),
+            'disk_cache_ms': timed(reset_memo),
+            'memo_ms': timed(lambda: None),
+        }
+    finally:
+        _cache_path_override = previous_override
+        reset_memo()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    """Menampilkan hasil pencarian SDK dan biaya startup-nya."""
+    flutter = find_flutter_executable()
+    dart = find_dart_executable()
+    print(f"flutter: {flutter or '-'}")
+    print(f"dart:    {dart or '-'}")
+    if flutter:
+        print(f"versi:   {read_flutter_sdk_version(flutter)}")
+    if '--measure' in sys.argv[1:]:
+        for label, value in measure_startup().items():
+            print(f"{label:14} {value:8.4f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
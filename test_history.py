@@ -0,0 +1,262 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+from dart_import_graph import INDEX_FILE_NAME, ImportGraphIndex, dependency_closure
+
+HISTORY_FILE_NAME = "flutter_test_history.sqlite3"
+# Jumlah hasil test yang dikumpulkan sebelum ditulis sekaligus ke database
+INSERT_BATCH_SIZE = 500
+# Jumlah run terakhir yang dipakai untuk rata-rata durasi
+RECENT_RUNS = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    git_rev TEXT,
+    command TEXT,
+    return_code INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    suite TEXT NOT NULL,
+    name TEXT NOT NULL,
+    content_hash TEXT,
+    status TEXT NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    attempt INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS suite_durations (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    suite TEXT NOT NULL,
+    duration_ms INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_test ON results(suite, name, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS idx_results_flaky ON results(suite, name, content_hash, status);
+CREATE INDEX IF NOT EXISTS idx_suite_durations ON suite_durations(suite, run_id);
+"""
+
+
+def git_revision(project_root):
+    """Commit HEAD saat ini (None jika bukan repo git)."""
+    head_path = os.path.join(project_root, '.git', 'HEAD')
+    try:
+        with open(head_path, 'r', encoding='utf-8') as f:
+            head = f.read().strip()
+        if head.startswith('ref: '):
+            with open(os.path.join(project_root, '.git', head[5:]), 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        return head
+    except OSError:
+        return None
+
+
+def compute_content_hashes(project_root, script_dir, test_files):
+    """
+    Hash isi setiap file test beserta semua file yang di-import-nya (transitif).
+    Dua run dengan hash sama menjalankan kode yang sama, sehingga hasil yang
+    berbeda menandakan test flaky.
+    """
+    index = ImportGraphIndex(os.path.join(script_dir, INDEX_FILE_NAME), project_root)
+    index.load()
+    index.update()
+    try:
+        index.save()
+    except OSError:
+        pass
+    graph = index.graph()
+
+    file_hashes = {}
+
+    def file_hash(rel_path):
+        if rel_path not in file_hashes:
+            try:
+                with open(os.path.join(project_root, rel_path), 'rb') as f:
+                    file_hashes[rel_path] = hashlib.blake2b(f.read(), digest_size=16).digest()
+            except OSError:
+                file_hashes[rel_path] = b''
+        return file_hashes[rel_path]
+
+    content_hashes = {}
+    for test_file in test_files:
+        digest = hashlib.blake2b(digest_size=12)
+        for rel_path in sorted(dependency_closure(graph, test_file)):
+            digest.update(rel_path.encode('utf-8'))
+            digest.update(file_hash(rel_path))
+        content_hashes[test_file] = digest.hexdigest()
+    return content_hashes
+
+
+class TestHistory:
+    """Database SQLite berisi durasi dan hasil setiap test dari semua run."""
+
+    def __init__(self, path):
+        self.path = path
+        # Hasil test ditulis dari thread shard; akses diserialisasi oleh TestReport
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self.run_id = None
+
+    def close(self):
+        self.connection.close()
+
+    def start_run(self, project_root, command):
+        cursor = self.connection.execute(
+            "INSERT INTO runs (started_at, git_rev, command) VALUES (?, ?, ?)",
+            (time.time(), git_revision(project_root), command)
+        )
+        self.connection.commit()
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def finish_run(self, return_code):
+        self.connection.execute(
+            "UPDATE runs SET finished_at = ?, return_code = ? WHERE id = ?",
+            (time.time(), return_code, self.run_id)
+        )
+        self.connection.commit()
+
+    def writer(self, content_hashes, attempt=1):
+        """Writer untuk TestReport yang mencatat setiap hasil test ke database."""
+        return HistoryWriter(self, content_hashes, attempt)
+
+    def record_suite_durations(self, durations):
+        """Menyimpan durasi per file test (detik) dari run saat ini."""
+        self.connection.executemany(
+            "INSERT INTO suite_durations (run_id, suite, duration_ms) VALUES (?, ?, ?)",
+            [(self.run_id, suite, int(seconds * 1000)) for suite, seconds in durations.items()]
+        )
+        self.connection.commit()
+
+    def suite_durations(self, recent_runs=RECENT_RUNS):
+        """Rata-rata durasi per file test (detik) dari beberapa run terakhir, untuk shard."""
+        rows = self.connection.execute(
+            """
+            SELECT suite, AVG(duration_ms) FROM suite_durations
+            WHERE run_id > (SELECT COALESCE(MAX(id), 0) FROM runs) - ?
+            GROUP BY suite
+            """,
+            (recent_runs,)
+        )
+        return {suite: avg_ms / 1000 for suite, avg_ms in rows}
+
+    def slowest_tests(self, limit=20, recent_runs=RECENT_RUNS):
+        """Test dengan rata-rata durasi terbesar di beberapa run terakhir."""
+        return self.connection.execute(
+            """
+            SELECT suite, name, AVG(duration_ms) AS avg_ms, COUNT(*) AS samples
+            FROM results
+            WHERE run_id > (SELECT COALESCE(MAX(id), 0) FROM runs) - ? AND status = 'passed'
+            GROUP BY suite, name
+            ORDER BY avg_ms DESC
+            LIMIT ?
+            """,
+            (recent_runs, limit)
+        ).fetchall()
+
+    def slowing_tests(self, limit=20, window=5, min_ratio=1.2, min_ms=20):
+        """
+        Test yang makin lambat: rata-rata `window` run terakhir dibanding `window`
+        run sebelumnya.
+        """
+        return self.connection.execute(
+            """
+            WITH bounds AS (SELECT COALESCE(MAX(id), 0) AS latest FROM runs),
+            windowed AS (
+                SELECT suite, name,
+                       AVG(CASE WHEN run_id > latest - ? THEN duration_ms END) AS recent_ms,
+                       AVG(CASE WHEN run_id <= latest - ? THEN duration_ms END) AS older_ms
+                FROM results, bounds
+                WHERE run_id > latest - ? AND status = 'passed'
+                GROUP BY suite, name
+            )
+            SELECT suite, name, older_ms, recent_ms FROM windowed
+            WHERE older_ms IS NOT NULL AND recent_ms >= ? AND recent_ms > older_ms * ?
+            ORDER BY recent_ms - older_ms DESC
+            LIMIT ?
+            """,
+            (window, window, window * 2, min_ms, min_ratio, limit)
+        ).fetchall()
+
+    def flaky_tests(self, limit=50):
+        """Test yang pernah lulus dan gagal pada content hash yang sama."""
+        return self.connection.execute(
+            """
+            SELECT suite, name, content_hash,
+                   SUM(status = 'passed') AS passed,
+                   SUM(status IN ('failed', 'error')) AS failed
+            FROM results
+            WHERE content_hash IS NOT NULL
+            GROUP BY suite, name, content_hash
+            HAVING passed > 0 AND failed > 0
+            ORDER BY failed DESC
+            LIMIT ?
+            """,
+            (limit,)
+        ).fetchall()
+
+    def format_report(self, limit=20):
+        """Laporan teks: test terlambat, makin lambat, dan flaky."""
+        run_count = self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        lines = [f"Flutter Test History ({run_count} run tercatat)", ""]
+
+        lines.append("="*60)
+        lines.append("TEST TERLAMBAT:")
+        lines.append("="*60)
+        for suite, name, avg_ms, samples in self.slowest_tests(limit):
+            lines.append(f"{avg_ms:9.0f} ms  ({samples}x)  {suite}: {name}")
+
+        lines.append("")
+        lines.append("="*60)
+        lines.append("TEST YANG MAKIN LAMBAT:")
+        lines.append("="*60)
+        for suite, name, older_ms, recent_ms in self.slowing_tests(limit):
+            lines.append(f"{older_ms:7.0f} -> {recent_ms:7.0f} ms  {suite}: {name}")
+
+        lines.append("")
+        lines.append("="*60)
+        lines.append("TEST FLAKY (lulus dan gagal pada kode yang sama):")
+        lines.append("="*60)
+        for suite, name, content_hash, passed, failed in self.flaky_tests(limit):
+            lines.append(f"{passed:4} lulus {failed:4} gagal  [{content_hash[:8]}]  {suite}: {name}")
+
+        return "\n".join(lines) + "\n"
+
+
+class HistoryWriter:
+    """Writer TestReport yang menulis hasil test ke SQLite secara batch."""
+
+    def __init__(self, history, content_hashes, attempt=1):
+        self.history = history
+        self.content_hashes = content_hashes
+        self.attempt = attempt
+        self.pending = []
+
+    def write_raw(self, line):
+        pass
+
+    def write(self, record):
+        self.pending.append((
+            self.history.run_id, record['suite'], record['name'],
+            self.content_hashes.get(record['suite']), record['status'],
+            record['duration'], record.get('attempt', self.attempt),
+        ))
+        if len(self.pending) >= INSERT_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.history.connection.executemany(
+                "INSERT INTO results (run_id, suite, name, content_hash, status, duration_ms, attempt) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self.pending
+            )
+            self.history.connection.commit()
+            self.pending = []
+
+    def close(self, summary):
+        self.flush()
@@ -0,0 +1,337 @@
+import json
+import os
+import re
+import threading
+
+TEXT_REPORT_NAME = "flutter_test_results.txt"
+JSONL_REPORT_NAME = "flutter_test_results.jsonl"
+JUNIT_REPORT_NAME = "flutter_test_results.xml"
+
+# Pesan error sangat panjang dipotong agar memori dan ukuran laporan tetap terbatas
+MAX_ERROR_CHARS = 8000
+# Jumlah test gagal yang disimpan namanya (untuk retry dan ringkasan); sisanya hanya dihitung
+MAX_TRACKED_FAILURES = 1000
+# Ruang yang dipesan di tag <testsuite> untuk atribut ringkasan yang ditulis terakhir
+JUNIT_SUMMARY_WIDTH = 160
+
+INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+STATUS_BY_RESULT = {'success': 'passed', 'failure': 'failed', 'error': 'error'}
+
+
+def truncate(text, limit=MAX_ERROR_CHARS):
+    """Memotong teks panjang dan menandai bagian yang dibuang."""
+    if text is None or len(text) <= limit:
+        return text
+    return text[:limit] + f"\n... ({len(text) - limit} karakter dipotong)"
+
+
+class TextReportWriter:
+    """Laporan teks yang mudah dibaca, ditulis per test saat test selesai."""
+
+    SYMBOLS = {'passed': 'PASS ', 'failed': 'FAIL ', 'error': 'ERROR', 'skipped': 'SKIP '}
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write_raw(self, line):
+        self.file.write(line.rstrip('\n') + "\n")
+
+    def write(self, record):
+        retry = f"[retry {record['attempt'] - 1}] " if record.get('attempt', 1) > 1 else ""
+        self.file.write(f"{self.SYMBOLS[record['status']]} {retry}{record['suite']}: "
+                        f"{record['name']} ({record['duration']} ms)\n")
+        if record.get('error'):
+            for line in record['error'].rstrip().splitlines():
+                self.file.write(f"      {line}\n")
+
+    def close(self, summary):
+        self.file.write("\n" + "="*60 + "\n")
+        self.file.write(f"Total: {summary['total']}  Passed: {summary['passed']}  "
+                        f"Failed: {summary['failed']}  Errors: {summary['error']}  "
+                        f"Skipped: {summary['skipped']}  Flaky: {summary['flaky']}\n")
+        self.file.close()
+
+
+class JsonlWriter:
+    """Satu baris JSON per test yang selesai."""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write_raw(self, line):
+        pass
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self, summary):
+        self.file.write(json.dumps({'summary': summary}) + "\n")
+        self.file.close()
+
+
+class JunitXmlWriter:
+    """
+    Laporan JUnit XML yang ditulis secara streaming. Atribut jumlah test baru
+    diketahui di akhir, jadi ruangnya dipesan di tag pembuka lalu ditimpa saat close.
+    Test yang gagal (paling banyak MAX_TRACKED_FAILURES) baru ditulis saat close
+    agar yang lulus saat retry tercatat dengan hasil akhirnya.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.file.write(b'<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n'
+                        b'  <testsuite name="flutter_test"')
+        self.summary_offset = self.file.tell()
+        self.file.write(b' ' * JUNIT_SUMMARY_WIDTH + b'>\n')
+        self.pending_failures = {}
+
+    @staticmethod
+    def _clean(text):
+        return INVALID_XML_CHARS.sub('', text)
+
+    def write_raw(self, line):
+        pass
+
+    def write(self, record):
+        key = (record['suite'], record['name'])
+        if record.get('attempt', 1) > 1:
+            # Retry tidak menjadi testcase baru; test yang lulus saat retry ditulis
+            # dengan hasil akhirnya (lulus, dengan catatan flaky)
+            pending = self.pending_failures.get(key)
+            if pending is not None and record['status'] == 'passed':
+                note = (f"Flaky: gagal pada percobaan pertama, lulus pada retry {record['attempt'] - 1}.\n"
+                        f"{pending.get('error') or ''}")
+                self.pending_failures[key] = dict(record, note=note.rstrip())
+            return
+        if (record['status'] in ('failed', 'error') and key not in self.pending_failures
+                and len(self.pending_failures) < MAX_TRACKED_FAILURES):
+            # Ditahan sampai close: retry masih bisa mengubah hasil akhirnya
+            self.pending_failures[key] = record
+            return
+        self._write_testcase(record)
+
+    def _write_testcase(self, record):
+        # Di-import di sini: xml.sax.saxutils ikut memuat urllib/http/ssl saat startup
+        from xml.sax.saxutils import escape, quoteattr
+
+        attrs = (f"classname={quoteattr(self._clean(record['suite']))} "
+                 f"name={quoteattr(self._clean(record['name']))} "
+                 f"time=\"{record['duration'] / 1000:.3f}\"")
+        status = record['status']
+        if status == 'passed' and record.get('note'):
+            element = (f"    <testcase {attrs}><system-out>{escape(self._clean(record['note']))}"
+                       f"</system-out></testcase>\n")
+        elif status == 'passed':
+            element = f"    <testcase {attrs}/>\n"
+        elif status == 'skipped':
+            element = f"    <testcase {attrs}><skipped/></testcase>\n"
+        else:
+            tag = 'failure' if status == 'failed' else 'error'
+            error = self._clean(record.get('error') or '')
+            message = error.splitlines()[0] if error else status
+            element = (f"    <testcase {attrs}><{tag} message={quoteattr(message[:200])}>"
+                       f"{escape(error)}</{tag}></testcase>\n")
+        self.file.write(element.encode('utf-8'))
+
+    def close(self, summary):
+        for record in self.pending_failures.values():
+            self._write_testcase(record)
+        self.pending_failures.clear()
+        self.file.write(b'  </testsuite>\n</testsuites>\n')
+        attrs = (f" tests=\"{summary['total']}\" failures=\"{summary['failed']}\" "
+                 f"errors=\"{summary['error']}\" skipped=\"{summary['skipped']}\" "
+                 f"time=\"{summary['duration'] / 1000:.3f}\"")
+        self.file.seek(self.summary_offset)
+        self.file.write(attrs.ljust(JUNIT_SUMMARY_WIDTH).encode('utf-8'))
+        self.file.close()
+
+
+class TestReport:
+    """
+    Menyalurkan hasil test ke semua writer. Aman dipakai dari beberapa thread
+    (satu parser per shard). Yang disimpan di memori hanya ringkasan dan nama
+    paling banyak MAX_TRACKED_FAILURES test gagal; kelebihannya dihitung di
+    `failures_omitted`.
+    """
+
+    def __init__(self, writers):
+        self.writers = writers
+        self.lock = threading.Lock()
+        self.summary = {'total': 0, 'passed': 0, 'failed': 0, 'error': 0, 'skipped': 0,
+                        'flaky': 0, 'duration': 0}
+        self.failures = []
+        self.failures_omitted = 0
+        # Status percobaan pertama test gagal yang dilacak, untuk mengoreksi ringkasan saat flaky
+        self.failure_status = {}
+
+    def raw(self, line):
+        with self.lock:
+            for writer in self.writers:
+                writer.write_raw(line)
+
+    def record(self, record):
+        with self.lock:
+            self.summary['total'] += 1
+            self.summary[record['status']] += 1
+            self.summary['duration'] += record['duration']
+            if record['status'] in ('failed', 'error'):
+                if len(self.failures) < MAX_TRACKED_FAILURES:
+                    self.failures.append((record['suite'], record['name']))
+                    self.failure_status[(record['suite'], record['name'])] = record['status']
+                else:
+                    self.failures_omitted += 1
+            for writer in self.writers:
+                writer.write(record)
+
+    def record_retry(self, record):
+        """Mencatat hasil retry ke semua writer tanpa mengubah jumlah test di ringkasan."""
+        with self.lock:
+            for writer in self.writers:
+                writer.write(record)
+
+    def mark_flaky(self, suite, name):
+        """
+        Test yang gagal lalu lulus saat retry ditandai flaky: di ringkasan dipindah
+        dari jumlah gagal/error percobaan pertama ke jumlah lulus.
+        """
+        with self.lock:
+            status = self.failure_status.pop((suite, name))
+            self.summary[status] -= 1
+            self.summary['passed'] += 1
+            self.summary['flaky'] += 1
+            self.failures.remove((suite, name))
+
+    def close(self):
+        with self.lock:
+            for writer in self.writers:
+                writer.close(self.summary)
+
+
+class RetryCollector:
+    """
+    Writer untuk run retry: hanya meneruskan hasil test yang memang sedang di-retry
+    (--plain-name bisa ikut menjalankan test lain dengan nama mirip).
+    """
+
+    def __init__(self, report, targets, attempt):
+        self.report = report
+        self.targets = targets
+        self.attempt = attempt
+        self.passed = set()
+
+    def write_raw(self, line):
+        pass
+
+    def write(self, record):
+        key = (record['suite'], record['name'])
+        if key not in self.targets:
+            return
+        record['attempt'] = self.attempt
+        self.report.record_retry(record)
+        if record['status'] == 'passed':
+            self.passed.add(key)
+
+    def close(self, summary):
+        pass
+
+
+def open_report(output_dir, extra_writers=()):
+    """Membuat TestReport dengan laporan teks, JSONL dan JUnit XML di `output_dir`."""
+    return TestReport([
+        TextReportWriter(os.path.join(output_dir, TEXT_REPORT_NAME)),
+        JsonlWriter(os.path.join(output_dir, JSONL_REPORT_NAME)),
+        JunitXmlWriter(os.path.join(output_dir, JUNIT_REPORT_NAME)),
+    ] + list(extra_writers))
+
+
+class JsonReporterParser:
+    """
+    Parser event `flutter test --reporter json` yang memproses satu baris per kali.
+    Hanya test yang sedang berjalan yang disimpan; test yang selesai langsung
+    diteruskan ke TestReport.
+    """
+
+    def __init__(self, report, project_root):
+        self.report = report
+        self.project_root = project_root
+        self.suites = {}
+        self.running = {}
+        self.suite_times = {}
+        self.success = None
+
+    def _suite_path(self, suite_id):
+        return self.suites.get(suite_id, '?')
+
+    def feed(self, line):
+        line = line.strip()
+        if not line:
+            return
+        if not line.startswith('{'):
+            self.report.raw(line)
+            return
+        try:
+            event = json.loads(line)
+        except ValueError:
+            self.report.raw(line)
+            return
+
+        event_type = event.get('type')
+        if event_type == 'suite':
+            suite = event['suite']
+            path = suite.get('path') or '?'
+            if os.path.isabs(path):
+                path = os.path.relpath(path, self.project_root)
+            self.suites[suite['id']] = path.replace(os.sep, '/')
+        elif event_type == 'testStart':
+            test = event['test']
+            self.running[test['id']] = [test.get('name', ''), test.get('suiteID'), event.get('time', 0), None]
+            times = self.suite_times.setdefault(test.get('suiteID'), [event.get('time', 0), 0])
+            times[0] = min(times[0], event.get('time', 0))
+        elif event_type == 'error':
+            running = self.running.get(event.get('testID'))
+            if running is not None:
+                error = f"{event.get('error', '')}\n{event.get('stackTrace', '')}".strip()
+                running[3] = truncate(error if running[3] is None else running[3] + "\n" + error)
+        elif event_type == 'testDone':
+            running = self.running.pop(event.get('testID'), None)
+            if running is None:
+                return
+            name, suite_id, start_time, error = running
+            done_time = event.get('time', start_time)
+            times = self.suite_times.get(suite_id)
+            if times is not None:
+                times[1] = max(times[1], done_time)
+            status = 'skipped' if event.get('skipped') else STATUS_BY_RESULT.get(event.get('result'), 'error')
+            # Test tersembunyi adalah pseudo-test "loading ...": hanya dicatat jika gagal
+            if event.get('hidden') and status == 'passed':
+                return
+            self.report.record({
+                'suite': self._suite_path(suite_id),
+                'name': name,
+                'status': status,
+                'duration': max(0, done_time - start_time),
+                'error': error,
+            })
+        elif event_type == 'done':
+            self.success = event.get('success')
+
+    def finish(self):
+        """Test yang belum selesai saat proses berhenti dicatat sebagai error."""
+        for name, suite_id, start_time, error in self.running.values():
+            self.report.record({
+                'suite': self._suite_path(suite_id),
+                'name': name,
+                'status': 'error',
+                'duration': 0,
+                'error': error or "Test tidak selesai (proses flutter test berhenti).",
+            })
+        self.running.clear()
+
+    def suite_durations(self):
+        """Durasi per file test dalam detik, dari test pertama dimulai sampai terakhir selesai."""
+        durations = {}
+        for suite_id, (start, end) in self.suite_times.items():
+            if suite_id in self.suites and end >= start:
+                durations[self.suites[suite_id]] = (end - start) / 1000
+        return durations
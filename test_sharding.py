@@ -0,0 +1,58 @@
+import heapq
+import os
+
+# Estimasi durasi untuk file test yang belum pernah dijalankan
+DEFAULT_DURATION = 1.0
+
+
+def discover_test_files(project_root, test_dir='test'):
+    """Mencari semua file *_test.dart di folder test (path relatif, pakai '/')."""
+    test_files = []
+    root = os.path.join(project_root, test_dir)
+    for current_dir, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            if name.endswith('_test.dart'):
+                full_path = os.path.join(current_dir, name)
+                test_files.append(os.path.relpath(full_path, project_root).replace(os.sep, '/'))
+    test_files.sort()
+    return test_files
+
+
+def estimate_durations(test_files, durations):
+    """Estimasi durasi setiap file; file baru memakai rata-rata file yang sudah dikenal."""
+    known = [durations[f] for f in test_files if f in durations]
+    fallback = sum(known) / len(known) if known else DEFAULT_DURATION
+    return {f: durations.get(f, fallback) for f in test_files}
+
+
+def plan_shards(test_files, estimates, shard_count):
+    """
+    Membagi file test ke beberapa shard dengan algoritma LPT (longest processing
+    time first): file terlama dimasukkan ke shard yang total durasinya paling kecil.
+    Mengembalikan list shard, masing-masing {'files': [...], 'estimate': detik}.
+    """
+    shard_count = max(1, min(shard_count, len(test_files)))
+    shards = [{'files': [], 'estimate': 0.0} for _ in range(shard_count)]
+    heap = [(0.0, index) for index in range(shard_count)]
+
+    ordered = sorted(test_files, key=lambda f: (-estimates[f], f))
+    for test_file in ordered:
+        total, index = heapq.heappop(heap)
+        shards[index]['files'].append(test_file)
+        total += estimates[test_file]
+        shards[index]['estimate'] = total
+        heapq.heappush(heap, (total, index))
+
+    for shard in shards:
+        shard['files'].sort()
+    return [shard for shard in shards if shard['files']]
+
+
+def attribute_shard_duration(shard_files, estimates, elapsed):
+    """
+    Membagi durasi nyata satu shard ke file-filenya sebanding dengan estimasi,
+    karena satu proses `flutter test` tidak melaporkan durasi per file.
+    """
+    total_estimate = sum(estimates[f] for f in shard_files) or 1.0
+    return {f: elapsed * estimates[f] / total_estimate for f in shard_files}
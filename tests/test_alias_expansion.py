@@ -0,0 +1,122 @@
+import random
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from alias_expansion import build_alias_closure, expand_command
+
+# Kumpulan alias patologis: (aliases, command, hasil yang diharapkan)
+CASES = [
+    # Rantai biasa
+    ({'gs': 'g status', 'g': 'git'}, 'gs -s', 'git status -s'),
+    # Referensi diri berhenti di kata itu sendiri
+    ({'ls': 'ls --color'}, 'ls -l', 'ls --color -l'),
+    # Siklus dua alias: kembali ke alias pertama lalu berhenti
+    ({'a': 'b x', 'b': 'a y'}, 'a', 'a y x'),
+    ({'a': 'b x', 'b': 'a y'}, 'b', 'b x y'),
+    # Ekor yang masuk ke siklus
+    ({'t': 'a z', 'a': 'b x', 'b': 'a y'}, 't', 'a y x z'),
+    # Spasi di akhir nilai alias: kata berikutnya ikut dicek
+    ({'sudo': 'sudo ', 'll': 'ls -l'}, 'sudo ll', 'sudo  ls -l'),
+    ({'sudo': 'sudo ', 'll': 'ls -l', 'ls': 'ls --color'}, 'sudo ll', 'sudo  ls --color -l'),
+    # Spasi di akhir alias di tengah rantai juga mengekspansi kata sisa alias pembungkus
+    ({'a': 'b x', 'b': 'c ', 'x': 'XX'}, 'a', 'c  XX'),
+    # ...tapi status "cek kata berikutnya" setelah alias selesai milik alias terluar
+    ({'a': 'b', 'b': 'c ', 'x': 'XX'}, 'a x', 'c  x'),
+    ({'p': 'q ', 'q': 'c ', 'x': 'XX'}, 'p x', 'c   XX'),
+    # Kata sisa alias yang dicek tidak boleh mengekspansi alias yang sedang diekspansi
+    ({'s1': 's2 z', 's2': 'c ', 'z': 's1'}, 's1', 'c  s1'),
+    # Nilai kosong: kata berikutnya tetap di posisi command
+    ({'e': '', 'f': 'c ', 'x': 'XX'}, 'e f x', ' c  XX'),
+    # Nilai kosong setelah kata: tidak ada lagi yang dicek
+    ({'g': 'c ', 'h': '', 'x': 'XX'}, 'g h x', 'c   x'),
+    ({'w': 'e f', 'e': '', 'f': 'c ', 'g': 'c ', 'x': 'XX'}, 'g w x', 'c   f x'),
+    # Alias yang menjadi kata terakhir alias lain: kata terakhirnya dicek setelah alias itu selesai
+    ({'a': 'c d', 'c': 'z ', 'd': 'b', 'b': 'XX'}, 'a', 'z  b'),
+    ({'a': 'c d k', 'c': 'z ', 'd': 'b', 'b': 'XX'}, 'a', 'z  XX k'),
+    ({'E': 'W', 'W': 'b', 'b': 'W x'}, 'E', 'b x'),
+    # Spasi dan quote argumen tidak diubah
+    ({'e2': 'eko'}, "e2  'a  b'", "eko  'a  b'"),
+]
+
+
+def random_cases(seed, count):
+    """Tabel alias acak kecil yang saling merujuk, untuk dibandingkan dengan bash."""
+    rng = random.Random(seed)
+    names = list('abcdef')
+    words = names + ['p', 'q']
+    cases = []
+    for _ in range(count):
+        aliases = {}
+        for name in names:
+            if rng.random() < 0.8:
+                value = ' '.join(rng.choice(words) for _ in range(rng.choice([0, 1, 1, 2, 2, 3, 4])))
+                aliases[name] = value + (' ' if rng.random() < 0.4 else '')
+        command = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+        cases.append((aliases, command))
+    return cases
+
+
+def bash_expansions(cases):
+    """
+    Kata command yang benar-benar dijalankan bash untuk setiap (aliases, command).
+    PATH diarahkan ke folder yang tidak ada sehingga setiap command jatuh ke
+    command_not_found_handle, yang mencetak kata-kata command tersebut.
+    """
+    script = ["shopt -s expand_aliases",
+              'command_not_found_handle() { printf "%s\\x1f" "$@"; }']
+    for aliases, command in cases:
+        script.append("unalias -a")
+        for name, value in aliases.items():
+            script.append(f"alias {name}='{value}'")
+        # Baris terpisah: alias baru berlaku untuk baris berikutnya
+        script.append(command)
+        script.append("echo")
+    with tempfile.NamedTemporaryFile('w', suffix='.sh') as f:
+        f.write("\n".join(script) + "\n")
+        f.flush()
+        result = subprocess.run([shutil.which('bash'), '--norc', '--noprofile', f.name],
+                                capture_output=True, text=True, timeout=60, env={'PATH': '/nonexistent'})
+    return [line.split('\x1f')[:-1] for line in result.stdout.splitlines()]
+
+
+class AliasExpansionTest(unittest.TestCase):
+
+    def test_pathological_chains(self):
+        for aliases, command, expected in CASES:
+            with self.subTest(aliases=aliases, command=command):
+                expanded, _ = expand_command(build_alias_closure(aliases), command)
+                self.assertEqual(expanded, expected)
+
+    def test_expanded_names(self):
+        closure = build_alias_closure({'sudo': 'sudo ', 'll': 'ls -l'})
+        self.assertEqual(expand_command(closure, 'sudo ll x'), ('sudo  ls -l x', ['sudo', 'll']))
+        self.assertEqual(expand_command(closure, 'git ll'), ('git ll', []))
+
+    def test_long_chain_and_large_cycle(self):
+        chain = {f"a{i}": f"a{i + 1} -x{i}" for i in range(3000)}
+        expanded, _ = expand_command(build_alias_closure(chain), 'a0')
+        self.assertTrue(expanded.startswith('a3000 -x2999 '))
+        self.assertTrue(expanded.endswith(' -x0'))
+
+        cycle = {f"c{i}": f"c{(i + 1) % 300} -y{i}" for i in range(300)}
+        expanded, _ = expand_command(build_alias_closure(cycle), 'c5')
+        self.assertEqual(expanded.split()[0], 'c5')
+        self.assertEqual(len(expanded.split()), 301)
+
+    @unittest.skipUnless(shutil.which('bash'), "bash tidak tersedia")
+    def test_matches_bash(self):
+        """Kata hasil ekspansi sama dengan kata yang dijalankan bash untuk alias yang sama."""
+        cases = [(aliases, command.replace("'", "")) for aliases, command, _ in CASES]
+        cases += random_cases(seed=44, count=500)
+        expected = bash_expansions(cases)
+        self.assertEqual(len(expected), len(cases))
+        for (aliases, command), words in zip(cases, expected):
+            with self.subTest(aliases=aliases, command=command):
+                expanded, _ = expand_command(build_alias_closure(aliases), command)
+                self.assertEqual(expanded.split(), words)
+
+
+if __name__ == '__main__':
+    unittest.main()
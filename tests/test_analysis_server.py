@@ -0,0 +1,74 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from analysis_server import AnalysisServerClient
+
+STUB_SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'analysis_server_stub.py')
+
+
+class AnalysisServerClientTest(unittest.TestCase):
+    """AnalysisServerClient dijalankan terhadap analysis_server_stub.py."""
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir, ignore_errors=True)
+        self.project_root = os.path.join(self.workdir, 'app')
+        os.makedirs(os.path.join(self.project_root, 'lib'))
+        self.main_dart = os.path.join(self.project_root, 'lib', 'main.dart')
+        self.write_file(self.main_dart, "void main() {\n  print('hi');\n}\n")
+
+        self.client = AnalysisServerClient([sys.executable, STUB_SERVER], self.project_root)
+        self.client.start(timeout=10)
+        self.addCleanup(self.client.stop)
+
+    @staticmethod
+    def write_file(path, content):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_first_analysis_reports_issues(self):
+        issues, changed_count = self.client.analyze(timeout=10)
+        self.assertEqual(changed_count, 1)
+        self.assertEqual(issues, [{
+            'severity': 'info',
+            'message': "Don't invoke 'print' in production code.",
+            'file': 'lib/main.dart',
+            'line': 2,
+            'column': 3,
+            'rule': 'avoid_print',
+        }])
+
+    def test_reanalysis_only_sends_changed_files(self):
+        self.client.analyze(timeout=10)
+        issues, changed_count = self.client.analyze(timeout=10)
+        self.assertEqual(changed_count, 0)
+        self.assertEqual(len(issues), 1)
+
+        self.write_file(self.main_dart, "void main() {}\n")
+        # mtime_ns bisa sama jika file ditulis ulang dalam tick yang sama
+        stat = os.stat(self.main_dart)
+        os.utime(self.main_dart, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        issues, changed_count = self.client.analyze(timeout=10)
+        self.assertEqual(changed_count, 1)
+        self.assertEqual(issues, [])
+
+    def test_sibling_directory_is_not_part_of_project(self):
+        self.client.analyze(timeout=10)
+        sibling = os.path.join(self.workdir, 'app2', 'lib', 'main.dart')
+        self.client.errors[sibling] = [{
+            'severity': 'ERROR',
+            'type': 'COMPILE_TIME_ERROR',
+            'location': {'startLine': 1, 'startColumn': 1},
+            'message': 'sibling',
+            'code': 'x',
+        }]
+        files = {issue['file'] for issue in self.client.collect_issues()}
+        self.assertEqual(files, {'lib/main.dart'})
+
+
+if __name__ == '__main__':
+    unittest.main()
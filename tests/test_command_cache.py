@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from command_cache import DEFAULT_RULES, CommandCache
+
+
+class MatchRuleTest(unittest.TestCase):
+    """Hanya command read-only yang persis cocok dengan prefix aturan yang boleh di-cache."""
+
+    def setUp(self):
+        workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, workdir, ignore_errors=True)
+        self.cache = CommandCache(path=os.path.join(workdir, "cache.json"),
+                                  rules=[dict(rule) for rule in DEFAULT_RULES])
+
+    def test_plain_commands_match(self):
+        for command in ("git log", "git  log --oneline -5", "flutter --version", "dart --version"):
+            with self.subTest(command=command):
+                self.assertIsNotNone(self.cache.match_rule(command))
+
+    def test_unrelated_commands_do_not_match(self):
+        for command in ("git status", "git logx", "flutter build apk"):
+            with self.subTest(command=command):
+                self.assertIsNone(self.cache.match_rule(command))
+
+    def test_shell_operators_are_never_cached(self):
+        for command in (
+            "git log; rm -rf build",
+            "git log && flutter clean",
+            "git log & sleep 1",
+            "git log | head",
+            "git log > log.txt",
+            "git log >> log.txt",
+            "git log < /dev/null",
+            "git log `touch x`",
+            "git log $(touch x)",
+            "git log\nflutter clean",
+        ):
+            with self.subTest(command=command):
+                self.assertIsNone(self.cache.match_rule(command))
+                key, entry = self.cache.lookup(command)
+                self.assertIsNone(key)
+                self.assertFalse(self.cache.store(key, command, ["output"], 0, 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from command_history import CommandHistory, HistorySearchIndex
+
+
+class HistorySearchIndexTest(unittest.TestCase):
+    """Indeks yang dimuat sekaligus dan yang ditambah per entri harus sama."""
+
+    COMMANDS = ["git status", "flutter test", "git commit -m fix", "git status", "flutter analyze",
+                "ls -la", "flutter test", "git status"]
+
+    def test_bulk_load_matches_incremental_adds(self):
+        bulk = HistorySearchIndex()
+        bulk.add_many((command, number) for number, command in enumerate(self.COMMANDS, 1))
+        incremental = HistorySearchIndex()
+        for number, command in enumerate(self.COMMANDS, 1):
+            incremental.add(command, number)
+
+        self.assertEqual(bulk.sorted_commands, sorted(set(self.COMMANDS)))
+        self.assertEqual(bulk.sorted_commands, incremental.sorted_commands)
+        self.assertEqual(bulk.stats, incremental.stats)
+        self.assertEqual(bulk.count, len(self.COMMANDS))
+        self.assertEqual(bulk.prefix("git"), ["git status", "git commit -m fix"])
+
+    def test_entries_from_other_sessions_are_added_to_index(self):
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, ignore_errors=True)
+        path = os.path.join(work_dir, "history")
+        history = CommandHistory(path)
+        self.addCleanup(history.close)
+        for command in self.COMMANDS[:4]:
+            history.append(command)
+        self.assertEqual(history.search_prefix("flutter"), ["flutter test"])
+
+        other = CommandHistory(path)
+        self.addCleanup(other.close)
+        other.append("flutter analyze")
+        other.append("flutter build apk")
+        self.assertEqual(history.search_prefix("flutter", by="recency"),
+                         ["flutter build apk", "flutter analyze", "flutter test"])
+
+
+if __name__ == "__main__":
+    unittest.main()
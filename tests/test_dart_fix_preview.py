@@ -0,0 +1,109 @@
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+import dart_fix_preview
+
+# dart palsu: --dry-run mencetak usulan, --apply mengganti `new ` di file .dart target
+# dan mencatat argumennya agar test bisa memeriksa folder yang diproses
+FAKE_DART = textwrap.dedent('''\
+    import os, sys
+    args = sys.argv[1:]
+    with open(os.environ['FAKE_DART_LOG'], 'a') as log:
+        log.write(' '.join(args) + '\\n')
+    if os.environ.get('FAKE_DART_FAIL'):
+        sys.exit(int(os.environ['FAKE_DART_FAIL']))
+    target = args[-1] if not args[-1].startswith('--') else '.'
+    paths = []
+    for current_dir, _, files in os.walk(target):
+        paths += [os.path.join(current_dir, name) for name in files if name.endswith('.dart')]
+    if '--dry-run' in args:
+        for path in sorted(paths):
+            if 'new ' in open(path).read():
+                print(os.path.relpath(path).replace(os.sep, '/'))
+                print('  unnecessary_new \\u2022 1 fix')
+    else:
+        for path in paths:
+            text = open(path).read()
+            with open(path, 'w') as f:
+                f.write(text.replace('new ', ''))
+''')
+
+
+class BuildPatchRecordsTest(unittest.TestCase):
+    """Patch dihitung dari satu apply di project itu sendiri; isi asli project harus kembali utuh."""
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir, ignore_errors=True)
+        self.project = os.path.join(self.workdir, 'project')
+        self.files = {
+            'lib/src/a.dart': "var a = new A();\nvar b = 1;\n",
+            'lib/src/deep/b.dart': "var b = new B();\n",
+            'lib/main.dart': "void main() {}\n",
+            'test/c_test.dart': "var c = new C();\n",
+        }
+        for rel_path, text in self.files.items():
+            path = os.path.join(self.project, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(text)
+            os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+        fake = os.path.join(self.workdir, 'fake_dart.py')
+        with open(fake, 'w') as f:
+            f.write(FAKE_DART)
+        self.dart = os.path.join(self.workdir, 'dart')
+        with open(self.dart, 'w') as f:
+            f.write(f"#!/bin/sh\nexec '{sys.executable}' '{fake}' \"$@\"\n")
+        os.chmod(self.dart, 0o755)
+        self.log = os.path.join(self.workdir, 'dart.log')
+        os.environ['FAKE_DART_LOG'] = self.log
+        self.addCleanup(os.environ.pop, 'FAKE_DART_LOG', None)
+        self.addCleanup(os.environ.pop, 'FAKE_DART_FAIL', None)
+
+    def assert_project_untouched(self):
+        for rel_path, text in self.files.items():
+            path = os.path.join(self.project, rel_path)
+            with open(path) as f:
+                self.assertEqual(f.read(), text)
+            self.assertEqual(os.stat(path).st_mtime_ns, 1_000_000_000)
+
+    @unittest.skipIf(os.name == 'nt', "dart palsu berupa script sh")
+    def test_patches_from_single_in_place_apply(self):
+        proposals = {'lib/src/a.dart': {'unnecessary_new': 1}, 'lib/src/deep/b.dart': {'unnecessary_new': 1}}
+        records = dart_fix_preview.build_patch_records(self.dart, self.project, proposals)
+
+        self.assert_project_untouched()
+        with open(self.log) as f:
+            self.assertEqual(f.read().splitlines(), [f"fix --apply {os.path.join('lib', 'src')}"])
+        self.assertEqual([record['file'] for record in records], sorted(proposals))
+        fixed = dart_fix_preview.apply_patch(self.files['lib/src/a.dart'].splitlines(keepends=True),
+                                             records[0]['ops'])
+        self.assertEqual("".join(fixed), "var a = A();\nvar b = 1;\n")
+
+    @unittest.skipIf(os.name == 'nt', "dart palsu berupa script sh")
+    def test_failed_apply_restores_project(self):
+        os.environ['FAKE_DART_FAIL'] = '3'
+        with self.assertRaises(RuntimeError):
+            dart_fix_preview.build_patch_records(self.dart, self.project, {'lib/src/a.dart': {'unnecessary_new': 1}})
+        self.assert_project_untouched()
+
+    @unittest.skipIf(os.name == 'nt', "dart palsu berupa script sh")
+    def test_apply_with_rules_stops_on_failed_dry_run(self):
+        os.environ['FAKE_DART_FAIL'] = '64'
+        with redirect_stdout(StringIO()) as output:
+            success = dart_fix_preview.run_apply(self.dart, self.project, self.workdir, rules=['unnecessary_new'])
+        self.assertFalse(success)
+        self.assertIn('--dry-run gagal', output.getvalue())
+        with open(self.log) as f:
+            self.assertEqual(len(f.read().splitlines()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
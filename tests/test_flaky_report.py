@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+
+# TestReport tidak di-import langsung: pytest akan mencoba mengumpulkannya sebagai test
+import test_reporter
+
+
+class FlakyReportTest(unittest.TestCase):
+    """Test yang gagal lalu lulus saat retry harus tercatat lulus di ringkasan dan JUnit XML."""
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir, ignore_errors=True)
+        self.report = test_reporter.open_report(self.workdir)
+
+    def record(self, name, status, error=None):
+        self.report.record({'suite': 'test/a_test.dart', 'name': name, 'status': status,
+                            'duration': 10, 'error': error})
+
+    def retry(self, results):
+        targets = set(self.report.failures)
+        collector = test_reporter.RetryCollector(self.report, targets, attempt=2)
+        retry_report = test_reporter.TestReport([collector])
+        for name, status in results:
+            retry_report.record({'suite': 'test/a_test.dart', 'name': name, 'status': status,
+                                 'duration': 5, 'error': None if status == 'passed' else 'masih gagal'})
+        for suite, name in sorted(collector.passed):
+            self.report.mark_flaky(suite, name)
+
+    def junit_testcases(self):
+        self.report.close()
+        root = ElementTree.parse(os.path.join(self.workdir, test_reporter.JUNIT_REPORT_NAME)).getroot()
+        suite = root.find('testsuite')
+        return suite, {case.get('name'): case for case in suite.iter('testcase')}
+
+    def test_fail_then_pass_is_reported_as_passed(self):
+        self.record('stabil', 'passed')
+        self.record('flaky', 'failed', 'Expected: 1\nActual: 2')
+        self.record('crash', 'error', 'Bad state')
+        self.retry([('flaky', 'passed'), ('crash', 'passed')])
+
+        summary = self.report.summary
+        self.assertEqual(self.report.failures, [])
+        self.assertEqual((summary['total'], summary['passed'], summary['failed'], summary['error'],
+                          summary['flaky']), (3, 3, 0, 0, 2))
+
+        suite, cases = self.junit_testcases()
+        self.assertEqual((suite.get('tests'), suite.get('failures'), suite.get('errors')), ('3', '0', '0'))
+        self.assertEqual(set(cases), {'stabil', 'flaky', 'crash'})
+        for name in ('flaky', 'crash'):
+            self.assertIsNone(cases[name].find('failure'))
+            self.assertIsNone(cases[name].find('error'))
+            self.assertIn('Flaky', cases[name].find('system-out').text)
+
+    def test_fail_then_fail_keeps_failure(self):
+        self.record('rusak', 'failed', 'Expected: 1\nActual: 2')
+        self.retry([('rusak', 'failed')])
+
+        summary = self.report.summary
+        self.assertEqual(self.report.failures, [('test/a_test.dart', 'rusak')])
+        self.assertEqual((summary['passed'], summary['failed'], summary['flaky']), (0, 1, 0))
+
+        suite, cases = self.junit_testcases()
+        self.assertEqual(suite.get('failures'), '1')
+        self.assertIn('Expected: 1', cases['rusak'].find('failure').text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import unittest
+
+from check_import_budget import IMPORT_BUDGETS_MS, LAZY_MODULES, check_module, default_scale, measure_import
+
+# Budget waktu (wall clock) hanya dicek jika diminta, misalnya di job CI khusus:
+# di mesin yang sedang sibuk hasilnya berubah-ubah. Modul yang bocor selalu dicek.
+TIMING_ENV = 'IMPORT_BUDGET_TIMING'
+# Waktu terbaik dari beberapa kali ukur agar tidak flaky
+REPEAT = 3
+
+
+class ImportBudgetTest(unittest.TestCase):
+    """Entry point tidak boleh memuat modul berat saat startup."""
+
+    def test_no_heavy_modules_at_startup(self):
+        for module in IMPORT_BUDGETS_MS:
+            with self.subTest(module=module):
+                _, loaded = measure_import(module)
+                leaked = sorted(name for name in LAZY_MODULES.get(module, ()) if name in loaded)
+                self.assertEqual(leaked, [], f"modul berat ter-import saat startup {module}")
+
+    @unittest.skipUnless(os.environ.get(TIMING_ENV), f"set {TIMING_ENV}=1 untuk mengecek budget waktu import")
+    def test_entry_points_within_budget(self):
+        scale = default_scale()
+        for module in IMPORT_BUDGETS_MS:
+            with self.subTest(module=module):
+                result = check_module(module, REPEAT, scale)
+                self.assertTrue(result['ok'],
+                                f"import {module} {result['ms']}ms melewati budget {result['budget']:.0f}ms "
+                                f"(naikkan IMPORT_BUDGET_SCALE untuk mesin lambat)")
+
+
+if __name__ == "__main__":
+    unittest.main()
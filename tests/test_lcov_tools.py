@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from lcov_tools import iter_lcov_records, merge_lcov, summarize, summarize_lcov, write_lcov
+
+SHARD_A = """SF:lib/a.dart
+FN:3,A.build
+FN:10,helper
+FNDA:2,A.build
+FNDA:0,helper
+FNF:2
+FNH:1
+DA:3,2
+DA:4,0
+DA:10,0
+BRDA:4,0,0,1
+BRDA:4,0,1,-
+LF:3
+LH:1
+end_of_record
+SF:lib/b.dart
+DA:1,1
+LF:1
+LH:1
+end_of_record
+"""
+
+SHARD_B = """SF:lib/a.dart
+FN:10,20,helper
+FNDA:5,helper
+FNDA:1,onlyHits
+DA:4,1
+DA:10,5
+BRDA:4,0,1,0
+end_of_record
+"""
+
+
+class LcovToolsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir, ignore_errors=True)
+
+    def write(self, name, text):
+        path = os.path.join(self.workdir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_merge_keeps_function_coverage(self):
+        output = os.path.join(self.workdir, 'lcov.info')
+        write_lcov(merge_lcov([self.write('a.info', SHARD_A), self.write('b.info', SHARD_B)]), output)
+        with open(output, encoding='utf-8') as f:
+            record = f.read().split('end_of_record')[0].splitlines()
+
+        self.assertEqual([line for line in record if line.startswith('FN')], [
+            'FN:3,A.build', 'FN:10,helper',
+            'FNDA:2,A.build', 'FNDA:5,helper', 'FNDA:1,onlyHits',
+            'FNF:3', 'FNH:3',
+        ])
+        self.assertIn('BRDA:4,0,1,0', record)
+        self.assertIn('DA:10,5', record)
+
+        # Hasil merge bisa dibaca ulang tanpa kehilangan fungsi
+        functions = {source: functions for source, _, _, functions in iter_lcov_records(output)}
+        self.assertEqual(functions['lib/a.dart']['helper'], ['10', 5])
+
+    def test_lcov2_function_positions(self):
+        path = self.write('c.info', "SF:lib/c.dart\nFN:5,9,C.run\nFNDA:1,C.run\nDA:5,1\nend_of_record\n")
+        output = os.path.join(self.workdir, 'out.info')
+        write_lcov(merge_lcov([path]), output)
+        with open(output, encoding='utf-8') as f:
+            self.assertIn('FN:5,9,C.run\n', f.read())
+
+    def test_streaming_summary_matches_merge(self):
+        single = self.write('a.info', SHARD_A)
+        self.assertEqual(summarize_lcov(single), summarize(merge_lcov([single])))
+
+        # Source file yang muncul di beberapa record tetap digabung per baris
+        concatenated = self.write('concat.info', SHARD_A + SHARD_B)
+        summary = summarize_lcov(concatenated)
+        self.assertEqual(summary, summarize(merge_lcov([concatenated])))
+        self.assertEqual(summary['files']['lib/a.dart']['lines_hit'], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import sdk_locator
+
+
+class FindExecutableTest(unittest.TestCase):
+    """Hasil kosong tidak boleh tersimpan permanen di cache disk maupun memo proses."""
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workdir, ignore_errors=True)
+        self.path_dir = os.path.join(self.workdir, 'path')
+        os.makedirs(self.path_dir)
+        self.common_flutter = os.path.join(self.workdir, 'home', 'flutter', 'bin', 'flutter')
+
+        patches = [
+            mock.patch.dict(os.environ, {'PATH': self.path_dir}),
+            mock.patch.dict(sdk_locator.COMMON_PATHS, {'flutter': [self.common_flutter]}),
+            mock.patch.object(sdk_locator, '_cache_path_override',
+                              os.path.join(self.workdir, sdk_locator.CACHE_FILE_NAME)),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        sdk_locator.reset_memo()
+        self.addCleanup(sdk_locator.reset_memo)
+
+    @staticmethod
+    def install(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write("#!/bin/sh\n")
+        os.chmod(path, 0o755)
+
+    def test_sdk_installed_in_common_path_after_miss_is_found(self):
+        self.assertIsNone(sdk_locator.find_flutter_executable())
+        self.install(self.common_flutter)
+        # Proses yang sama (daemon) maupun proses baru (cache disk) harus melihatnya
+        self.assertEqual(sdk_locator.find_flutter_executable(), self.common_flutter)
+        sdk_locator.reset_memo()
+        self.assertEqual(sdk_locator.find_flutter_executable(), self.common_flutter)
+
+    def test_sdk_added_to_path_after_miss_is_found(self):
+        self.assertIsNone(sdk_locator.find_flutter_executable())
+        on_path = os.path.join(self.path_dir, 'flutter')
+        self.install(on_path)
+        sdk_locator.reset_memo()
+        self.assertEqual(sdk_locator.find_flutter_executable(), on_path)
+
+    def test_measure_startup_keeps_existing_cache(self):
+        sdk_locator.find_flutter_executable()
+        cache_file = sdk_locator.cache_path()
+        with open(cache_file, 'rb') as f:
+            before = f.read()
+        sdk_locator.measure_startup(repeat=3)
+        self.assertEqual(sdk_locator.cache_path(), cache_file)
+        with open(cache_file, 'rb') as f:
+            self.assertEqual(f.read(), before)
+
+    def test_concurrent_version_lookups(self):
+        # Seperti flutter_sdk_matrix: beberapa SDK dibaca versinya dari thread berbeda
+        executables = []
+        for index in range(64):
+            sdk_root = os.path.join(self.workdir, f'sdk{index}')
+            self.install(os.path.join(sdk_root, 'bin', 'flutter'))
+            with open(os.path.join(sdk_root, 'version'), 'w') as f:
+                f.write(f"3.{index}.0\n")
+            executables.append(os.path.join(sdk_root, 'bin', 'flutter'))
+
+        errors = []
+        barrier = threading.Barrier(len(executables))
+        # Pergantian thread sesering mungkin agar json.dump dan update cache saling menyela
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+
+        def lookup(executable):
+            barrier.wait()
+            try:
+                sdk_locator.read_flutter_sdk_version(executable)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=lookup, args=(executable,)) for executable in executables]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        with open(sdk_locator.cache_path(), encoding='utf-8') as f:
+            versions = json.load(f)['sdk_versions']
+        self.assertEqual({versions[executable]['version'] for executable in executables},
+                         {f"3.{index}.0" for index in range(64)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+from flutter_sdk_matrix import kill_process_group, new_process_group_options
+
+# Worker palsu: menjalankan proses anak yang lama (seperti flutter test) lalu menunggu
+WORKER = (
+    "import subprocess, sys, time\n"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'],\n"
+    "                         stdout=subprocess.DEVNULL)\n"
+    "print(child.pid, flush=True)\n"
+    "time.sleep(60)\n"
+)
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Zombie yang belum di-reap tidak lagi berjalan
+    try:
+        with open(f"/proc/{pid}/stat", encoding='utf-8') as f:
+            return f.read().split(')')[-1].split()[0] != 'Z'
+    except OSError:
+        return True
+
+
+@unittest.skipIf(os.name == 'nt', "process group POSIX")
+class KillProcessGroupTest(unittest.TestCase):
+    """Timeout worker harus ikut mematikan proses flutter/dart yang dijalankannya."""
+
+    def test_timeout_kills_grandchildren(self):
+        process = subprocess.Popen([sys.executable, '-c', WORKER], stdout=subprocess.PIPE, text=True,
+                                   **new_process_group_options())
+        child_pid = int(process.stdout.readline())
+        self.addCleanup(self.kill_quietly, child_pid)
+        with self.assertRaises(subprocess.TimeoutExpired):
+            process.communicate(timeout=0.2)
+
+        kill_process_group(process)
+        process.wait()
+        process.stdout.close()
+        deadline = time.monotonic() + 5
+        while pid_alive(child_pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(pid_alive(child_pid))
+
+    @staticmethod
+    def kill_quietly(pid):
+        try:
+            os.kill(pid, 9)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from script_core.terminal import TerminalLogger
+
+# Output dengan akhir baris LF, CRLF, byte non-UTF-8 dan baris terakhir tanpa newline
+CHILD = (
+    "import sys; out = sys.stdout.buffer; "
+    "out.write(b'satu\\n'); out.write(b'dua\\r\\n'); out.write(b'ti\\xffga\\n'); out.write(b'empat')"
+)
+
+
+class WriteLogLinesTest(unittest.TestCase):
+    """Setiap baris output command menjadi tepat satu baris log, tanpa baris kosong."""
+
+    def test_output_lines_are_not_followed_by_blank_lines(self):
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, ignore_errors=True)
+        log_path = os.path.join(work_dir, "log.txt")
+        logger = TerminalLogger(log_path)
+        with redirect_stdout(StringIO()):
+            logger.start_logging()
+            logger.run_command(f'"{sys.executable}" -c "{CHILD}"')
+            logger.stop_logging()
+
+        with open(log_path, "rb") as f:
+            lines = f.read().split(b"\n")
+        first = next(index for index, line in enumerate(lines) if line.endswith(b"] satu"))
+        # Baris output berurutan tanpa baris kosong di antaranya, sampai pesan return code
+        self.assertEqual([line.split(b"] ", 1)[-1] for line in lines[first:first + 5]],
+                         [b"satu", b"dua", b"ti\xffga", b"empat", b"Command finished with return code: 0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
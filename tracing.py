@@ -0,0 +1,154 @@
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+
+# Nilai env var = file output trace; "{pid}" diganti PID agar beberapa proses
+# (misalnya pipeline + daemon auto fixer) tidak saling menimpa
+TRACE_ENV = "FLUTTER_SCRIPTS_TRACE"
+
+# None berarti tracing mati; span() langsung mengembalikan objek no-op
+_events = None
+_output_path = None
+_named_threads = set()
+
+
+class _NullSpan:
+    """Span no-op yang dipakai ulang saat tracing mati: tanpa alokasi, tanpa clock."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Satu rentang waktu (event "X" Chrome trace). Argumen bisa ditambah lewat set()."""
+
+    __slots__ = ('name', 'category', 'args', 'start')
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        _record({
+            'name': self.name,
+            'cat': self.category,
+            'ph': 'X',
+            'ts': self.start / 1000,
+            'dur': (end - self.start) / 1000,
+            'args': self.args,
+        })
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+def _record(event):
+    thread = threading.current_thread()
+    tid = thread.ident
+    if tid not in _named_threads:
+        _named_threads.add(tid)
+        _events.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                        'args': {'name': thread.name}})
+    event['pid'] = os.getpid()
+    event['tid'] = tid
+    # list.append atomik di bawah GIL; thread stage pipeline bisa mencatat bersamaan
+    _events.append(event)
+
+
+def enabled():
+    return _events is not None
+
+
+def span(name, category='script', **args):
+    """
+    Context manager untuk mengukur satu bagian kerja:
+
+        with tracing.span('sdk lookup', name='flutter') as s:
+            ...
+            s.set(found=True)
+    """
+    if _events is None:
+        return _NULL_SPAN
+    return Span(name, category, args)
+
+
+def traced(name=None, category='script'):
+    """Decorator: setiap pemanggilan fungsi dicatat sebagai satu span."""
+    def decorate(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _events is None:
+                return func(*args, **kwargs)
+            with Span(span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def instant(name, category='script', **args):
+    """Menandai satu titik waktu (misalnya byte output pertama dari proses anak)."""
+    if _events is None:
+        return
+    _record({'name': name, 'cat': category, 'ph': 'i', 's': 't',
+             'ts': time.perf_counter_ns() / 1000, 'args': args})
+
+
+def enable(path):
+    """Mengaktifkan tracing; event ditulis ke `path` saat write_trace() atau proses selesai."""
+    global _events, _output_path
+    first = _events is None
+    _output_path = path.replace('{pid}', str(os.getpid()))
+    if first:
+        _events = [{'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'tid': 0,
+                    'args': {'name': os.path.basename(sys.argv[0]) or 'python'}}]
+        atexit.register(write_trace)
+
+
+def write_trace(path=None):
+    """
+    Menulis event ke file Chrome trace-event JSON (bisa dibuka di Perfetto atau
+    chrome://tracing). Mengembalikan path file, atau None jika tracing mati.
+    """
+    if _events is None:
+        return None
+    import json
+
+    path = path or _output_path
+    data = {'traceEvents': list(_events), 'displayTimeUnit': 'ms'}
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ Trace tidak dapat ditulis ke {path}: {e}", file=sys.stderr)
+        return None
+    return path
+
+
+if os.environ.get(TRACE_ENV):
+    enable(os.environ[TRACE_ENV])